@@ -0,0 +1,2 @@
+#!/usr/bin/python3
+"""Initialization file for the benchmarks package"""
@@ -0,0 +1,62 @@
+#!/usr/bin/python3
+"""Benchmark of the bulk import of Reviews from a CSV file
+
+Usage: python3 -m benchmarks.bulk_import [size]
+
+A CSV file of `size` reviews (1000000 by default) is written, then imported
+with FileStorage.bulk_import(), which saves the JSON file once at the end.
+
+"""
+import csv
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+from models import storage
+from models.engine.bulk import read_records
+from models.engine.file_storage import FileStorage
+
+
+def write_csv(file_path, size):
+    """Writes a CSV file of `size` reviews"""
+    with open(file_path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["place_id", "user_id", "text", "stars"])
+        for i in range(size):
+            writer.writerow([f"place-{i % 1000}", f"user-{i % 5000}",
+                             f"review number {i}", i % 5 + 1])
+
+
+def main(size):
+    """Runs the benchmark"""
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, "reviews.csv")
+        write_csv(csv_path, size)
+        FileStorage.configure(file_path=os.path.join(directory, "hbnb.json"))
+        for obj in list(storage.all().values()):
+            storage.delete(obj)
+
+        save = storage.save
+        save_time = 0
+
+        def timed_save():
+            nonlocal save_time
+            start = perf_counter()
+            save()
+            save_time += perf_counter() - start
+
+        storage.save = timed_save
+        start = perf_counter()
+        count = storage.bulk_import("Review", read_records(csv_path))
+        total = perf_counter() - start
+        del storage.save
+
+        print(f"{'reviews':>10}: {count}")
+        print(f"{'import':>10}: {total - save_time:.3f} s")
+        print(f"{'save':>10}: {save_time:.3f} s")
+        print(f"{'total':>10}: {total:.3f} s ({count / total:,.0f} / s)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
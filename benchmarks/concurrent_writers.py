@@ -0,0 +1,83 @@
+#!/usr/bin/python3
+"""Benchmark of processes saving to the same JSON file at the same time
+
+Usage: python3 -m benchmarks.concurrent_writers [processes] [saves]
+
+Every writer process (4 by default) creates a User and increments a counter
+of its own Place on each of its saves (100 by default), in shared mode and
+then without it. The file is then checked for the users and counter values
+every writer saved, to count the updates lost by the other writers
+overwriting them.
+
+"""
+import multiprocessing
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.user import User
+
+
+def write(number, saves):
+    """Saves `saves` times from a writer process"""
+    FileStorage().reload()
+    counter = Place()
+    counter.name = f"writer {number}"
+    for _ in range(saves):
+        user = User()
+        user.first_name = f"writer {number}"
+        counter.number_rooms += 1
+        counter.save()
+
+
+def run(processes, saves, shared):
+    """Runs the writers, returns the elapsed time and the lost updates"""
+    context = multiprocessing.get_context("fork")
+    with tempfile.TemporaryDirectory() as directory:
+        FileStorage.configure(
+            file_path=os.path.join(directory, "hbnb.json"), shared=shared
+        )
+        storage = FileStorage()
+        for obj in list(storage.all().values()):
+            storage.delete(obj)
+        writers = [
+            context.Process(target=write, args=(number, saves))
+            for number in range(processes)
+        ]
+        start = perf_counter()
+        for writer in writers:
+            writer.start()
+        for writer in writers:
+            writer.join()
+        elapsed = perf_counter() - start
+
+        storage.reload()
+        lost = processes * saves - storage.count(User)
+        counters = storage.query(Place, ("name", "!=", ""))
+        lost += processes * saves - sum(
+            place.number_rooms for place in counters.values()
+        )
+    return elapsed, lost
+
+
+def main(processes, saves):
+    """Runs the benchmark"""
+    for shared in (True, False):
+        elapsed, lost = run(processes, saves, shared)
+        rate = processes * saves / elapsed
+        print(
+            f"{'shared' if shared else 'unshared':>9}: {elapsed:.2f} s, "
+            f"{rate:.0f} saves/s, {lost} of {2 * processes * saves} updates "
+            "lost"
+        )
+    FileStorage.configure(file_path="hbnb.json", shared=False)
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 4,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 100,
+    )
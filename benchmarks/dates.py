@@ -0,0 +1,54 @@
+#!/usr/bin/python3
+"""Benchmark of the dates of the objects on reload and save
+
+Usage: python3 -m benchmarks.dates [size]
+
+The dictionaries of `size` objects (1000000 by default) are built, then the
+time to build the objects from them, as reload does, and to get their
+dictionaries back, as save does, is measured with the dates parsed on
+reload, and with lazy dates. The times are given per million objects, and
+the dictionaries saved are checked to be the same, in the same order.
+
+"""
+import sys
+from time import perf_counter
+
+from models.engine.file_storage import FileStorage
+from models.user import User
+
+
+def measure(o_dicts):
+    """Returns the reload and save times and the dictionaries saved"""
+    start = perf_counter()
+    objs = [User(**o_dict) for o_dict in o_dicts]
+    reload_time = perf_counter() - start
+    start = perf_counter()
+    saved = [obj.to_dict() for obj in objs]
+    save_time = perf_counter() - start
+    return reload_time, save_time, saved
+
+
+def main(size):
+    """Runs the benchmark"""
+    template = User()
+    template.email = "betty@holbertonschool.com"
+    o_dict = template.to_dict()
+    o_dicts = [{**o_dict, "id": str(i)} for i in range(size)]
+    scale = 1000000 / size
+    print(f"{'dates':>8} {'reload (s/M)':>13} {'save (s/M)':>11}")
+    results = {}
+    for lazy in (False, True):
+        FileStorage.configure(lazy_dates=lazy)
+        reload_time, save_time, results[lazy] = measure(o_dicts)
+        print(
+            f"{'lazy' if lazy else 'parsed':>8} {reload_time * scale:13.2f}"
+            f" {save_time * scale:11.2f}"
+        )
+    FileStorage.configure(lazy_dates=False)
+    for parsed, lazy, read in zip(results[False], results[True], o_dicts):
+        # same keys in the same order, so the same JSON
+        assert list(parsed.items()) == list(lazy.items()) == list(read.items())
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,94 @@
+#!/usr/bin/python3
+"""Benchmark of the event loop latency while the storage is saved
+
+Usage: python3 -m benchmarks.event_loop [size]
+
+The storage is filled with `size` objects (100000 by default), then 5 saves
+run in an event loop along with a task ticking every millisecond: calling
+`storage.save()` from a coroutine, awaiting `AsyncStorage.asave()` 5 times,
+and awaiting 5 calls at once, which get batched. The delays of the ticks show
+how long the loop was kept from running other tasks.
+
+"""
+import asyncio
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+from models import storage
+from models.base_model import BaseModel
+from models.engine.aio import AsyncStorage
+from models.engine.file_storage import FileStorage
+
+
+async def ticker(delays, done):
+    """Appends to `delays` how late every 1 ms tick is, until `done`"""
+    while not done.is_set():
+        start = perf_counter()
+        await asyncio.sleep(0.001)
+        delays.append(perf_counter() - start - 0.001)
+
+
+async def blocking_saves():
+    """Saves 5 times, blocking the loop"""
+    for _ in range(5):
+        storage.save()
+        await asyncio.sleep(0)
+
+
+async def async_saves(async_storage):
+    """Saves 5 times, one after the other"""
+    for _ in range(5):
+        await async_storage.asave()
+
+
+async def batched_saves(async_storage):
+    """Saves 5 times at once"""
+    await asyncio.gather(*(async_storage.asave() for _ in range(5)))
+
+
+async def measure(saves):
+    """Returns the elapsed time and the tick delays while awaiting `saves`"""
+    delays = []
+    done = asyncio.Event()
+    tick = asyncio.create_task(ticker(delays, done))
+    await asyncio.sleep(0.01)
+    start = perf_counter()
+    await saves
+    elapsed = perf_counter() - start
+    done.set()
+    await tick
+    return elapsed, sorted(delays)
+
+
+def report(name, elapsed, delays):
+    """Prints the measures of a run"""
+    p99 = delays[int(len(delays) * 0.99)] if delays else 0
+    print(
+        f"{name:>9}: {elapsed * 1000:8.1f} ms, ticks delayed "
+        f"p99 {p99 * 1000:7.2f} ms, max {max(delays, default=0) * 1000:7.2f}"
+        " ms"
+    )
+
+
+def main(size):
+    """Runs the benchmark"""
+    with tempfile.TemporaryDirectory() as directory:
+        FileStorage.configure(file_path=os.path.join(directory, "hbnb.json"))
+        for obj in list(storage.all().values()):
+            storage.delete(obj)
+        for _ in range(size):
+            BaseModel()
+
+        report("blocking", *asyncio.run(measure(blocking_saves())))
+        async_storage = AsyncStorage(storage)
+        report("asave", *asyncio.run(measure(async_saves(async_storage))))
+        report(
+            "batched", *asyncio.run(measure(batched_saves(async_storage)))
+        )
+    FileStorage.configure(file_path="hbnb.json", threadsafe=False)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
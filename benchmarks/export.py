@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+"""Benchmark of the memory used to print or export all objects of a class
+
+Usage: python3 -m benchmarks.export [size ...]
+
+For every size the storage is filled with that many Places, then the peak
+memory (measured with tracemalloc) and the time of printing them the way the
+all command does, as one list of strings, and of exporting them as NDJSON
+with storage.export() are compared. The output is written to os.devnull.
+
+"""
+import os
+import sys
+import tracemalloc
+from time import perf_counter
+
+from models import storage
+from models.place import Place
+
+
+def fill(size):
+    """Fills the storage with `size` places"""
+    for obj in list(storage.all().values()):
+        storage.delete(obj)
+    for i in range(size):
+        obj = Place()
+        obj.name = f"place {i}"
+        obj.price_by_night = i % 300
+
+
+def print_all(file):
+    """Prints the places like the all command"""
+    print([str(obj) for obj in storage.all(Place).values()], file=file)
+
+
+def export(file):
+    """Exports the places as NDJSON"""
+    storage.export(file, Place)
+
+
+def measure(function):
+    """Returns the peak memory in MB and the time in s of `function`
+
+    The time is measured on a second run, without tracemalloc slowing
+    allocations down.
+
+    """
+    with open(os.devnull, "w") as file:
+        tracemalloc.start()
+        function(file)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        start = perf_counter()
+        function(file)
+    return peak / (1 << 20), perf_counter() - start
+
+
+def main(sizes):
+    """Runs the benchmark for every size"""
+    print(
+        f"{'objects':>10} {'all (MB)':>10} {'all (s)':>8}"
+        f" {'export (MB)':>12} {'export (s)':>11}"
+    )
+    for size in sizes:
+        fill(size)
+        all_memory, all_time = measure(print_all)
+        export_memory, export_time = measure(export)
+        print(
+            f"{size:>10} {all_memory:>10.2f} {all_time:>8.3f}"
+            f" {export_memory:>12.2f} {export_time:>11.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000])
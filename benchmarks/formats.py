@@ -0,0 +1,60 @@
+#!/usr/bin/python3
+"""Benchmark matrix of the file formats of FileStorage
+
+Usage: python3 -m benchmarks.formats [size]
+
+The storage is filled with `size` objects (100000 by default) spread over the
+seven model classes, then for every format the file size, the save time and
+the reload time are measured.
+
+"""
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+from models import storage
+from models.engine.file_storage import FileStorage, classes
+from models.engine.serializers import serializers
+
+
+def fill(size):
+    """Fills the storage with `size` objects of every class"""
+    names = list(classes)
+    for obj in list(storage.all().values()):
+        storage.delete(obj)
+    for i in range(size):
+        obj = classes[names[i % len(names)]]()
+        obj.name = f"name {i}"
+        obj.number = i
+
+
+def main(size):
+    """Runs the benchmark"""
+    fill(size)
+    print(
+        f"{'format':>10} {'size (MB)':>10} {'save (s)':>10}"
+        f" {'reload (s)':>11}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for name in serializers:
+            file_path = os.path.join(directory, f"hbnb.{name}")
+            FileStorage.configure(file_path=file_path, format=name)
+
+            start = perf_counter()
+            storage.save()
+            save_time = perf_counter() - start
+
+            start = perf_counter()
+            storage.reload()
+            reload_time = perf_counter() - start
+
+            file_size = os.path.getsize(file_path) / 1e6
+            print(
+                f"{name:>10} {file_size:>10.2f} {save_time:>10.3f}"
+                f" {reload_time:>11.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,66 @@
+#!/usr/bin/python3
+"""Benchmark of the latency of saves written in the background
+
+Usage: python3 -m benchmarks.group_commit [size ...]
+
+For every size the storage is filled with that many objects, then a burst of
+20 objects are updated and saved one after the other, like console commands
+would, with the file written by every save and then in background mode,
+where the saves are written by a thread, as a group. The mean time of a save
+is printed, with the time until the burst is written (after `flush()`).
+
+"""
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+from models import storage
+from models.base_model import BaseModel
+from models.engine.file_storage import FileStorage
+
+
+def fill(size):
+    """Fills the storage with `size` objects and returns 20 of them"""
+    for obj in list(storage.all().values()):
+        storage.delete(obj)
+    return [BaseModel() for _ in range(size)][:20]
+
+
+def burst(objs):
+    """Returns the mean save time of `objs` and the time until written"""
+    latency = 0
+    start = perf_counter()
+    for i, obj in enumerate(objs):
+        save_start = perf_counter()
+        obj.number = i
+        obj.save()
+        latency += perf_counter() - save_start
+    storage.flush()
+    return latency / len(objs), perf_counter() - start
+
+
+def main(sizes):
+    """Runs the benchmark for every size"""
+    print(
+        f"{'objects':>10} {'mode':>11} {'save (ms)':>12} {'written (ms)':>14}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            FileStorage.configure(
+                file_path=os.path.join(directory, f"{size}.json")
+            )
+            objs = fill(size)
+            storage.save()
+            for background in (False, True):
+                FileStorage.configure(background=background)
+                latency, elapsed = burst(objs)
+                print(
+                    f"{size:>10} {'background' if background else 'sync':>11}"
+                    f" {latency * 1000:>12.3f} {elapsed * 1000:>14.1f}"
+                )
+    FileStorage.configure(file_path="hbnb.json", background=False)
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000])
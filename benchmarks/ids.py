@@ -0,0 +1,50 @@
+#!/usr/bin/python3
+"""Benchmark of the creation of objects with every id generator
+
+Usage: python3 -m benchmarks.ids [size]
+
+For every id generator (see `models.ids`), `size` ids (200000 by default) are
+generated, then `size` new objects are created, each generating an id and
+being added to the storage. The numbers of ids and objects per second are
+given, along with the length of the ids.
+
+"""
+import sys
+from time import perf_counter
+
+from models import storage
+from models.base_model import BaseModel
+from models.engine.file_storage import FileStorage
+from models.ids import generators
+
+
+def clear():
+    """Removes every object from the storage"""
+    for obj in list(storage.all().values()):
+        storage.delete(obj)
+
+
+def main(size):
+    """Runs the benchmark"""
+    print(f"{'ids':>6} {'length':>7} {'ids/s':>11} {'objects/s':>11}")
+    clear()
+    for name, generator in generators.items():
+        FileStorage.configure(ids=name)
+        start = perf_counter()
+        for _ in range(size):
+            generator()
+        ids_rate = size / (perf_counter() - start)
+        start = perf_counter()
+        for _ in range(size):
+            BaseModel()
+        objects_rate = size / (perf_counter() - start)
+        clear()
+        print(
+            f"{name:>6} {len(generator()):>7} {ids_rate:>11,.0f}"
+            f" {objects_rate:>11,.0f}"
+        )
+    FileStorage.configure(ids="uuid4")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
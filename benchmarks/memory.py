@@ -0,0 +1,54 @@
+#!/usr/bin/python3
+"""Benchmark of the memory used per object by every model class
+
+Usage: python3 -m benchmarks.memory [size]
+
+For every class, `size` objects (10000 by default) with all their declared
+attributes set are built from a dictionary, as reload does, with the regular
+and the compact version of the class, and the memory used per object is
+measured with tracemalloc.
+
+"""
+import sys
+import tracemalloc
+
+from models.compact import compact_class, declared_attributes
+from models.engine.file_storage import FileStorage
+
+model_classes = getattr(FileStorage, "_FileStorage__model_classes")
+
+
+def full_dict(cls):
+    """Returns the dictionary of an object with all attributes set"""
+    o_dict = cls(id="0").to_dict()
+    o_dict["created_at"] = o_dict["updated_at"] = "2023-11-11T10:00:00.000001"
+    for name in declared_attributes(cls):
+        if name not in o_dict:
+            value = getattr(cls, name)
+            o_dict[name] = list(value) if type(value) is list else value
+    return o_dict
+
+
+def memory_per_object(cls, o_dict, size):
+    """Returns the memory used by an object of `cls` built from `o_dict`"""
+    tracemalloc.start()
+    objects = []
+    for i in range(size):
+        objects.append(cls(**dict(o_dict, id=str(i))))
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return used / size
+
+
+def main(size):
+    """Runs the benchmark"""
+    print(f"{'class':>10} {'regular (B)':>12} {'compact (B)':>12}")
+    for name, cls in model_classes.items():
+        o_dict = full_dict(cls)
+        regular = memory_per_object(cls, o_dict, size)
+        compact = memory_per_object(compact_class(cls), o_dict, size)
+        print(f"{name:>10} {regular:>12.0f} {compact:>12.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
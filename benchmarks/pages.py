@@ -0,0 +1,52 @@
+#!/usr/bin/python3
+"""Benchmark of paging through the objects of a class
+
+Usage: python3 -m benchmarks.pages [size]
+
+The storage is filled with `size` Users (200000 by default), then the time
+to get a page of 20 users is measured at the start, the middle and the end of
+the class, next to the time of getting all of them with storage.all().
+
+"""
+import sys
+from time import perf_counter
+
+from models import storage
+from models.user import User
+
+
+def best_time(function, repeat=5):
+    """Returns the best time of `repeat` calls of `function`"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        function()
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def main(size):
+    """Runs the benchmark"""
+    for obj in list(storage.all().values()):
+        storage.delete(obj)
+    for _ in range(size):
+        User()
+
+    start = perf_counter()
+    storage.page(User, 20)
+    elapsed = perf_counter() - start
+    print(f"{'first page':>12}: {elapsed * 1000:.3f} ms (sorts the ids)")
+    ids = [obj.id for obj in storage.page(User).values()]
+    for name, after in (
+        ("start", None),
+        ("middle", ids[size // 2]),
+        ("end", ids[-21]),
+    ):
+        elapsed = best_time(lambda: storage.page(User, 20, after))
+        print(f"{name:>12}: {elapsed * 1000:.3f} ms")
+    elapsed = best_time(lambda: storage.all(User))
+    print(f"{'all()':>12}: {elapsed * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
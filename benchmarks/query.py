@@ -0,0 +1,56 @@
+#!/usr/bin/python3
+"""Benchmark of queries with and without indexes
+
+Usage: python3 -m benchmarks.query [size]
+
+The storage is filled with `size` Places (200000 by default) spread over 1000
+cities, then the time of an equality query on city_id and of a range query on
+price_by_night is measured with a scan of the class, and with a hash and a
+sorted index respectively.
+
+"""
+import sys
+from time import perf_counter
+
+from models import storage
+from models.place import Place
+
+
+def best_time(function, repeat=5):
+    """Returns the best time of `repeat` calls of `function`"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        function()
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def main(size):
+    """Runs the benchmark"""
+    for obj in list(storage.all().values()):
+        storage.delete(obj)
+    for i in range(size):
+        place = Place()
+        place.city_id = f"city-{i % 1000}"
+        place.price_by_night = i % 500
+
+    queries = (
+        ("equality", ("city_id", "==", "city-42"), "hash"),
+        ("range", ("price_by_night", ">=", 495), "sorted"),
+    )
+    print(f"{'query':>10} {'matches':>8} {'scan (ms)':>10} {'index (ms)':>11}")
+    for name, predicate, kind in queries:
+        count = len(storage.query(Place, predicate))
+        scan = best_time(lambda: storage.query(Place, predicate))
+        storage.create_index(Place, predicate[0], kind)
+        storage.query(Place, predicate)  # builds the index
+        indexed = best_time(lambda: storage.query(Place, predicate))
+        print(
+            f"{name:>10} {count:>8} {scan * 1000:>10.2f}"
+            f" {indexed * 1000:>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,58 @@
+#!/usr/bin/python3
+"""Benchmark of the navigation from an object to the objects referring to it
+
+Usage: python3 -m benchmarks.relations [size]
+
+The storage is filled with `size` Places (200000 by default) spread over 1000
+cities, then the time of getting the places of a city with City.places() is
+measured, next to the time of a scan of all places.
+
+"""
+import sys
+from time import perf_counter
+
+from models import storage
+from models.city import City
+from models.place import Place
+
+
+def best_time(function, repeat=5):
+    """Returns the best time of `repeat` calls of `function`"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        function()
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def scan(city):
+    """Returns the places of `city` by going through all places"""
+    return [
+        place
+        for place in storage.all(Place).values()
+        if place.city_id == city.id
+    ]
+
+
+def main(size):
+    """Runs the benchmark"""
+    for obj in list(storage.all().values()):
+        storage.delete(obj)
+    cities = [City() for _ in range(1000)]
+    for i in range(size):
+        place = Place()
+        place.city_id = cities[i % 1000].id
+
+    start = perf_counter()
+    count = len(cities[0].places())
+    elapsed = perf_counter() - start
+    print(f"{'first call':>12}: {elapsed * 1000:.3f} ms (builds the index)")
+    elapsed = best_time(lambda: cities[1].places())
+    print(f"{'places()':>12}: {elapsed * 1000:.3f} ms ({count} places)")
+    elapsed = best_time(lambda: scan(cities[1]))
+    print(f"{'scan':>12}: {elapsed * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,71 @@
+#!/usr/bin/python3
+"""Benchmark of the reload (startup) time of FileStorage
+
+Usage: python3 -m benchmarks.reload_startup [size]
+
+A JSON file of `size` objects (500000 by default) is written, then the time
+to build the objects from it is measured with the old path, which formats
+every dictionary to a string and evaluates it, and with the registry of
+classes used by FileStorage.reload().
+
+"""
+import json
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+from models import storage
+from models.engine.file_storage import FileStorage, classes
+
+
+def write_file(file_path, size):
+    """Writes a JSON file of `size` objects spread over all classes"""
+    names = list(classes)
+    for obj in list(storage.all().values()):
+        storage.delete(obj)
+    for i in range(size):
+        obj = classes[names[i % len(names)]]()
+        obj.name = f"name {i}"
+    FileStorage.configure(file_path=file_path)
+    storage.save()
+
+
+def eval_reload(json_obj_dict):
+    """Builds the objects the old way, by evaluating a string"""
+    namespace = dict(classes)
+    return {
+        key: eval("{}(**{})".format(o_dict["__class__"], o_dict), namespace)
+        for key, o_dict in json_obj_dict.items()
+    }
+
+
+def registry_reload(json_obj_dict):
+    """Builds the objects with the registry of classes"""
+    return {
+        key: classes[o_dict["__class__"]](**o_dict)
+        for key, o_dict in json_obj_dict.items()
+    }
+
+
+def main(size):
+    """Runs the benchmark"""
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "hbnb.json")
+        write_file(file_path, size)
+        with open(file_path, "r") as file:
+            json_obj_dict = json.load(file)
+
+        paths = (("eval", eval_reload), ("registry", registry_reload))
+        for name, build in paths:
+            start = perf_counter()
+            build(json_obj_dict)
+            print(f"{name:>10}: {perf_counter() - start:.3f} s")
+
+        start = perf_counter()
+        storage.reload()
+        print(f"{'reload()':>10}: {perf_counter() - start:.3f} s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500000)
@@ -0,0 +1,61 @@
+#!/usr/bin/python3
+"""Benchmark of the save latency as the number of untouched objects grows
+
+Usage: python3 -m benchmarks.save_latency [size ...]
+
+For every size the storage is filled with that many untouched objects, then
+one object is updated and saved, in the default (JSON file) mode and in log
+mode, where only the changed object is written.
+
+"""
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+from models import storage
+from models.base_model import BaseModel
+from models.engine.file_storage import FileStorage
+
+
+def fill(size):
+    """Fills the storage with `size` objects and returns one of them"""
+    for obj in list(storage.all().values()):
+        storage.delete(obj)
+    for _ in range(size):
+        obj = BaseModel()
+    return obj
+
+
+def save_latency(obj, repeat=5):
+    """Returns the best time of updating `obj` and saving the storage"""
+    best = float("inf")
+    for i in range(repeat):
+        start = perf_counter()
+        obj.number = i
+        storage.save()
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def main(sizes):
+    """Runs the benchmark for every size"""
+    print(f"{'objects':>10} {'json (ms)':>12} {'log (ms)':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            FileStorage.configure(
+                file_path=os.path.join(directory, f"{size}.json"), log=False
+            )
+            obj = fill(size)
+            json_time = save_latency(obj)
+
+            FileStorage.configure(log=True, log_limit=size)
+            log_time = save_latency(obj)
+            print(
+                f"{size:>10} {json_time * 1000:>12.3f}"
+                f" {log_time * 1000:>12.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000])
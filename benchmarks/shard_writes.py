@@ -0,0 +1,89 @@
+#!/usr/bin/python3
+"""Benchmark of saving a few changes to a data directory
+
+Usage: python3 -m benchmarks.shard_writes [size] [segments]
+
+The storage is filled with `size` objects (200000 by default) spread over
+the model classes and saved, in the single JSON file and in a data directory
+of `segments` segments per class (64 by default). Then one object is changed
+and saved, showing the bytes written and the time of the save, and the
+objects of one class are counted right after a reload.
+
+"""
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+from models import storage
+from models.engine.file_storage import FileStorage, classes
+from models.state import State
+
+
+def fill(size):
+    """Fills the storage with `size` objects of the model classes"""
+    for obj in list(storage.all().values()):
+        storage.delete(obj)
+    model_classes = list(classes.values())
+    for i in range(size):
+        obj = model_classes[i % len(model_classes)]()
+        obj.name = f"object {i}"
+
+
+def files(path):
+    """Returns the files at `path`, the file itself or those of a directory"""
+    if os.path.isfile(path):
+        return [path]
+    return [
+        os.path.join(root, name)
+        for root, _, names in os.walk(path)
+        for name in names
+    ]
+
+
+def measure(name, path):
+    """Prints the measures of the current layout"""
+    storage.save()
+    since = max(os.stat(file).st_mtime_ns for file in files(path))
+    obj = next(iter(storage.all(State).values()))
+    obj.name = "changed"
+    start = perf_counter()
+    storage.save()
+    save_time = perf_counter() - start
+    size = sum(
+        os.path.getsize(file)
+        for file in files(path)
+        if os.stat(file).st_mtime_ns > since
+    )
+    start = perf_counter()
+    storage.reload()
+    storage.count(State)
+    count_time = perf_counter() - start
+    print(
+        f"{name:>10} {save_time * 1000:12.1f} {size / 1024:14.1f}"
+        f" {count_time * 1000:13.1f}"
+    )
+
+
+def main(size, segments):
+    """Runs the benchmark"""
+    print(
+        f"{'':>10} {'save 1 (ms)':>12} {'written (KB)':>14}"
+        f" {'count (ms)':>13}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "hbnb.json")
+        FileStorage.configure(file_path=file_path)
+        fill(size)
+        measure("one file", file_path)
+        data = os.path.join(directory, "data")
+        FileStorage.configure(directory=data, segments=segments)
+        measure("directory", data)
+    FileStorage.configure(file_path="hbnb.json", directory=None, segments=1)
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 64,
+    )
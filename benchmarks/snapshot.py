@@ -0,0 +1,81 @@
+#!/usr/bin/python3
+"""Benchmark of the startup time with a snapshot file
+
+Usage: python3 -m benchmarks.snapshot [size ...]
+
+For every size (10000, 100000 and 1000000 objects by default) the storage is
+filled with objects spread over the model classes and saved to a JSON file,
+then written to a snapshot. The time to reload each file and get one object,
+as a console command would, is measured, and for the snapshot also the time
+to count the objects of a class.
+
+"""
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+from models import storage
+from models.engine.file_storage import FileStorage, classes
+from models.state import State
+
+
+def fill(size):
+    """Fills the storage with `size` objects of the model classes"""
+    for obj in list(storage.all().values()):
+        storage.delete(obj)
+    model_classes = list(classes.values())
+    for i in range(size):
+        obj = model_classes[i % len(model_classes)]()
+        obj.name = f"object {i}"
+
+
+def startup(file_path, key):
+    """Returns the time to reload `file_path` and get the object of `key`
+
+    The objects in memory are dropped first, by reloading an empty file, so
+    that freeing them isn't timed.
+
+    """
+    empty_path = os.path.join(os.path.dirname(file_path), "empty.json")
+    with open(empty_path, "w") as file:
+        file.write("{}\n")
+    FileStorage.configure(file_path=empty_path)
+    storage.reload()
+    FileStorage.configure(file_path=file_path)
+    start = perf_counter()
+    storage.reload()
+    cls_name, _, obj_id = key.partition(".")
+    assert storage.get(cls_name, obj_id) is not None
+    return perf_counter() - start
+
+
+def main(sizes):
+    """Runs the benchmark"""
+    print(
+        f"{'objects':>10} {'json (ms)':>10} {'snapshot (ms)':>14}"
+        f" {'+ count (ms)':>13}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, "hbnb.json")
+        snapshot_path = os.path.join(directory, "hbnb.snap")
+        for size in sizes:
+            FileStorage.configure(file_path=json_path)
+            fill(size)
+            storage.save()
+            storage.snapshot(snapshot_path)
+            key = next(reversed(storage.all()))
+            json_time = startup(json_path, key)
+            snapshot_time = startup(snapshot_path, key)
+            start = perf_counter()
+            storage.count(State)
+            count_time = perf_counter() - start
+            print(
+                f"{size:>10} {json_time * 1000:10.1f}"
+                f" {snapshot_time * 1000:14.2f} {count_time * 1000:13.3f}"
+            )
+    FileStorage.configure(file_path="hbnb.json")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000])
@@ -0,0 +1,80 @@
+#!/usr/bin/python3
+"""Benchmark of threads adding, reading and saving objects at the same time
+
+Usage: python3 -m benchmarks.threads [threads] [operations]
+
+Every thread (8 by default) runs a mix of operations (2000 by default): it
+creates a User most of the time, and otherwise goes through all objects or
+saves, in thread-safe mode and then without it. The number of operations per
+second is printed with the number of operations that failed, like a save
+going through the objects while another thread adds one.
+
+"""
+import os
+import sys
+import tempfile
+import threading
+from time import perf_counter
+
+from models.engine.file_storage import FileStorage
+from models.user import User
+
+
+def work(operations, errors):
+    """Runs `operations` operations, appending the failures to `errors`"""
+    storage = FileStorage()
+    for i in range(operations):
+        try:
+            if i % 100 == 0:
+                storage.save()
+            elif i % 10 == 0:
+                sum(1 for _ in storage.all().values())
+            else:
+                User()
+        except Exception as error:
+            errors.append(error)
+
+
+def run(threads, operations, threadsafe):
+    """Runs the threads, returns the elapsed time and the failures"""
+    with tempfile.TemporaryDirectory() as directory:
+        FileStorage.configure(
+            file_path=os.path.join(directory, "hbnb.json"),
+            threadsafe=threadsafe,
+        )
+        storage = FileStorage()
+        for obj in list(storage.all().values()):
+            storage.delete(obj)
+        errors = []
+        workers = [
+            threading.Thread(target=work, args=(operations, errors))
+            for _ in range(threads)
+        ]
+        start = perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        storage.save()
+        elapsed = perf_counter() - start
+    return elapsed, errors
+
+
+def main(threads, operations):
+    """Runs the benchmark"""
+    for threadsafe in (True, False):
+        elapsed, errors = run(threads, operations, threadsafe)
+        rate = threads * operations / elapsed
+        print(
+            f"{'thread-safe' if threadsafe else 'unsafe':>11}: "
+            f"{elapsed:.2f} s, {rate:.0f} operations/s, "
+            f"{len(errors)} failed"
+        )
+    FileStorage.configure(file_path="hbnb.json", threadsafe=False)
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 8,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 2000,
+    )
@@ -0,0 +1,78 @@
+#!/usr/bin/python3
+"""Benchmark of saving and reloading a data directory with worker processes
+
+Usage: python3 -m benchmarks.workers [size] [workers ...]
+
+The storage is filled with `size` objects (200000 by default) spread over
+the model classes, kept in a data directory of 32 segments per class. They
+are saved and reloaded with every number of worker processes (1, 4, 16 and
+32 by default), next to the single JSON file for reference. Every object is
+marked as changed before each save, so that every segment is written, and
+the reload time includes reading every class, which the data directory
+otherwise only does when a class is needed. Speedups depend on the number of
+cores of the machine.
+
+"""
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+from models import storage
+from models.engine.file_storage import FileStorage, classes
+
+
+def fill(size):
+    """Fills the storage with `size` objects of the model classes"""
+    for obj in list(storage.all().values()):
+        storage.delete(obj)
+    model_classes = list(classes.values())
+    for i in range(size):
+        obj = model_classes[i % len(model_classes)]()
+        obj.name = f"object {i}"
+
+
+def timed(function):
+    """Returns the time of a call of `function`"""
+    start = perf_counter()
+    function()
+    return perf_counter() - start
+
+
+def reload_all():
+    """Reloads the storage and reads the objects of every class"""
+    storage.reload()
+    storage.count()
+
+
+def main(size, workers):
+    """Runs the benchmark"""
+    print(f"{'workers':>10} {'save (s)':>10} {'reload (s)':>11}")
+    with tempfile.TemporaryDirectory() as directory:
+        FileStorage.configure(file_path=os.path.join(directory, "hbnb.json"))
+        fill(size)
+        print(
+            f"{'one file':>10} {timed(storage.save):>10.2f}"
+            f" {timed(storage.reload):>11.2f}"
+        )
+        FileStorage.configure(
+            directory=os.path.join(directory, "data"), segments=32
+        )
+        for count in workers:
+            FileStorage.configure(workers=count)
+            for obj in storage.all().values():
+                storage.mark_dirty(obj)  # written again, as a first save
+            save_time = timed(storage.save)
+            reload_time = timed(reload_all)
+            assert storage.count() == size
+            print(f"{count:>10} {save_time:>10.2f} {reload_time:>11.2f}")
+    FileStorage.configure(
+        file_path="hbnb.json", directory=None, segments=1, workers=1
+    )
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200000,
+        [int(arg) for arg in sys.argv[2:]] or [1, 4, 16, 32],
+    )
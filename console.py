@@ -6,41 +6,44 @@ This is the entry point of the command interpreter
 """
 import cmd
 import json
+import os
 import re
+import sys
 
 from models import storage
-from models.amenity import Amenity
-from models.base_model import BaseModel
-from models.city import City
-from models.place import Place
-from models.review import Review
-from models.state import State
-from models.user import User
+from models.engine.bulk import cast, formats, read_records
+from models.engine.columns import functions
+from models.engine.file_storage import classes
+from models.engine.indexes import operators
 
 
 class HBNBCommand(cmd.Cmd):
     """Class definition of the AirBnB clone - console"""
 
     prompt = "(hbnb) "
-    __valid_classes = (
-        "Amenity",
-        "BaseModel",
-        "City",
-        "Place",
-        "Review",
-        "State",
-        "User",
-    )
+    __valid_classes = classes
+    # methods returning the instances related to an instance, by class
+    __relations = {
+        "Amenity": ("places",),
+        "City": ("places",),
+        "Place": ("amenities", "reviews"),
+        "State": ("cities",),
+        "User": ("places", "reviews"),
+    }
 
     # COMMAND handlers
 
     def do_quit(self, args):
         """Handler for the quit command"""
+        if storage.in_transaction():
+            storage.rollback()
         return True
 
     def do_EOF(self, args):
         """Handler for end-of-file signal"""
         print()
+        if storage.in_transaction():
+            storage.rollback()
         return True
 
     def emptyline(self):
@@ -58,7 +61,7 @@ class HBNBCommand(cmd.Cmd):
             print("** class doesn't exist **")
             return
 
-        obj = eval("{}()".format(tokens["class"]))
+        obj = self.__valid_classes[tokens["class"]]()
         storage.save()
         print(obj.id)
 
@@ -66,7 +69,7 @@ class HBNBCommand(cmd.Cmd):
         """Handler for the show command"""
         pattern = (
             r"^(?P<class>\w+)?\ ?"
-            + r"(?P<id>[a-zA-Z0-9\-]+)?\ ?"
+            + r"(?P<id>[\w\-]+)?\ ?"
             + r"(?P<extra>.*)$"
         )
         tokens = re.search(pattern, args).groupdict()  # type: ignore
@@ -79,19 +82,18 @@ class HBNBCommand(cmd.Cmd):
         if not tokens["id"]:
             print("** instance id missing **")
             return
-        key = "{}.{}".format(tokens["class"], tokens["id"])
-        if key not in storage.all():
+        obj = storage.get(tokens["class"], tokens["id"])
+        if obj is None:
             print("** no instance found **")
             return
 
-        obj = storage.all()[key]
         print(obj)
 
     def do_destroy(self, args):
         """Handler for the destroy command"""
         pattern = (
             r"^(?P<class>\w+)?\ ?"
-            + r"(?P<id>[a-zA-Z0-9\-]+)?\ ?"
+            + r"(?P<id>[\w\-]+)?\ ?"
             + r"(?P<extra>.*)$"
         )
         tokens = re.search(pattern, args).groupdict()  # type: ignore
@@ -104,12 +106,13 @@ class HBNBCommand(cmd.Cmd):
         if not tokens["id"]:
             print("** instance id missing **")
             return
-        key = "{}.{}".format(tokens["class"], tokens["id"])
-        if key not in storage.all():
+        obj = storage.get(tokens["class"], tokens["id"])
+        if obj is None:
             print("** no instance found **")
             return
 
-        del storage.all()[key]
+        # destroy <class name> <id> --cascade
+        storage.delete(obj, cascade=tokens["extra"].strip() == "--cascade")
         storage.save()
 
     def do_all(self, args):
@@ -120,13 +123,29 @@ class HBNBCommand(cmd.Cmd):
         if tokens["class"] and tokens["class"] not in self.__valid_classes:
             print("** class doesn't exist **")
             return
+        cls = tokens["class"] or None
+
+        # all <class name> --limit <N> --after <id>
+        options = dict(re.findall(r"--(\w+)\ +(\S+)", tokens["extra"]))
+        if options:
+            if set(options) - {"limit", "after"}:
+                print("** option doesn't exist **")
+                return
+            if not cls:
+                print("** class name missing **")
+                return
+            limit = options.get("limit")
+            if limit is not None and not limit.isdigit():
+                print("** limit must be a number **")
+                return
+            objects = storage.page(
+                cls, limit and int(limit), options.get("after")
+            )
+        else:
+            objects = storage.all(cls)
 
         # build the list containig the string representation of the objects
-        obj_str_list = [
-            str(obj)
-            for obj in storage.all().values()
-            if not tokens["class"] or type(obj).__name__ == tokens["class"]
-        ]
+        obj_str_list = [str(obj) for obj in objects.values()]
 
         if obj_str_list != []:
             print(obj_str_list)
@@ -156,8 +175,8 @@ class HBNBCommand(cmd.Cmd):
         if not tokens["id"]:
             print("** instance id missing **")
             return
-        key = "{}.{}".format(tokens["class"], tokens["id"])
-        if key not in storage.all():
+        obj = storage.get(tokens["class"], tokens["id"])
+        if obj is None:
             print("** no instance found **")
             return
         if not tokens["attr"]:
@@ -168,16 +187,212 @@ class HBNBCommand(cmd.Cmd):
             return
 
         # cast the attibute value to the attribute type
-        if tokens["value"].lstrip("-").isdigit():
-            tokens["value"] = int(tokens["value"])
-        elif tokens["value"].lstrip("-").replace(".", "").isnumeric():
-            tokens["value"] = float(tokens["value"])
+        setattr(obj, tokens["attr"], cast(tokens["value"]))
+        storage.save()
+
+    def do_import(self, args):
+        """Handler for the import command"""
+        pattern = (
+            r"^(?P<class>\w+)?\ ?" + r"(?P<file>\S+)?\ ?" + r"(?P<extra>.*)$"
+        )
+        tokens = re.search(pattern, args).groupdict()  # type: ignore
+        if not tokens["class"]:
+            print("** class name missing **")
+            return
+        if tokens["class"] not in self.__valid_classes:
+            print("** class doesn't exist **")
+            return
+        if not tokens["file"]:
+            print("** file name missing **")
+            return
+        if os.path.splitext(tokens["file"])[1].lower() not in formats:
+            print("** file format not supported **")
+            return
+        if not os.path.isfile(tokens["file"]):
+            print("** file doesn't exist **")
+            return
+
+        # nothing is imported if a record can't be read
+        try:
+            with storage.transaction():
+                count = storage.bulk_import(
+                    tokens["class"], read_records(tokens["file"])
+                )
+        except ValueError:
+            print("** invalid record **")
+            return
+        print(count)
+
+    def do_related(self, args):
+        """Handler for the related command"""
+        pattern = (
+            r"^(?P<class>\w+)?\ ?"
+            + r"(?P<id>[\w\-]+)?\ ?"
+            + r"(?P<relation>\w+)?\ ?"
+            + r"(?P<extra>.*)$"
+        )
+        tokens = re.search(pattern, args).groupdict()  # type: ignore
+        if not tokens["class"]:
+            print("** class name missing **")
+            return
+        if tokens["class"] not in self.__valid_classes:
+            print("** class doesn't exist **")
+            return
+        if not tokens["id"]:
+            print("** instance id missing **")
+            return
+        obj = storage.get(tokens["class"], tokens["id"])
+        if obj is None:
+            print("** no instance found **")
+            return
+        if not tokens["relation"]:
+            print("** relation missing **")
+            return
+        if tokens["relation"] not in self.__relations.get(tokens["class"], ()):
+            print("** relation doesn't exist **")
+            return
+
+        related = getattr(obj, tokens["relation"])()
+        obj_str_list = [str(related_obj) for related_obj in related]
+        if obj_str_list != []:
+            print(obj_str_list)
+
+    def do_where(self, args):
+        """Handler for the where command"""
+        pattern = (
+            r"^(?P<class>\w+)?\ ?"
+            + r"(?P<attr>\w+)?\ ?"
+            + r"(?P<op>[=!<>]+)?\ ?"
+            + r"(?P<value>\"[^\"]*\"|\'[^\']*\'|\S+)?\ ?"
+            + r"(?P<extra>.*)$"
+        )
+        tokens = re.search(pattern, args).groupdict()  # type: ignore
+        if not tokens["class"]:
+            print("** class name missing **")
+            return
+        if tokens["class"] not in self.__valid_classes:
+            print("** class doesn't exist **")
+            return
+        if not tokens["attr"]:
+            print("** attribute name missing **")
+            return
+        if not tokens["op"]:
+            print("** operator missing **")
+            return
+        op = "==" if tokens["op"] == "=" else tokens["op"]
+        if op not in operators:
+            print("** operator doesn't exist **")
+            return
+        if tokens["value"] is None:
+            print("** value missing **")
+            return
+
+        # quoted values are strings, the others are casted like with update
+        value = tokens["value"]
+        if value[0] in "\"'":
+            value = value[1:-1]
         else:
-            tokens["value"] = str(tokens["value"])
+            value = cast(value)
 
-        obj = storage.all()[key]
-        setattr(obj, tokens["attr"], tokens["value"])
-        storage.save()
+        objects = storage.query(tokens["class"], (tokens["attr"], op, value))
+        obj_str_list = [str(obj) for obj in objects.values()]
+        if obj_str_list != []:
+            print(obj_str_list)
+
+    def do_export(self, args):
+        """Handler for the export command"""
+        pattern = r"^(?P<class>\w+)?\ ?" + r"(?P<options>(?:\w+=\S*\ ?)*)$"
+        match = re.search(pattern, args.strip())
+        if not match:
+            print("** option doesn't exist **")
+            return
+        tokens = match.groupdict()
+        if tokens["class"] and tokens["class"] not in self.__valid_classes:
+            print("** class doesn't exist **")
+            return
+        options = dict(
+            option.split("=", 1) for option in tokens["options"].split()
+        )
+        if set(options) - {"format", "fields", "file"}:
+            print("** option doesn't exist **")
+            return
+        format = options.get("format", "ndjson")
+        if format not in ("ndjson", "csv"):
+            print("** format doesn't exist **")
+            return
+        fields = options["fields"].split(",") if "fields" in options else None
+        if fields is not None and not all(fields):
+            print("** field name missing **")
+            return
+
+        if "file" not in options:
+            storage.export(sys.stdout, tokens["class"], fields, format)
+            return
+        try:
+            with open(options["file"], "w", newline="") as file:
+                count = storage.export(file, tokens["class"], fields, format)
+        except OSError:
+            print("** file can't be written **")
+            return
+        print(count)
+
+    def do_aggregate(self, args):
+        """Handler for the aggregate command"""
+        pattern = (
+            r"^(?P<class>\w+)?\ ?"
+            + r"(?P<func>\w+)?\ ?"
+            + r"(?P<attr>\w+)?\ ?"
+            + r"(?P<group>\w+)?\ ?"
+            + r"(?P<extra>.*)$"
+        )
+        tokens = re.search(pattern, args).groupdict()  # type: ignore
+        if not tokens["class"]:
+            print("** class name missing **")
+            return
+        if tokens["class"] not in self.__valid_classes:
+            print("** class doesn't exist **")
+            return
+        if not tokens["func"]:
+            print("** function missing **")
+            return
+        if tokens["func"] not in functions:
+            print("** function doesn't exist **")
+            return
+        if not tokens["attr"]:
+            print("** attribute name missing **")
+            return
+
+        columns = storage.columns(tokens["class"])
+        if tokens["attr"] not in columns.numeric or (
+            tokens["group"]
+            and tokens["group"] not in columns.numeric + columns.labels
+        ):
+            print("** attribute doesn't exist **")
+            return
+        print(
+            columns.aggregate(tokens["func"], tokens["attr"], tokens["group"])
+        )
+
+    def do_begin(self, args):
+        """Handler for the begin command"""
+        if storage.in_transaction():
+            print("** transaction already in progress **")
+            return
+        storage.begin()
+
+    def do_commit(self, args):
+        """Handler for the commit command"""
+        if not storage.in_transaction():
+            print("** no transaction in progress **")
+            return
+        storage.commit()
+
+    def do_rollback(self, args):
+        """Handler for the rollback command"""
+        if not storage.in_transaction():
+            print("** no transaction in progress **")
+            return
+        storage.rollback()
 
     def precmd(self, line):
         """Override precmd to handle commands like <class name>.cmd()"""
@@ -196,12 +411,30 @@ class HBNBCommand(cmd.Cmd):
 
         # <class name>.count()
         if line_tokens["cmd"] == "count":
-            count = [
-                type(obj).__name__ for obj in storage.all().values()
-            ].count(line_tokens["class"])
-            print(count)
+            print(storage.count(line_tokens["class"]))
             return ""
 
+        # <class name>.<relation>(<id>), like State.cities(<id>)
+        relations = self.__relations.get(line_tokens["class"], ())
+        if line_tokens["cmd"] in relations:
+            return "related {} {} {}".format(
+                line_tokens["class"],
+                line_tokens["args"].strip().strip("\"'"),
+                line_tokens["cmd"],
+            )
+
+        # <class name>.all(<limit>, <cursor>)
+        if line_tokens["cmd"] == "all" and line_tokens["args"].strip():
+            page_args = [
+                arg.strip().strip("\"'")
+                for arg in line_tokens["args"].split(",")
+            ]
+            options = ""
+            for name, value in zip(("limit", "after"), page_args):
+                if value:
+                    options += " --{} {}".format(name, value)
+            return "all {}{}".format(line_tokens["class"], options)
+
         args_match = re.search(args_pattern, line_tokens["args"])
         args_tokens = args_match.groupdict()  # pyright: ignore
 
@@ -212,15 +445,17 @@ class HBNBCommand(cmd.Cmd):
             upd_dict = None
 
         if line_tokens["cmd"] == "update" and type(upd_dict) is dict:
-            for attr in upd_dict:
-                self.do_update(
-                    "{} {} {} '{}'".format(
-                        line_tokens["class"],
-                        args_tokens["id"],
-                        attr,
-                        str(upd_dict[attr]),
+            # save once for the whole dictionary
+            with storage.transaction():
+                for attr in upd_dict:
+                    self.do_update(
+                        "{} {} {} '{}'".format(
+                            line_tokens["class"],
+                            args_tokens["id"],
+                            attr,
+                            str(upd_dict[attr]),
+                        )
                     )
-                )
             return ""
 
         # <class name>.cmd() -> cmds: all, show, destroy, update (without dict)
@@ -269,18 +504,23 @@ class HBNBCommand(cmd.Cmd):
     def help_destroy(self):
         """Help for the destroy command"""
         print(
-            "Usage: destroy <class name> <id>\n"
+            "Usage: destroy <class name> <id> [--cascade]\n"
             + "Destroys an instance based on the class name and id, and saves "
-            + "the change into the JSON file."
+            + "the change into the JSON file.\n"
+            + "With --cascade, the instances referring to it are destroyed too"
+            + ", like the cities of a state and their places."
         )
 
     def help_all(self):
         """Help for the all command"""
         print(
-            "Usage: all [class name]\n"
+            "Usage: all [class name] [--limit <N>] [--after <id>]\n"
             + "Prints the string representation of all instances.\n"
             + "With class name, then only string representation of instances "
-            + "with that class will be printed."
+            + "with that class will be printed.\n"
+            + "With --limit or --after, the instances of the class are "
+            + "printed in order of id, at most N of them, starting after the "
+            + "given id."
         )
 
     def help_update(self):
@@ -294,6 +534,85 @@ class HBNBCommand(cmd.Cmd):
             + "all extra arguments are ignored."
         )
 
+    def help_import(self):
+        """Help for the import command"""
+        print(
+            "Usage: import <class name> <file>\n"
+            + "Creates an instance of the given class name for every record "
+            + "of a CSV or NDJSON file, saves them to the JSON file and "
+            + "prints the number of instances created.\n"
+            + "The values are type casted like with update."
+        )
+
+    def help_related(self):
+        """Help for the related command"""
+        print(
+            "Usage: related <class name> <id> <relation>\n"
+            + "Prints the string representation of the instances related to "
+            + "an instance, where the relation is one of:\n"
+            + "  Amenity: places\n"
+            + "  City: places\n"
+            + "  Place: amenities, reviews\n"
+            + "  State: cities\n"
+            + "  User: places, reviews"
+        )
+
+    def help_where(self):
+        """Help for the where command"""
+        print(
+            "Usage: where <class name> <attribute name> <operator> <value>\n"
+            + "Prints the string representation of the instances of a class "
+            + "whose attribute compares to the value with the operator, one "
+            + "of =, ==, !=, <, <=, > or >=.\n"
+            + "The value is type casted like with update, unless it is quoted."
+        )
+
+    def help_export(self):
+        """Help for the export command"""
+        print(
+            "Usage: export [class name] [format=ndjson|csv] "
+            + "[fields=<attribute>,...] [file=<file>]\n"
+            + "Writes all instances, or the instances of a class, one per "
+            + "line as JSON objects or CSV rows.\n"
+            + "With fields, only these attributes are written. With file, the "
+            + "instances are written to the file and their number is printed."
+        )
+
+    def help_begin(self):
+        """Help for the begin command"""
+        print(
+            "Usage: begin\n"
+            + "Starts a transaction: the changes made by the next commands "
+            + "are only saved to the JSON file on commit.\n"
+            + "Quitting the console before commit drops the changes."
+        )
+
+    def help_commit(self):
+        """Help for the commit command"""
+        print(
+            "Usage: commit\n"
+            + "Ends the transaction and saves its changes to the JSON file."
+        )
+
+    def help_rollback(self):
+        """Help for the rollback command"""
+        print(
+            "Usage: rollback\n"
+            + "Ends the transaction and drops its changes, going back to the "
+            + "instances saved in the JSON file."
+        )
+
+    def help_aggregate(self):
+        """Help for the aggregate command"""
+        print(
+            "Usage: aggregate <class name> <function> <attribute name> "
+            + "[<group by attribute name>]\n"
+            + "Prints the count, sum, avg, min or max of a numeric attribute "
+            + "of all instances of a class.\n"
+            + "With a group by attribute, the result of every value of that "
+            + "attribute is printed."
+        )
+
 
 if __name__ == "__main__":
     HBNBCommand().cmdloop()
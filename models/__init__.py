@@ -1,6 +1,19 @@
 #!/usr/bin/python3
-"""Initialization file for the models package"""
-from models.engine.file_storage import FileStorage
+"""Initialization file for the models package
 
-storage = FileStorage()
+The storage engine is chosen with the HBNB_TYPE_STORAGE environment variable:
+"db" for a SQLite database (at HBNB_DB_PATH, hbnb.db by default), anything
+else for the JSON file storage.
+
+"""
+from os import getenv
+
+if getenv("HBNB_TYPE_STORAGE") == "db":
+    from models.engine.db_storage import DBStorage
+
+    storage = DBStorage(getenv("HBNB_DB_PATH", "hbnb.db"))
+else:
+    from models.engine.file_storage import FileStorage
+
+    storage = FileStorage()
 storage.reload()
@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 """Amenity class"""
 
+import models
 from models.base_model import BaseModel
 
 
@@ -13,3 +14,9 @@ class Amenity(BaseModel):
     """
 
     name = ""
+
+    def places(self):
+        """Returns the list of places with the amenity"""
+        return list(
+            models.storage.referrers("Place", "amenity_ids", self.id).values()
+        )
@@ -4,11 +4,61 @@
 This module contains the class definition of the BaseModel class, which is
 the parent class of all other classes that are used for the AirBnB console.
 
+The dates of an instance (`created_at` and `updated_at`) are datetimes. With
+lazy dates (see `BaseModel._lazy_dates`) the ISO strings an instance is built
+from are kept as they are instead, and only converted when the attribute is
+read, so that instances read from a file and saved again without reading
+their dates never parse or format them.
+
+The ids of new instances come from one of the generators of `models.ids`,
+random uuids by default.
+
 """
-import uuid
 from datetime import datetime
 
 import models
+from models.ids import uuid4
+
+
+class Timestamp:
+    """Date attribute of the model instances, converted when it is read
+
+    The value is kept in the dictionary of the instance, as a datetime or as
+    the ISO string it was built from, which is replaced by its datetime the
+    first time the attribute is read.
+
+    """
+
+    def __set_name__(self, owner, name):
+        """Keeps the name of the attribute"""
+        self.name = name
+
+    def __get__(self, obj, owner=None):
+        """Returns the datetime of the attribute, converting it if needed"""
+        if obj is None:
+            return self
+        attrs = obj.__dict__
+        try:
+            value = attrs[self.name]
+        except KeyError:
+            raise AttributeError(
+                f"'{type(obj).__name__}' object has no attribute "
+                f"'{self.name}'"
+            ) from None
+        if type(value) is str:
+            value = attrs[self.name] = datetime.fromisoformat(value)
+        return value
+
+    def __set__(self, obj, value):
+        """Sets the attribute"""
+        obj.__dict__[self.name] = value
+
+    def __delete__(self, obj):
+        """Deletes the attribute"""
+        try:
+            del obj.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
 
 
 class BaseModel:
@@ -18,9 +68,17 @@ class BaseModel:
         id (str): uuid of an instance
         created_at (datetime): date and time when an instance is created
         updated_at (datetime): date and time when an instance is updated
+        _lazy_dates (bool): keep the ISO strings of the dates of the
+            instances built from dictionaries until the dates are read
+        _new_id (callable): generator of the ids of new instances
 
     """
 
+    created_at = Timestamp()
+    updated_at = Timestamp()
+    _lazy_dates = False
+    _new_id = staticmethod(uuid4)
+
     def __init__(self, *args, **kwargs):
         """BaseModel class constructor
 
@@ -30,21 +88,37 @@ class BaseModel:
 
         """
         if kwargs:
-            for key in kwargs:
-                if key in ["created_at", "updated_at"]:
-                    setattr(self, key, datetime.fromisoformat(kwargs[key]))
-                    continue
-                elif key != "__class__":  # class name shouldn't be changed
-                    setattr(self, key, kwargs[key])
+            # Fill the attributes directly, it is not a change to be saved
+            attrs = self.__dict__
+            attrs.update(kwargs)
+            attrs.pop("__class__", None)  # class name shouldn't be changed
+            if not BaseModel._lazy_dates:
+                for key in ("created_at", "updated_at"):
+                    if type(attrs.get(key)) is str:
+                        attrs[key] = datetime.fromisoformat(attrs[key])
         else:
-            self.id = str(uuid.uuid4())
+            self.id = self._new_id()
             self.created_at = self.updated_at = datetime.now()
             # Add new instances to the storage dictionary of objects
             models.storage.new(self)
 
+    def __setattr__(self, name, value):
+        """Sets an attribute and marks the instance as changed"""
+        super().__setattr__(name, value)
+        models.storage.mark_dirty(self)
+
+    def __delattr__(self, name):
+        """Deletes an attribute and marks the instance as changed"""
+        super().__delattr__(name)
+        models.storage.mark_dirty(self)
+
     def __str__(self):
         """String representation of the instance"""
-        return f"[{type(self).__name__}] ({self.id}) {self.__dict__}"
+        attrs = self._attributes()
+        for name in ("created_at", "updated_at"):
+            if type(attrs.get(name)) is str:
+                getattr(self, name)  # converts the lazy date
+        return f"[{type(self).__name__}] ({self.id}) {attrs}"
 
     def save(self):
         """Saves the instance"""
@@ -54,10 +128,15 @@ class BaseModel:
 
     def to_dict(self):
         """Returns dictionary representation of the instance"""
-        obj_dict = {"__class__": type(self).__name__}
-        for attr in self.__dict__:
-            if attr in ["created_at", "updated_at"]:
-                obj_dict[attr] = self.__dict__[attr].isoformat()
-                continue
-            obj_dict[attr] = self.__dict__[attr]
+        # copied at once, while other threads may be setting attributes
+        obj_dict = {"__class__": type(self).__name__, **self._attributes()}
+        for attr in ("created_at", "updated_at"):
+            value = obj_dict.get(attr)
+            if value is not None and type(value) is not str:
+                obj_dict[attr] = value.isoformat()
+            # lazy dates not read yet are still their ISO string
         return obj_dict
+
+    def _attributes(self):
+        """Returns the dictionary of the attributes of the instance"""
+        return self.__dict__
@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 """City class"""
 
+import models
 from models.base_model import BaseModel
 
 
@@ -15,3 +16,9 @@ class City(BaseModel):
 
     state_id = ""
     name = ""
+
+    def places(self):
+        """Returns the list of places of the city"""
+        return list(
+            models.storage.referrers("Place", "city_id", self.id).values()
+        )
@@ -0,0 +1,128 @@
+#!/usr/bin/python3
+"""Compact models
+
+This module builds the compact version of a model class: a subclass with the
+same name that keeps the declared attributes of the class (id, created_at,
+updated_at and the class level defaults such as `Place.number_rooms`) in
+`__slots__` instead of the instance dictionary, which is only used for the
+other attributes added with `update`.
+
+The order in which the attributes are set is kept in a tuple shared between
+the instances that set the same attributes in the same order, so that
+`to_dict()` and `__str__` give the same output as the regular classes.
+
+"""
+from datetime import datetime
+
+import models
+
+_compact_classes = {}
+_orders = {}  # the shared tuples of attribute names
+
+
+def _shared(order):
+    """Returns the shared tuple equal to `order`"""
+    return _orders.setdefault(order, order)
+
+
+def declared_defaults(cls):
+    """Returns the class level defaults of a model class, by name
+
+    Slots of compact classes are left out, so the defaults of a compact class
+    are the ones of its regular class.
+
+    """
+    defaults = {}
+    for klass in reversed(cls.__mro__):
+        for name, value in vars(klass).items():
+            if (
+                not name.startswith("_")
+                and not callable(value)
+                and not hasattr(value, "__get__")
+            ):
+                defaults[name] = value
+    return defaults
+
+
+def declared_attributes(cls):
+    """Returns the names of the attributes declared by a model class"""
+    names = ["id", "created_at", "updated_at"]
+    names.extend(name for name in declared_defaults(cls) if name not in names)
+    return names
+
+
+def compact_class(cls):
+    """Returns the compact version of the model class `cls`"""
+    if cls in _compact_classes:
+        return _compact_classes[cls]
+    names = declared_attributes(cls)
+    defaults = declared_defaults(cls)
+
+    def __init__(self, *args, **kwargs):
+        """Compact class constructor, see BaseModel.__init__"""
+        if not kwargs:
+            cls.__init__(self, *args)
+            return
+        set_attr = object.__setattr__
+        for key, value in kwargs.items():
+            if key in ("created_at", "updated_at") and type(value) is str:
+                value = datetime.fromisoformat(value)
+            if key != "__class__":
+                set_attr(self, key, value)
+        order = tuple(key for key in kwargs if key != "__class__")
+        set_attr(self, "_order", _shared(order))
+
+    def __getattr__(self, name):
+        """Returns the class default of a declared attribute that isn't set"""
+        if name in defaults:
+            return defaults[name]
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{name}'"
+        )
+
+    def __setattr__(self, name, value):
+        """Sets an attribute and marks the instance as changed"""
+        object.__setattr__(self, name, value)
+        order = _get_order(self)
+        if name not in order:
+            object.__setattr__(self, "_order", _shared(order + (name,)))
+        models.storage.mark_dirty(self)
+
+    def __delattr__(self, name):
+        """Deletes an attribute and marks the instance as changed"""
+        object.__delattr__(self, name)
+        order = _get_order(self)
+        object.__setattr__(
+            self, "_order", _shared(tuple(n for n in order if n != name))
+        )
+        models.storage.mark_dirty(self)
+
+    def _attributes(self):
+        """Returns the dictionary of the attributes of the instance"""
+        return {name: getattr(self, name) for name in _get_order(self)}
+
+    compact = type(
+        cls.__name__,
+        (cls,),
+        {
+            "__slots__": ("_order", *names),
+            "__module__": cls.__module__,
+            "__qualname__": cls.__qualname__,
+            "__doc__": f"Compact version of the {cls.__name__} class",
+            "__init__": __init__,
+            "__getattr__": __getattr__,
+            "__setattr__": __setattr__,
+            "__delattr__": __delattr__,
+            "_attributes": _attributes,
+        },
+    )
+    _compact_classes[cls] = compact
+    return compact
+
+
+def _get_order(obj):
+    """Returns the attribute names of a compact instance, in order"""
+    try:
+        return object.__getattribute__(obj, "_order")
+    except AttributeError:
+        return ()
@@ -0,0 +1,114 @@
+#!/usr/bin/python3
+"""Asyncio
+
+This module contains the AsyncStorage class, an asyncio interface to
+FileStorage for programs running an event loop.
+
+Reading and writing the JSON file are done in a thread of the executor of the
+event loop, so that the loop keeps running meanwhile. Saves are done one at a
+time, in the order they were asked for, and the saves asked for while another
+one runs are done together by the next one. The objects are looked up in the
+event loop itself when they are in memory, and in the executor when their
+class is still to be read from a data directory or a snapshot file.
+
+"""
+import asyncio
+from functools import partial
+
+from models.engine.file_storage import FileStorage
+
+
+class AsyncStorage:
+    """Asyncio interface to a FileStorage"""
+
+    def __init__(self, storage=None, executor=None):
+        """AsyncStorage class constructor
+
+        The thread-safe mode of FileStorage is turned on, as the objects are
+        saved by another thread while the event loop may change them.
+
+        Args:
+            storage (FileStorage): the storage, `models.storage` when None
+            executor (concurrent.futures.Executor): the executor of the reads
+                and writes of the file, the default one of the loop when None
+
+        Raises:
+            TypeError: if the storage isn't a FileStorage
+
+        """
+        if storage is None:
+            from models import storage
+        if not isinstance(storage, FileStorage):
+            raise TypeError("AsyncStorage needs a FileStorage")
+        FileStorage.configure(threadsafe=True)
+        self.__storage = storage
+        self.__executor = executor
+        self.__lock = None  # asyncio.Lock, created in the running loop
+        self.__requested = 0  # number of saves asked for
+        self.__saved = 0  # number of saves asked for before the last save
+
+    @property
+    def storage(self):
+        """The FileStorage behind the interface"""
+        return self.__storage
+
+    async def asave(self):
+        """Saves the objects, like `FileStorage.save`, waiting for the write
+
+        In background mode this also waits for the writer thread (see
+        `FileStorage.flush`).
+
+        """
+        self.__requested += 1
+        requested = self.__requested
+        if self.__lock is None:
+            self.__lock = asyncio.Lock()
+        async with self.__lock:
+            if self.__saved >= requested:
+                return  # saved by a save that started after it was asked
+            requested = self.__requested
+            await self.__run(self.__save)
+            self.__saved = requested
+
+    async def areload(self):
+        """Reads the objects from the file, like `FileStorage.reload`"""
+        await self.__run(self.__storage.reload)
+
+    async def aget(self, cls, id):
+        """Returns the object of class `cls` with `id`, None if not found"""
+        return await self.__lookup(cls, self.__storage.get, cls, id)
+
+    async def aall(self, cls=None):
+        """Returns a copy of the dictionary of objects, or of class `cls`"""
+        return await self.__lookup(cls, self.__storage.all, cls)
+
+    async def aquery(self, cls, *predicates):
+        """Returns the objects of class `cls` matching all the predicates
+
+        See `FileStorage.query`.
+
+        """
+        return await self.__lookup(
+            cls, self.__storage.query, cls, *predicates
+        )
+
+    def __save(self):
+        """Saves the objects and waits for the file to be written"""
+        self.__storage.save()
+        self.__storage.flush()
+
+    async def __lookup(self, cls, function, *args):
+        """Returns `function(*args)`, run in the executor if it reads objects
+
+        It does when the objects of `cls`, or of any class if None, are still
+        to be read (see `FileStorage.is_loaded`).
+
+        """
+        if self.__storage.is_loaded(cls):
+            return function(*args)
+        return await self.__run(partial(function, *args))
+
+    def __run(self, function):
+        """Returns a future of `function` called in the executor"""
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self.__executor, function)
@@ -0,0 +1,183 @@
+#!/usr/bin/python3
+"""Bulk
+
+This module contains the helpers used to import objects in bulk: readers of
+CSV and NDJSON files, the casting of attribute values used by the console, and
+the building of objects from records with ids and timestamps given in bulk.
+
+It also contains the writers used to export objects, which go through the
+dictionaries of the objects one at a time, so that memory use doesn't depend
+on the number of objects exported.
+
+"""
+import csv
+import json
+import os
+from datetime import datetime
+
+from models.base_model import BaseModel
+from models.compact import declared_attributes
+from models.ids import random_ids, uuid4
+
+formats = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+_reserved = ("id", "created_at", "updated_at")
+
+
+def cast(value):
+    """Casts a string to an int or a float when it is a number"""
+    first = value[:1]
+    if first.isascii() and first not in "-.0123456789":
+        return value  # most values, skipped without the checks below
+    try:
+        if value.lstrip("-").isdigit():
+            return int(value)
+        if value.lstrip("-").replace(".", "").isnumeric():
+            return float(value)
+    except ValueError:
+        pass  # like 1.2.3, not a number after all
+    return str(value)
+
+
+def read_records(file_path, format=None):
+    """Yields the records (dictionaries) of a CSV or NDJSON file
+
+    Empty CSV fields and blank lines are skipped.
+
+    Args:
+        file_path (str): path of the file
+        format (str): csv or ndjson, chosen from the extension of the file
+            when None
+
+    Raises:
+        ValueError: if the format isn't supported, or a record is invalid:
+            a CSV row with more fields than the header, or a NDJSON line
+            that isn't a JSON object
+        FileNotFoundError: if the file doesn't exist
+
+    """
+    if format is None:
+        format = formats.get(os.path.splitext(file_path)[1].lower())
+    if format not in ("csv", "ndjson"):
+        raise ValueError(f"unknown import format '{format}'")
+    with open(file_path, "r", newline="") as file:
+        if format == "csv":
+            for row in csv.DictReader(file):
+                if None in row:
+                    raise ValueError("more CSV fields than columns")
+                yield {name: value for name, value in row.items() if value}
+        else:
+            for line in file:
+                if line.strip():
+                    record = json.loads(line)
+                    if type(record) is not dict:
+                        raise ValueError(f"not a JSON object: {line!r}")
+                    yield record
+
+
+def new_ids(count):
+    """Returns `count` new ids, from the id generator of the models
+
+    Random uuids, the default, are formatted from a single random read.
+
+    """
+    new_id = BaseModel._new_id
+    if new_id is uuid4:
+        return random_ids(count)
+    return [new_id() for _ in range(count)]
+
+
+def build_objects(cls, records, batch_size=10000):
+    """Yields the objects of class `cls` built from `records`
+
+    String values are cast like the update command does. Records without an
+    id get a new one, and the objects built from the same batch of records
+    share the timestamps missing from their records.
+
+    Args:
+        cls (type): the model class
+        records (iterable): the dictionaries of attributes
+        batch_size (int): number of ids generated at a time
+
+    """
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == batch_size:
+            yield from _build_batch(cls, batch)
+            batch = []
+    yield from _build_batch(cls, batch)
+
+
+def _build_batch(cls, batch):
+    """Yields the objects of class `cls` built from a list of records"""
+    now = datetime.now()
+    for record, obj_id in zip(batch, new_ids(len(batch))):
+        attrs = {"id": obj_id, "created_at": now, "updated_at": now}
+        for name, value in record.items():
+            if name in _reserved:
+                attrs[name] = value
+            elif type(value) is str:
+                attrs[name] = cast(value)
+            elif name != "__class__":
+                attrs[name] = value
+        yield cls(**attrs)
+
+
+def default_fields(cls=None):
+    """Returns the CSV columns of an export of class `cls`, or of any class
+
+    These are the class name and the declared attributes of the class, the
+    other attributes of the objects are left out of CSV exports.
+
+    """
+    if cls is None:
+        return ["__class__", "id", "created_at", "updated_at"]
+    return ["__class__", *declared_attributes(cls)]
+
+
+def project(dicts, fields):
+    """Yields the dictionaries of `dicts` with only the keys in `fields`"""
+    for o_dict in dicts:
+        yield {name: o_dict[name] for name in fields if name in o_dict}
+
+
+def write_records(dicts, file, format="ndjson", fields=None):
+    """Writes the dictionaries of `dicts` to `file` as they come
+
+    Args:
+        dicts (iterable): the dictionaries of the objects
+        file (TextIO): the file to write to
+        format (str): ndjson, one JSON object per line, or csv, with a
+            header row
+        fields (list): if given, only these keys are written, in this order
+            for CSV, which writes empty fields for missing keys
+
+    Returns:
+        int: the number of records written
+
+    Raises:
+        ValueError: if the format isn't supported, or if `fields` is missing
+            for CSV
+
+    """
+    count = 0
+    if format == "ndjson":
+        if fields is not None:
+            dicts = project(dicts, fields)
+        encode = json.JSONEncoder(separators=(",", ":")).encode
+        for o_dict in dicts:
+            file.write(encode(o_dict) + "\n")
+            count += 1
+    elif format == "csv":
+        if fields is None:
+            raise ValueError("the fields of a CSV export are missing")
+        writer = csv.DictWriter(
+            file, fields, extrasaction="ignore", lineterminator="\n"
+        )
+        writer.writeheader()
+        for o_dict in dicts:
+            writer.writerow(o_dict)
+            count += 1
+    else:
+        raise ValueError(f"unknown export format '{format}'")
+    return count
@@ -0,0 +1,206 @@
+#!/usr/bin/python3
+"""Columns
+
+This module contains the ColumnStore class definition, a columnar copy of the
+declared attributes of the objects of a class, used to filter and aggregate
+them without going through every object.
+
+Numeric attributes are kept in `array` buffers of floats, and the other
+declared attributes (like `Place.city_id`) in lists, so that they can be used
+to group results. When NumPy is installed, filters and aggregates run on
+NumPy views of the buffers.
+
+"""
+import math
+from array import array
+
+from models.compact import declared_defaults
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - numpy is optional
+    numpy = None
+
+functions = ("count", "sum", "avg", "min", "max")
+
+
+def _reduce(func, values):
+    """Applies the aggregate function `func` to a list of numbers"""
+    if func == "count":
+        return len(values)
+    if not values:
+        return None
+    if func == "sum":
+        return math.fsum(values)
+    if func == "avg":
+        return math.fsum(values) / len(values)
+    return min(values) if func == "min" else max(values)
+
+
+class ColumnStore:
+    """Columnar copy of the declared attributes of the objects of a class
+
+    Attributes:
+        numeric (list): names of the numeric columns
+        labels (list): names of the other columns
+        keys (list): key of the object of every row
+
+    """
+
+    def __init__(self, cls):
+        """ColumnStore class constructor
+
+        Args:
+            cls (type): the model class, its declared attributes with an int
+                or float default are the numeric columns
+
+        """
+        self.defaults = declared_defaults(cls)
+        self.numeric = [
+            name
+            for name, value in self.defaults.items()
+            if type(value) in (int, float)
+        ]
+        self.labels = [
+            name
+            for name, value in self.defaults.items()
+            if type(value) is str
+        ]
+        self.keys = []
+        self.__rows = {}
+        self.__columns = {name: array("d") for name in self.numeric}
+        self.__columns.update({name: [] for name in self.labels})
+
+    def __len__(self):
+        """Returns the number of rows"""
+        return len(self.keys)
+
+    def add(self, key, obj):
+        """Adds or updates the row of `obj` (an object or its dictionary)"""
+        if key in self.__rows:
+            self.update(key, obj)
+            return
+        self.__rows[key] = len(self.keys)
+        self.keys.append(key)
+        for name, column in self.__columns.items():
+            column.append(self.__value(obj, name))
+
+    def update(self, key, obj):
+        """Updates the row of `obj` with its current attributes"""
+        row = self.__rows[key]
+        for name, column in self.__columns.items():
+            column[row] = self.__value(obj, name)
+
+    def remove(self, key):
+        """Removes the row of `key`, moving the last row in its place"""
+        row = self.__rows.pop(key, None)
+        if row is None:
+            return
+        last_key = self.keys.pop()
+        for column in self.__columns.values():
+            last = column.pop()
+            if last_key != key:
+                column[row] = last
+        if last_key != key:
+            self.keys[row] = last_key
+            self.__rows[last_key] = row
+
+    def column(self, name):
+        """Returns a copy of the values of the column `name`"""
+        return self.__columns[name][:]
+
+    def select(self, **ranges):
+        """Returns the keys of the rows within all the given ranges
+
+        Args:
+            **ranges (dict): (low, high) inclusive bounds by column name,
+                either bound may be None
+
+        """
+        return [self.keys[row] for row in self.__select(ranges)]
+
+    def aggregate(self, func, name, group_by=None, **ranges):
+        """Aggregates the column `name` of the rows within the ranges
+
+        Rows where the value isn't a number are left out.
+
+        Args:
+            func (str): one of count, sum, avg, min or max
+            name (str): name of the numeric column
+            group_by (str): if given, name of the column to group rows by
+            **ranges (dict): (low, high) bounds by numeric column name
+
+        Returns:
+            the aggregate value, or a dictionary of the aggregate value of
+            every group when `group_by` is given
+
+        """
+        if func not in functions:
+            raise ValueError(f"unknown aggregate function '{func}'")
+        if name not in self.numeric:
+            raise KeyError(name)
+        ranges = dict(ranges)
+        ranges.setdefault(name, (None, None))  # leaves out missing numbers
+        rows = self.__select(ranges)
+        values = self.__columns[name]
+        if group_by is None:
+            if numpy is not None and func != "count" and len(rows):
+                selected = numpy.frombuffer(values, dtype=numpy.float64)[rows]
+                result = {
+                    "sum": numpy.sum,
+                    "avg": numpy.mean,
+                    "min": numpy.min,
+                    "max": numpy.max,
+                }[func](selected)
+                return float(result)
+            return _reduce(func, [values[row] for row in rows])
+        groups = {}
+        group_column = self.__columns[group_by]
+        for row in rows:
+            groups.setdefault(group_column[row], []).append(values[row])
+        return {
+            group: _reduce(func, group_values)
+            for group, group_values in groups.items()
+        }
+
+    def __select(self, ranges):
+        """Returns the row numbers within all the ranges"""
+        for name in ranges:
+            if name not in self.numeric:
+                raise KeyError(name)
+        if numpy is not None and self.keys:
+            mask = numpy.ones(len(self.keys), dtype=bool)
+            for name, (low, high) in ranges.items():
+                values = numpy.frombuffer(
+                    self.__columns[name], dtype=numpy.float64
+                )
+                mask &= ~numpy.isnan(values)
+                if low is not None:
+                    mask &= values >= low
+                if high is not None:
+                    mask &= values <= high
+            return numpy.flatnonzero(mask).tolist()
+        rows = range(len(self.keys))
+        for name, (low, high) in ranges.items():
+            values = self.__columns[name]
+            rows = [
+                row
+                for row in rows
+                if not math.isnan(values[row])
+                and (low is None or values[row] >= low)
+                and (high is None or values[row] <= high)
+            ]
+        return list(rows)
+
+    def __value(self, obj, name):
+        """Returns the column value of the attribute `name` of `obj`"""
+        default = self.defaults[name]
+        if type(obj) is dict:
+            value = obj.get(name, default)
+        else:
+            value = getattr(obj, name, default)
+        if type(default) is str:
+            return value
+        if type(value) in (int, float):
+            return float(value)
+        return math.nan
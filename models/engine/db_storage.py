@@ -0,0 +1,571 @@
+#!/usr/bin/python3
+"""DBStorage
+
+This module contains the DBStorage class definition, which is used to store
+instances in a SQLite database, with a table per class indexed by id.
+
+Unlike FileStorage, objects are only read from the database when they are
+asked for, and saving only writes the objects that changed since the last
+save, in a single transaction. Saves can also be deferred to the end of a
+transaction of several changes (see `DBStorage.transaction`).
+
+"""
+import json
+import sqlite3
+from contextlib import contextmanager
+
+from models.engine.bulk import build_objects, default_fields, write_records
+from models.engine.columns import ColumnStore
+from models.engine.file_storage import classes
+from models.engine.indexes import (
+    index_types,
+    matches,
+    operators,
+    references,
+)
+from models.engine.relations import delete_referrers, relations
+
+
+class DBStorage:
+    """This class saves and manages the data using a SQLite database"""
+
+    def __init__(self, db_path="hbnb.db"):
+        """DBStorage class constructor
+
+        Args:
+            db_path (str): path of the SQLite database file
+
+        """
+        self.__db_path = db_path
+        self.__connection = None
+        self.__objects = {}  # objects read or added, by key
+        self.__dirty = {}  # changed objects since the last save
+        self.__depth = 0  # number of nested transactions in progress
+        self.__savepoints = []  # changes made before nested transactions
+
+    def all(self, cls=None):
+        """Returns a dictionary of all objects, or of objects of `cls`
+
+        Note that this reads every row of the table(s) from the database.
+
+        """
+        names = [self.__name(cls)] if cls is not None else list(classes)
+        result = {}
+        for cls_name in names:
+            if cls_name not in classes:
+                continue
+            for obj_id, data in self.__execute(
+                f'SELECT id, data FROM "{cls_name}"'
+            ):
+                key = f"{cls_name}.{obj_id}"
+                if key not in self.__dirty:
+                    result[key] = self.__cache(key, data)
+            for key, obj in self.__dirty.items():
+                if obj is not None and type(obj).__name__ == cls_name:
+                    result[key] = obj
+        return result
+
+    def get(self, cls, id):
+        """Returns the object of class `cls` with `id`, None if not found"""
+        cls_name = self.__name(cls)
+        if cls_name not in classes:
+            return None
+        key = f"{cls_name}.{id}"
+        if key in self.__dirty or key in self.__objects:
+            return self.__objects.get(key)
+        row = self.__execute(
+            f'SELECT data FROM "{cls_name}" WHERE id = ?', (id,)
+        ).fetchone()
+        return self.__cache(key, row[0]) if row else None
+
+    def count(self, cls=None):
+        """Returns the number of objects, or of objects of class `cls`"""
+        names = [self.__name(cls)] if cls is not None else list(classes)
+        total = 0
+        for cls_name in names:
+            if cls_name not in classes:
+                continue
+            total += self.__execute(
+                f'SELECT COUNT(*) FROM "{cls_name}"'
+            ).fetchone()[0]
+            for key, obj in self.__dirty.items():
+                name, _, obj_id = key.partition(".")
+                if name != cls_name:
+                    continue
+                stored = self.__execute(
+                    f'SELECT 1 FROM "{cls_name}" WHERE id = ?', (obj_id,)
+                ).fetchone()
+                total += (obj is not None) - (stored is not None)
+        return total
+
+    def page(self, cls, limit=None, after=None):
+        """Returns a page of the objects of class `cls`, in order of id
+
+        The rows are read in order of the primary key, from the id after
+        which the page starts, so every page costs the size of the page.
+
+        Args:
+            cls (type|str): the class of the objects
+            limit (int): maximum number of objects, all of them if None
+            after (str): if given, only the objects with a greater id, this
+                is the id of the last object of the previous page
+
+        Returns:
+            dict: the objects of the page by key, in order of id
+
+        """
+        cls_name = self.__name(cls)
+        if cls_name not in classes:
+            return {}
+        after = "" if after is None else after
+        # changed objects replace their row, and are merged in by id
+        changed = {
+            key.partition(".")[2]: obj
+            for key, obj in self.__dirty.items()
+            if key.partition(".")[0] == cls_name
+        }
+        rows = self.__execute(
+            f'SELECT id, data FROM "{cls_name}" WHERE id > ? ORDER BY id'
+            " LIMIT ?",
+            (after, -1 if limit is None else limit + len(changed)),
+        )
+        page = {
+            obj_id: data for obj_id, data in rows if obj_id not in changed
+        }
+        page.update(
+            (obj_id, obj)
+            for obj_id, obj in changed.items()
+            if obj is not None and obj_id > after
+        )
+        result = {}
+        for obj_id in sorted(page)[:limit]:
+            key = f"{cls_name}.{obj_id}"
+            obj = page[obj_id]
+            result[key] = self.__cache(key, obj) if type(obj) is str else obj
+        return result
+
+    def create_index(self, cls, name, kind="hash"):
+        """Creates an index on the attribute `name` of the class `cls`
+
+        The index is an index of the table on the attribute in the JSON data
+        of the rows, which answers both kinds of predicates.
+
+        Args:
+            cls (type|str): the class of the objects
+            name (str): name of the attribute
+            kind (str): hash or sorted, both kinds are the same index here
+
+        Raises:
+            ValueError: if the kind of index or the name isn't supported
+
+        """
+        if kind not in index_types:
+            raise ValueError(f"unknown index kind '{kind}'")
+        if not name.isidentifier():
+            raise ValueError(f"invalid attribute name '{name}'")
+        cls_name = self.__name(cls)
+        with self.__connection:
+            self.__connection.execute(
+                f'CREATE INDEX IF NOT EXISTS "{cls_name}.{name}"'
+                f' ON "{cls_name}" (json_extract(data, \'$.{name}\'))'
+            )
+
+    def drop_index(self, cls, name):
+        """Removes the index on the attribute `name` of the class `cls`"""
+        with self.__connection:
+            self.__connection.execute(
+                f'DROP INDEX IF EXISTS "{self.__name(cls)}.{name}"'
+            )
+
+    def query(self, cls, *predicates):
+        """Returns the objects of class `cls` matching all the predicates
+
+        The rows are selected by the database, with the indexes of the
+        table, then the objects are checked like FileStorage does.
+
+        Args:
+            cls (type|str): the class of the objects
+            *predicates (tuple): (attribute name, operator, value) where the
+                operator is one of ==, !=, <, <=, > or >=
+
+        Returns:
+            dict: the matching objects by key
+
+        Raises:
+            ValueError: if an operator isn't supported
+
+        """
+        cls_name = self.__name(cls)
+        for predicate in predicates:
+            if predicate[1] not in operators:
+                raise ValueError(f"unknown operator '{predicate[1]}'")
+        if cls_name not in classes:
+            return {}
+        conditions = []
+        parameters = []
+        for name, op, value in predicates:
+            if type(value) is str:
+                types = "'text'"
+            elif type(value) in (int, float) and value == value:
+                types = "'integer', 'real'"
+            else:
+                continue
+            if op == "!=" or not name.isidentifier():
+                continue
+            expr = f"json_extract(data, '$.{name}')"
+            # a missing attribute may match with its class default
+            conditions.append(
+                f"({expr} IS NULL OR (typeof({expr}) IN ({types})"
+                f" AND {expr} {'=' if op == '==' else op} ?))"
+            )
+            parameters.append(value)
+        sql = f'SELECT id, data FROM "{cls_name}"'
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        result = {}
+        for obj_id, data in self.__execute(sql, parameters).fetchall():
+            key = f"{cls_name}.{obj_id}"
+            if key in self.__dirty:
+                continue
+            obj = self.__cache(key, data)
+            if all(matches(obj, predicate) for predicate in predicates):
+                result[key] = obj
+        for key, obj in self.__dirty.items():
+            if (
+                obj is not None
+                and type(obj).__name__ == cls_name
+                and all(matches(obj, predicate) for predicate in predicates)
+            ):
+                result[key] = obj
+        return result
+
+    def columns(self, cls):
+        """Returns a column store of the objects of class `cls`
+
+        The column store is built from every object of the class each time.
+
+        Raises:
+            KeyError: if `cls` isn't a model class
+
+        """
+        cls_name = self.__name(cls)
+        store = ColumnStore(classes[cls_name])
+        for key, obj in self.all(cls_name).items():
+            store.add(key, obj)
+        return store
+
+    def new(self, obj):
+        """Adds `obj` to the objects to be saved"""
+        key = f"{type(obj).__name__}.{obj.id}"
+        self.__objects[key] = obj
+        self.__dirty[key] = obj
+
+    def mark_dirty(self, obj):
+        """Marks `obj` as changed if it belongs to this storage"""
+        key = f"{type(obj).__name__}.{getattr(obj, 'id', None)}"
+        if self.__objects.get(key) is obj:
+            self.__dirty[key] = obj
+
+    def referrers(self, cls, name, id):
+        """Returns the objects of class `cls` referring to the id `id`
+
+        Rows referring to an id from a single id attribute are found with the
+        index of the attribute created on reload.
+
+        Args:
+            cls (type|str): the class of the referring objects
+            name (str): the attribute holding an id or a list of ids
+            id (str): the referred id
+
+        Returns:
+            dict: the referring objects by key
+
+        """
+        cls_name = self.__name(cls)
+        if cls_name not in classes or not name.isidentifier():
+            return {}
+        if type(getattr(classes[cls_name], name, None)) is list:
+            condition = (
+                f"? IN (SELECT value FROM json_each(data, '$.{name}'))"
+            )
+        else:
+            condition = f"json_extract(data, '$.{name}') = ?"
+        result = {}
+        for obj_id, data in self.__execute(
+            f'SELECT id, data FROM "{cls_name}" WHERE {condition}', (id,)
+        ).fetchall():
+            key = f"{cls_name}.{obj_id}"
+            if key not in self.__dirty:
+                result[key] = self.__cache(key, data)
+        for key, obj in self.__dirty.items():
+            if (
+                obj is not None
+                and type(obj).__name__ == cls_name
+                and id in references(obj, name)
+            ):
+                result[key] = obj
+        return result
+
+    def delete(self, obj=None, cascade=False):
+        """Deletes `obj` from the database on the next save
+
+        Args:
+            obj (BaseModel): the object to delete
+            cascade (bool): also delete the objects referring to `obj` (see
+                `models.engine.relations`), and remove its id from lists of
+                ids
+
+        """
+        if obj is None:
+            return
+        key = f"{type(obj).__name__}.{obj.id}"
+        self.__objects.pop(key, None)
+        self.__dirty[key] = None
+        if cascade:
+            delete_referrers(self, obj)
+
+    def iter_dicts(self, cls=None):
+        """Yields the dictionary representations of the objects one by one
+
+        Rows are read from the database as they are iterated, without
+        building objects for them.
+
+        Args:
+            cls (type|str): if given, only the objects of this class
+
+        """
+        names = [self.__name(cls)] if cls is not None else list(classes)
+        for cls_name in names:
+            if cls_name not in classes:
+                continue
+            for obj_id, data in self.__connection.execute(
+                f'SELECT id, data FROM "{cls_name}"'
+            ):
+                key = f"{cls_name}.{obj_id}"
+                if key in self.__dirty:
+                    continue
+                obj = self.__objects.get(key)
+                yield obj.to_dict() if obj is not None else json.loads(data)
+            for key, obj in list(self.__dirty.items()):
+                if obj is not None and type(obj).__name__ == cls_name:
+                    yield obj.to_dict()
+
+    def export(self, file, cls=None, fields=None, format="ndjson"):
+        """Writes the objects to `file` one by one, as NDJSON or CSV
+
+        Args:
+            file (TextIO): the file to write to
+            cls (type|str): if given, only the objects of this class
+            fields (list): if given, only these attributes are written, CSV
+                exports default to the declared attributes of the class
+            format (str): ndjson or csv
+
+        Returns:
+            int: the number of objects written
+
+        Raises:
+            ValueError: if the format isn't supported
+            KeyError: if `cls` isn't a model class
+
+        """
+        cls_name = self.__name(cls) if cls is not None else None
+        if format == "csv" and fields is None:
+            fields = default_fields(cls_name and classes[cls_name])
+        return write_records(self.iter_dicts(cls_name), file, format, fields)
+
+    def bulk_import(self, cls, records, save_every=None):
+        """Adds the objects of class `cls` built from `records` and saves
+
+        Args:
+            cls (type|str): the model class, or its name
+            records (iterable): the dictionaries of attributes of the objects,
+                see `models.engine.bulk.build_objects`
+            save_every (int): if given, also save after every `save_every`
+                objects, else only once at the end
+
+        Returns:
+            int: the number of objects added
+
+        Raises:
+            KeyError: if `cls` isn't a model class
+
+        """
+        count = 0
+        for obj in build_objects(classes[self.__name(cls)], records):
+            self.new(obj)
+            count += 1
+            if save_every and count % save_every == 0:
+                self.save()
+        self.save()
+        return count
+
+    def begin(self):
+        """Starts a transaction, deferring saves until it is committed
+
+        The changes made before the transaction are saved first. Transactions
+        can be nested, only the outermost one saves: the changes made before
+        a nested one are kept, to go back to them if it fails (see
+        `transaction`).
+
+        """
+        if self.__depth == 0:
+            self.save()
+        else:
+            self.__savepoints.append(
+                {
+                    key: obj.to_dict() if obj is not None else None
+                    for key, obj in self.__dirty.items()
+                }
+            )
+        self.__depth += 1
+
+    def commit(self):
+        """Ends a transaction, saving the changes if it is the outermost
+
+        Raises:
+            RuntimeError: if no transaction is in progress
+
+        """
+        if self.__depth == 0:
+            raise RuntimeError("no transaction in progress")
+        self.__depth -= 1
+        if self.__depth == 0:
+            self.save()
+        else:
+            self.__savepoints.pop()
+
+    def rollback(self):
+        """Ends all transactions, dropping the changes made since `begin`
+
+        The changed objects are dropped and read from the database again
+        when asked for.
+
+        Raises:
+            RuntimeError: if no transaction is in progress
+
+        """
+        if self.__depth == 0:
+            raise RuntimeError("no transaction in progress")
+        self.__depth = 0
+        self.__savepoints = []
+        self.__drop_changes()
+
+    def in_transaction(self):
+        """Returns True if a transaction is in progress"""
+        return self.__depth > 0
+
+    @contextmanager
+    def transaction(self):
+        """Context manager of a transaction, rolled back on exceptions
+
+        A nested transaction only drops its own changes, and the transaction
+        it is in goes on.
+
+        """
+        self.begin()
+        try:
+            yield self
+        except BaseException:
+            if self.__depth > 1:
+                self.__drop_changes()
+                for key, o_dict in self.__savepoints.pop().items():
+                    if o_dict is None:
+                        self.__objects.pop(key, None)
+                        self.__dirty[key] = None
+                    else:
+                        self.new(classes[o_dict["__class__"]](**o_dict))
+                self.__depth -= 1
+            elif self.__depth:
+                self.rollback()
+            raise
+        if self.__depth:
+            self.commit()
+
+    def save(self):
+        """Writes the changed objects to the database in one transaction
+
+        Inside a transaction nothing is written until it is committed.
+
+        """
+        if self.__depth or not self.__dirty:
+            return
+        with self.__connection:
+            for key, obj in self.__dirty.items():
+                cls_name, _, obj_id = key.partition(".")
+                if obj is None:
+                    self.__connection.execute(
+                        f'DELETE FROM "{cls_name}" WHERE id = ?', (obj_id,)
+                    )
+                else:
+                    self.__connection.execute(
+                        f'INSERT OR REPLACE INTO "{cls_name}" (id, data)'
+                        " VALUES (?, ?)",
+                        (obj_id, json.dumps(obj.to_dict())),
+                    )
+        self.__dirty = {}
+
+    def flush(self):
+        """Waits for the saves requested so far to be written
+
+        Saves are always written before returning, so there is nothing to
+        wait for, this is for the same interface as FileStorage.
+
+        """
+
+    def reload(self):
+        """Opens the database, creating the missing tables
+
+        Objects that are not saved are dropped, the others are read from
+        the database again when asked for.
+
+        """
+        if self.__connection is None:
+            self.__connection = sqlite3.connect(self.__db_path)
+        with self.__connection:
+            for cls_name in classes:
+                self.__connection.execute(
+                    f'CREATE TABLE IF NOT EXISTS "{cls_name}"'
+                    " (id TEXT PRIMARY KEY, data TEXT NOT NULL)"
+                )
+            for cls_name, name in (
+                reference
+                for class_relations in relations.values()
+                for reference in class_relations.values()
+            ):
+                if type(getattr(classes[cls_name], name)) is not list:
+                    self.__connection.execute(
+                        f'CREATE INDEX IF NOT EXISTS "{cls_name}.{name}"'
+                        f' ON "{cls_name}" (json_extract(data, \'$.{name}\'))'
+                    )
+        self.__objects = {}
+        self.__dirty = {}
+
+    def close(self):
+        """Closes the connection to the database"""
+        if self.__connection is not None:
+            self.__connection.close()
+            self.__connection = None
+
+    def __drop_changes(self):
+        """Drops the changed objects, read from the database again"""
+        for key in self.__dirty:
+            self.__objects.pop(key, None)
+        self.__dirty = {}
+
+    def __execute(self, sql, parameters=()):
+        """Executes `sql` and returns the cursor"""
+        return self.__connection.execute(sql, parameters)
+
+    def __cache(self, key, data):
+        """Returns the object of `key`, built from `data` if not read yet"""
+        obj = self.__objects.get(key)
+        if obj is None:
+            o_dict = json.loads(data)
+            obj = classes[o_dict["__class__"]](**o_dict)
+            self.__objects[key] = obj
+        return obj
+
+    @staticmethod
+    def __name(cls):
+        """Returns the class name of `cls` (type or name)"""
+        return cls if type(cls) is str else cls.__name__
@@ -4,51 +4,1308 @@
 This module contains the FileStorage class definition, which is used to
 serialize instances to a JSON file and deserialize JSON file to instances
 
+Other file formats can be used (see `models.engine.serializers`), they are
+chosen from the extension of the file path or the `format` option when
+saving, and detected from the content of the file when reloading.
+
+Instances mark themselves as changed whenever one of their attributes is set,
+so the storage knows which objects changed since the last save. In log mode
+only those changes are appended as compact records to a log file
+(`<file path>.log`) instead of rewriting the whole JSON file, and the log is
+folded back into the JSON file once it grows past a given number of records.
+
+In stream mode the JSON file is read incrementally on reload, so that memory
+use stays close to the size of the objects themselves. In lazy mode the
+objects are kept as the dictionaries read from the file, and only built when
+they are accessed through the dictionary of objects. With lazy dates the
+objects keep the ISO strings of their dates until the dates are read.
+
+Inside a transaction (see `FileStorage.transaction`) saving is deferred until
+the transaction is committed, so that several changes are written at once.
+
+The JSON file is written to a temporary file first, which then replaces it at
+once, so that a crash while saving leaves the previous version of the file
+and readers never see a file half written. In shared mode several processes
+can save to the same file: saves hold a lock on `<file path>.lock`, and merge
+the changes saved by the other processes before writing.
+
+In thread-safe mode the objects are changed and read holding a lock, so that
+threads can use the storage at the same time. Saves copy the objects holding
+the lock, then write the copy without it.
+
+With a data directory the objects are kept in a directory per class instead,
+split in segment files by a hash of their id (see `models.engine.shards`),
+which a pool of processes can read and write in parallel. Saves only write
+the segments holding changes, and the objects of a class are only read the
+first time the class is needed.
+
+A snapshot file (see `models.engine.snapshot`) is mapped in memory by reload
+instead of being read: getting an object decodes it alone, and the objects
+of a class are read the first time the whole class is needed.
+
+In background mode saves return at once, and a thread writes the file in
+their place, once for every group of saves requested within an interval (see
+`models.engine.writer`). `FileStorage.flush` waits for the writes.
+
 """
 import json
+import os
+import threading
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import ItemsView, ValuesView
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from itertools import islice
 
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
+from models.compact import compact_class
+from models.engine.bulk import build_objects, default_fields, write_records
+from models.engine.columns import ColumnStore
+from models.engine.indexes import (
+    ReferenceIndex,
+    index_types,
+    matches,
+    operators,
+)
+from models.engine.relations import delete_referrers
+from models.engine.serializers import detect, for_path, serializers
+from models.engine.shards import (
+    dump_shard,
+    list_shards,
+    load_shard,
+    read_layout,
+    run,
+    segment_of,
+    shard_path,
+    write_file,
+    write_layout,
+)
+from models.engine.snapshot import Snapshot
+from models.engine.writer import BackgroundWriter
+from models.ids import generators
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - no file locks on Windows
+    fcntl = None
+
+classes = {
+    "Amenity": Amenity,
+    "BaseModel": BaseModel,
+    "City": City,
+    "Place": Place,
+    "Review": Review,
+    "State": State,
+    "User": User,
+}
+
+
+class LazyObjects(dict):
+    """Dictionary of objects used in lazy mode
+
+    The values are the dictionaries read from the JSON file until they are
+    accessed for the first time, when they are replaced by the objects built
+    from them.
+
+    """
+
+    def __getitem__(self, key):
+        """Returns the object of `key`, building it if needed"""
+        value = dict.__getitem__(self, key)
+        if type(value) is dict:
+            value = classes[value["__class__"]](**value)
+            dict.__setitem__(self, key, value)
+        return value
+
+    def get(self, key, default=None):
+        """Returns the object of `key` if it exists, else `default`"""
+        return self[key] if key in self else default
+
+    def pop(self, key, *default):
+        """Removes `key` and returns its object"""
+        if key not in self:
+            return dict.pop(self, key, *default)
+        value = self[key]
+        dict.__delitem__(self, key)
+        return value
+
+    def values(self):
+        """Returns a view on the objects, built as they are iterated"""
+        return ValuesView(self)
+
+    def items(self):
+        """Returns a view on the (key, object) pairs"""
+        return ItemsView(self)
+
 
 class FileStorage:
     """This class saves and manages the data using a JSON file"""
 
     __file_path = "hbnb.json"
     __objects = {}
+    __index = {}  # keys of the objects of every class, by class name
+    __dirty = {}  # changed objects since the last save, None when deleted
+    __columns = {}  # column stores of the classes they were asked for
+    __sorted = {}  # sorted ids of the classes that were paged through
+    __index_kinds = {}  # kinds of the declared indexes, by class and name
+    __indexes = {}  # built indexes of the classes they were used for
+    __references = {}  # built reference indexes, by class and name
+    __depth = 0  # number of nested transactions in progress
+    __savepoints = []  # changes made before every nested transaction
+    __base = {}  # updated_at of the objects as last read, in shared mode
+    __log = False
+    __log_limit = 1000
+    __log_size = 0  # number of records in the log file
+    __stream = False
+    __lazy = False
+    __lazy_dates = False
+    __ids = "uuid4"
+    __format = None
+    __compact = False
+    __shared = False
+    __threadsafe = False
+    __background = False
+    __flush_interval = 0.1
+    __max_pending = 1000
+    __fsync = False
+    __directory = None
+    __segments = 1
+    __workers = 1
+    __unloaded = {}  # segment files of the classes not read yet, by class
+    __snapshot = None  # snapshot file the classes not read yet are in
+    __layout = None  # (data directory, layout) as last read or written
+    __segment_keys = {}  # keys of the written classes, by class and segment
+    __writer = None  # thread writing the file, in background mode
+    __lock = nullcontext()  # lock of the objects, in thread-safe mode
+    __saving = nullcontext()  # lock of the file, in thread-safe mode
+    __model_classes = dict(classes)
+    __options = (
+        "file_path",
+        "log",
+        "log_limit",
+        "stream",
+        "lazy",
+        "lazy_dates",
+        "ids",
+        "format",
+        "compact",
+        "shared",
+        "threadsafe",
+        "background",
+        "flush_interval",
+        "max_pending",
+        "fsync",
+        "directory",
+        "segments",
+        "workers",
+    )
+
+    @staticmethod
+    def configure(**options):
+        """Sets the storage options
+
+        Args:
+            **options (dict): the options to set, which are
+                file_path (str): path of the JSON file
+                log (bool): append changes to a log file on save
+                log_limit (int): number of log records that triggers a
+                    compaction of the log into the JSON file
+                stream (bool): read the JSON file incrementally on reload
+                lazy (bool): build the objects read by reload only when
+                    they are accessed
+                lazy_dates (bool): keep the dates of the objects read as
+                    ISO strings until they are read, instead of parsing
+                    them on reload and formatting them on save (the
+                    compact classes always parse them)
+                ids (str): generator of the ids of new objects, one of
+                    uuid4 (the default), pool, uuid7 or short (see
+                    `models.ids`)
+                format (str): format of the file, one of json, compact,
+                    ndjson, marshal or snapshot, chosen from the extension
+                    of the file path when None
+                compact (bool): build objects from the compact version of
+                    the classes (see `models.compact`), which use less
+                    memory
+                shared (bool): merge the changes saved by other processes
+                    to the same file on save, instead of overwriting them
+                threadsafe (bool): lock the objects, so that threads can use
+                    the storage at the same time, `all()` then returning a
+                    copy of the dictionary of objects
+                background (bool): return from saves at once, and write the
+                    file from a thread, a group of saves at a time
+                flush_interval (float): in background mode, seconds to wait
+                    for more saves after a first one, before writing
+                max_pending (int): in background mode, number of changed
+                    objects that gets them written without waiting
+                fsync (bool): flush the written files to disk before
+                    returning, so that the changes survive a power failure
+                directory (str): path of a data directory to keep the
+                    objects in, a directory per class, instead of the file
+                segments (int): number of segment files the objects of a
+                    class are split into in the data directory
+                workers (int): number of processes reading and writing the
+                    segment files in parallel
+
+        """
+        for name in options:
+            if name not in FileStorage.__options:
+                raise TypeError(f"unknown storage option '{name}'")
+        if options.get("ids", "uuid4") not in generators:
+            raise ValueError(f"unknown id generator '{options['ids']}'")
+        writer = FileStorage.__writer
+        restart = bool(
+            {"background", "flush_interval", "max_pending"} & set(options)
+        )
+        if writer is not None:
+            # the saves requested so far are written with the old options
+            if restart:
+                writer.stop()
+            else:
+                writer.flush()
+        was_shared = FileStorage.__shared
+        for name, value in options.items():
+            setattr(FileStorage, f"_FileStorage__{name}", value)
+        if "ids" in options:
+            BaseModel._new_id = staticmethod(generators[options["ids"]])
+        if "lazy_dates" in options:
+            BaseModel._lazy_dates = bool(options["lazy_dates"])
+        if "compact" in options:
+            for cls_name, cls in FileStorage.__model_classes.items():
+                if options["compact"]:
+                    cls = compact_class(cls)
+                classes[cls_name] = cls
+        if FileStorage.__shared and not was_shared:
+            # as if the objects were read in shared mode
+            FileStorage.__base = FileStorage().__dates()
+        if "threadsafe" in options or "background" in options:
+            safe = FileStorage.__threadsafe or FileStorage.__background
+            FileStorage.__lock = threading.RLock() if safe else nullcontext()
+            FileStorage.__saving = threading.Lock() if safe else nullcontext()
+        if restart and writer is not None:
+            FileStorage.__writer = None
+        if restart and FileStorage.__background:
+            FileStorage.__writer = BackgroundWriter(
+                FileStorage().__write_changes,
+                FileStorage.__flush_interval,
+                FileStorage.__max_pending,
+            )
+
+    def all(self, cls=None):
+        """Returns the dictionary of objects
+
+        Args:
+            cls (type|str): if given, only the objects of this class are
+                returned, in a new dictionary
+
+        """
+        if cls is None and FileStorage.__unloaded:
+            self.__read()
+        objects = FileStorage.__objects
+        if cls is None and not FileStorage.__threadsafe:
+            return objects
+        with FileStorage.__lock:
+            if cls is None:
+                return dict(objects.items())
+            return {key: objects[key] for key in self.__keys(cls)}
+
+    def get(self, cls, id):
+        """Returns the object of class `cls` with `id`, None if not found"""
+        cls_name = cls if type(cls) is str else cls.__name__
+        key = f"{cls_name}.{id}"
+        with FileStorage.__lock:
+            if cls_name not in FileStorage.__unloaded:
+                return FileStorage.__objects.get(key)
+            if FileStorage.__snapshot is None:
+                self.__read(cls_name)
+                return FileStorage.__objects.get(key)
+            obj = FileStorage.__objects.get(key)
+            if obj is None:
+                # decoded alone, the class is read when it is needed
+                o_dict = FileStorage.__snapshot.get(key)
+                if o_dict is not None:
+                    obj = self.__build(cls_name, o_dict)
+                    FileStorage.__objects[key] = obj
+            return obj
+
+    def count(self, cls=None):
+        """Returns the number of objects, or of objects of class `cls`"""
+        if cls is None:
+            if FileStorage.__unloaded:
+                self.__read()
+            return len(FileStorage.__objects)
+        cls_name = cls if type(cls) is str else cls.__name__
+        snapshot = FileStorage.__snapshot
+        if snapshot is not None and cls_name in FileStorage.__unloaded:
+            return snapshot.count(cls_name)
+        return len(self.__keys(cls_name))
+
+    def is_loaded(self, cls=None):
+        """Returns True if the objects of `cls`, or of every class, are read
+
+        The objects of a class are read when it is first needed, with a data
+        directory or a snapshot file.
+
+        """
+        if cls is None:
+            return not FileStorage.__unloaded
+        cls_name = cls if type(cls) is str else cls.__name__
+        return cls_name not in FileStorage.__unloaded
+
+    def columns(self, cls):
+        """Returns the column store of class `cls` (type or name)
+
+        The column store is built the first time it is asked for, then kept
+        up to date as objects of the class are added, changed or deleted.
+
+        Raises:
+            KeyError: if `cls` isn't a model class
+
+        """
+        cls_name = cls if type(cls) is str else cls.__name__
+        with FileStorage.__lock:
+            store = FileStorage.__columns.get(cls_name)
+            if store is None:
+                store = ColumnStore(classes[cls_name])
+                objects = FileStorage.__objects
+                for key in self.__keys(cls_name):
+                    # objects not built yet in lazy mode are read as dicts
+                    store.add(key, dict.__getitem__(objects, key))
+                FileStorage.__columns[cls_name] = store
+            return store
+
+    def page(self, cls, limit=None, after=None):
+        """Returns a page of the objects of class `cls`, in order of id
+
+        The ids of the class are sorted the first time it is paged through,
+        then kept sorted as objects are added or deleted, so that every page
+        costs the size of the page rather than the number of objects.
+
+        Args:
+            cls (type|str): the class of the objects
+            limit (int): maximum number of objects, all of them if None
+            after (str): if given, only the objects with a greater id, this
+                is the id of the last object of the previous page
+
+        Returns:
+            dict: the objects of the page by key, in order of id
+
+        """
+        cls_name = cls if type(cls) is str else cls.__name__
+        with FileStorage.__lock:
+            ids = FileStorage.__sorted.get(cls_name)
+            if ids is None:
+                start = len(cls_name) + 1
+                ids = sorted(key[start:] for key in self.__keys(cls_name))
+                FileStorage.__sorted[cls_name] = ids
+            first = 0 if after is None else bisect_right(ids, after)
+            last = len(ids) if limit is None else first + limit
+            objects = FileStorage.__objects
+            return {
+                f"{cls_name}.{obj_id}": objects[f"{cls_name}.{obj_id}"]
+                for obj_id in ids[first:last]
+            }
 
-    def all(self):
-        """Returns the dictionary of objects"""
-        return FileStorage.__objects
+    def create_index(self, cls, name, kind="hash"):
+        """Declares an index on the attribute `name` of the class `cls`
+
+        The index is built the first time a query of the class is run, then
+        kept up to date as objects of the class are added, changed or
+        deleted. Indexes are kept in memory only, and declared once for the
+        life of the program.
+
+        Args:
+            cls (type|str): the class of the objects
+            name (str): name of the attribute
+            kind (str): hash, which answers equality predicates, or sorted,
+                which also answers range predicates
+
+        Raises:
+            ValueError: if the kind of index isn't supported
+
+        """
+        if kind not in index_types:
+            raise ValueError(f"unknown index kind '{kind}'")
+        cls_name = cls if type(cls) is str else cls.__name__
+        with FileStorage.__lock:
+            FileStorage.__index_kinds.setdefault(cls_name, {})[name] = kind
+            FileStorage.__indexes.pop(cls_name, None)  # built again if needed
+            FileStorage.__references.pop(cls_name, None)
+
+    def drop_index(self, cls, name):
+        """Removes the index on the attribute `name` of the class `cls`"""
+        cls_name = cls if type(cls) is str else cls.__name__
+        with FileStorage.__lock:
+            FileStorage.__index_kinds.get(cls_name, {}).pop(name, None)
+            FileStorage.__indexes.pop(cls_name, None)
+
+    def query(self, cls, *predicates):
+        """Returns the objects of class `cls` matching all the predicates
+
+        A predicate that an index of the class can answer gives the objects
+        to check the other predicates on, else all the objects of the class
+        are checked (see `models.engine.indexes`).
+
+        Args:
+            cls (type|str): the class of the objects
+            *predicates (tuple): (attribute name, operator, value) where the
+                operator is one of ==, !=, <, <=, > or >=
+
+        Returns:
+            dict: the matching objects by key
+
+        Raises:
+            ValueError: if an operator isn't supported
+
+        """
+        cls_name = cls if type(cls) is str else cls.__name__
+        for predicate in predicates:
+            if predicate[1] not in operators:
+                raise ValueError(f"unknown operator '{predicate[1]}'")
+        with FileStorage.__lock:
+            indexes = self.__class_indexes(cls_name)
+            keys = None
+            rest = []
+            for predicate in predicates:
+                index = indexes.get(predicate[0])
+                if keys is None and index is not None:
+                    keys = index.lookup(predicate[1], predicate[2])
+                    if keys is not None:
+                        continue
+                rest.append(predicate)
+            if keys is None:
+                keys = self.__keys(cls_name)
+            objects = FileStorage.__objects
+            result = {}
+            for key in keys:
+                obj = objects[key]
+                if all(matches(obj, predicate) for predicate in rest):
+                    result[key] = obj
+            return result
+
+    def referrers(self, cls, name, id):
+        """Returns the objects of class `cls` referring to the id `id`
+
+        The objects referring to an id are found with a reference index of
+        the attribute (see `models.engine.indexes`), built the first time it
+        is used, then kept up to date as objects are added, changed or
+        deleted.
+
+        Args:
+            cls (type|str): the class of the referring objects
+            name (str): the attribute holding an id or a list of ids
+            id (str): the referred id
+
+        Returns:
+            dict: the referring objects by key
+
+        """
+        cls_name = cls if type(cls) is str else cls.__name__
+        with FileStorage.__lock:
+            references = FileStorage.__references.setdefault(cls_name, {})
+            index = references.get(name)
+            objects = FileStorage.__objects
+            if index is None:
+                index = ReferenceIndex(name)
+                for key in self.__keys(cls_name):
+                    index.add(key, objects[key])
+                references[name] = index
+            return {key: objects[key] for key in index.referrers(id)}
 
     def new(self, obj):
         """Add `obj` to the dictionary of objects with key <class name>.id"""
-        key = f"{type(obj).__name__}.{obj.id}"
-        FileStorage.__objects[key] = obj
+        cls_name = type(obj).__name__
+        key = f"{cls_name}.{obj.id}"
+        with FileStorage.__lock:
+            if cls_name in FileStorage.__unloaded:
+                self.__read(cls_name)
+            keys = FileStorage.__index.setdefault(cls_name, {})
+            if cls_name in FileStorage.__sorted and key not in keys:
+                insort(FileStorage.__sorted[cls_name], obj.id)
+            FileStorage.__objects[key] = obj
+            keys[key] = None
+            FileStorage.__dirty[key] = obj
+            if cls_name in FileStorage.__columns:
+                FileStorage.__columns[cls_name].add(key, obj)
+            for index in self.__built_indexes(cls_name):
+                index.add(key, obj)
+
+    def mark_dirty(self, obj):
+        """Marks `obj` as changed if it is in the dictionary of objects"""
+        cls_name = type(obj).__name__
+        key = f"{cls_name}.{getattr(obj, 'id', None)}"
+        with FileStorage.__lock:
+            if dict.get(FileStorage.__objects, key) is obj:
+                FileStorage.__dirty[key] = obj
+                if cls_name in FileStorage.__columns:
+                    FileStorage.__columns[cls_name].update(key, obj)
+                for index in self.__built_indexes(cls_name):
+                    index.add(key, obj)
+
+    def delete(self, obj=None, cascade=False):
+        """Removes `obj` from the dictionary of objects
+
+        Args:
+            obj (BaseModel): the object to remove
+            cascade (bool): also remove the objects referring to `obj` (see
+                `models.engine.relations`), and its id from lists of ids
+
+        """
+        if obj is None:
+            return
+        cls_name = type(obj).__name__
+        key = f"{cls_name}.{obj.id}"
+        with FileStorage.__lock:
+            if cls_name in FileStorage.__unloaded:
+                self.__read(cls_name)
+            if FileStorage.__objects.pop(key, None) is not None:
+                del FileStorage.__index[cls_name][key]
+                FileStorage.__dirty[key] = None
+                if cls_name in FileStorage.__columns:
+                    FileStorage.__columns[cls_name].remove(key)
+                ids = FileStorage.__sorted.get(cls_name)
+                if ids is not None:
+                    del ids[bisect_left(ids, obj.id)]
+                for index in self.__built_indexes(cls_name):
+                    index.remove(key)
+                if cascade:
+                    delete_referrers(self, obj)
+
+    def iter_dicts(self, cls=None):
+        """Yields the dictionary representations of the objects one by one
+
+        In lazy mode the objects not built yet are not built, the dictionaries
+        they were read from are yielded instead and must not be changed.
+
+        Args:
+            cls (type|str): if given, only the objects of this class
+
+        """
+        if cls is None and FileStorage.__unloaded:
+            self.__read()
+        objects = FileStorage.__objects
+        keys = objects if cls is None else self.__keys(cls)
+        if FileStorage.__threadsafe:
+            with FileStorage.__lock:
+                keys = list(keys)
+        for key in keys:
+            obj = dict.get(objects, key)
+            if obj is None:
+                continue  # deleted by another thread
+            yield obj if type(obj) is dict else obj.to_dict()
+
+    def export(self, file, cls=None, fields=None, format="ndjson"):
+        """Writes the objects to `file` one by one, as NDJSON or CSV
+
+        Args:
+            file (TextIO): the file to write to
+            cls (type|str): if given, only the objects of this class
+            fields (list): if given, only these attributes are written, CSV
+                exports default to the declared attributes of the class
+            format (str): ndjson or csv
+
+        Returns:
+            int: the number of objects written
+
+        Raises:
+            ValueError: if the format isn't supported
+            KeyError: if `cls` isn't a model class
+
+        """
+        cls_name = cls if cls is None or type(cls) is str else cls.__name__
+        if format == "csv" and fields is None:
+            fields = default_fields(cls_name and classes[cls_name])
+        return write_records(self.iter_dicts(cls_name), file, format, fields)
+
+    def snapshot(self, file_path):
+        """Writes all objects to a snapshot file
+
+        The snapshot can then be used as the file of read-mostly sessions,
+        which map it in memory on reload instead of reading it (see
+        `models.engine.snapshot`).
+
+        Args:
+            file_path (str): path of the snapshot file
+
+        Returns:
+            int: the number of objects written
+
+        """
+        with FileStorage.__lock:
+            if FileStorage.__unloaded:
+                self.__read()
+            items = list(self.__items())
+        write_file(
+            file_path, serializers["snapshot"], items, FileStorage.__fsync
+        )
+        return len(items)
+
+    def bulk_import(self, cls, records, save_every=None):
+        """Adds the objects of class `cls` built from `records` and saves
+
+        Args:
+            cls (type|str): the model class, or its name
+            records (iterable): the dictionaries of attributes of the objects,
+                see `models.engine.bulk.build_objects`
+            save_every (int): if given, also save after every `save_every`
+                objects, else only once at the end
+
+        Returns:
+            int: the number of objects added
+
+        Raises:
+            KeyError: if `cls` isn't a model class
+
+        """
+        cls_name = cls if type(cls) is str else cls.__name__
+        objs = build_objects(classes[cls_name], records)
+        count = 0
+        while True:
+            with FileStorage.__lock:
+                added = self.__add_objects(cls_name, islice(objs, save_every))
+            count += added
+            if not save_every or added < save_every:
+                break
+            self.save()
+        self.save()
+        return count
+
+    def begin(self):
+        """Starts a transaction, deferring saves until it is committed
+
+        The changes made before the transaction are saved first, so that a
+        rollback goes back to the state at the start of the transaction.
+        Transactions can be nested, only the outermost one saves: the changes
+        made before a nested one are kept, to go back to them if it fails
+        (see `transaction`).
+
+        """
+        path = FileStorage.__directory or FileStorage.__file_path
+        if FileStorage.__depth == 0 and (
+            FileStorage.__dirty or not os.path.exists(path)
+        ):
+            self.save()
+        if FileStorage.__depth == 0:
+            self.flush()
+        else:
+            FileStorage.__savepoints.append(self.__changes())
+        FileStorage.__depth += 1
+
+    def commit(self):
+        """Ends a transaction, saving the changes if it is the outermost
+
+        Raises:
+            RuntimeError: if no transaction is in progress
+
+        """
+        if FileStorage.__depth == 0:
+            raise RuntimeError("no transaction in progress")
+        FileStorage.__depth -= 1
+        if FileStorage.__depth == 0:
+            self.save()
+        else:
+            FileStorage.__savepoints.pop()
+
+    def rollback(self):
+        """Ends all transactions, dropping the changes made since `begin`
+
+        The objects are reloaded from the file, so objects held from before
+        the rollback are no longer the ones in storage.
+
+        Raises:
+            RuntimeError: if no transaction is in progress
+
+        """
+        if FileStorage.__depth == 0:
+            raise RuntimeError("no transaction in progress")
+        FileStorage.__depth = 0
+        FileStorage.__savepoints = []
+        self.reload()
+
+    def in_transaction(self):
+        """Returns True if a transaction is in progress"""
+        return FileStorage.__depth > 0
+
+    @contextmanager
+    def transaction(self):
+        """Context manager of a transaction, rolled back on exceptions
+
+        A nested transaction only drops its own changes, and the transaction
+        it is in goes on.
+
+        """
+        self.begin()
+        try:
+            yield self
+        except BaseException:
+            if FileStorage.__depth > 1:
+                self.__restore(FileStorage.__savepoints.pop())
+                FileStorage.__depth -= 1
+            elif FileStorage.__depth:
+                self.rollback()
+            raise
+        if FileStorage.__depth:
+            self.commit()
 
     def save(self):
-        """Serializes the dictionary of objects to a JSON file"""
-        obj_dict = {
-            key: obj.to_dict() for key, obj in FileStorage.__objects.items()
-        }
-        with open(FileStorage.__file_path, "w") as file:
-            json.dump(obj_dict, file, indent=4)
-            file.write("\n")
+        """Serializes the dictionary of objects to a JSON file
+
+        In log mode only the changes since the last save are appended to the
+        log file, until the log reaches its limit and gets compacted. Inside a
+        transaction nothing is written until it is committed. In shared mode
+        the whole file is written, merged with the changes of the other
+        processes (see `FileStorage.compact`). In background mode the write
+        is only requested, and done later by the writer thread.
+
+        """
+        if FileStorage.__depth:
+            return
+        if FileStorage.__writer is not None:
+            FileStorage.__writer.request(len(FileStorage.__dirty))
+        else:
+            self.__write_changes()
+
+    def flush(self):
+        """Waits for the saves requested so far to be written
 
-    def reload(self):
-        """Deserializes the JSON file to a dictionary of objects"""
+        Saves are written before returning unless in background mode.
+
+        Raises:
+            Exception: the exception raised by the last background write,
+                if it failed
+
+        """
+        if FileStorage.__writer is not None:
+            FileStorage.__writer.flush()
+
+    def compact(self):
+        """Writes all objects to the JSON file and removes the log file
+
+        In shared mode the file is locked and read again first, as other
+        processes may have saved changes to it since it was read: the objects
+        not changed here are written as they are in the file, and the changes
+        of the other processes are applied to the objects here. An object
+        changed both here and by another process keeps the version with the
+        latest `updated_at`, and a deletion here wins.
+
+        """
+        with FileStorage.__saving:
+            if FileStorage.__directory is None and FileStorage.__unloaded:
+                self.__read()
+            if FileStorage.__directory is not None:
+                self.__write_shards()
+            elif FileStorage.__shared:
+                with self.__locked(), FileStorage.__lock:
+                    self.__write(self.__merge())
+                    FileStorage.__dirty = {}
+            elif FileStorage.__threadsafe or FileStorage.__background:
+                with FileStorage.__lock:
+                    items = list(self.__items())  # written without the lock
+                    FileStorage.__dirty = {}
+                self.__write(items)
+            else:
+                self.__write(self.__items())
+                FileStorage.__dirty = {}
+            if FileStorage.__log_size or FileStorage.__log:
+                self.__remove_log()
+
+    def reload(self, progress=None):
+        """Deserializes the JSON file to a dictionary of objects
+
+        In stream mode the objects are read from the file and built one by
+        one, instead of parsing the whole file first. With a data directory
+        only the segment files are listed, and a snapshot file is only
+        mapped: the objects of a class are read when the class is first
+        needed. The saves still to be written in background mode are
+        written first.
+
+        Args:
+            progress (callable): in stream mode, called while reading the
+                file with the number of bytes read and the size of the file
+
+        """
+        self.flush()
+        directory = FileStorage.__directory
+        log_records = None if directory else self.__read_log()
+        objects = LazyObjects() if FileStorage.__lazy else {}
+        index = {}
+        unloaded = {}
+        layout = None
+        snapshot = None
+        base = {} if FileStorage.__shared and not directory else None
+        build = self.__keep if FileStorage.__lazy else self.__build
         try:
-            with open(FileStorage.__file_path, "r") as file:
-                json_obj_dict = json.load(file)
+            if directory:
+                if not os.path.isdir(directory):
+                    raise FileNotFoundError(directory)
+                unloaded = list_shards(directory, classes)
+                layout = read_layout(directory)
+            elif (
+                not log_records
+                and base is None
+                and detect(FileStorage.__file_path, FileStorage.__format)
+                is serializers["snapshot"]
+            ):
+                snapshot = Snapshot(FileStorage.__file_path)
+                unloaded = dict.fromkeys(snapshot.classes)
+            else:
+                serializer = detect(
+                    FileStorage.__file_path, FileStorage.__format
+                )
+                with open(
+                    FileStorage.__file_path,
+                    "rb" if serializer.binary else "r",
+                ) as file:
+                    items = serializer.load(
+                        file, FileStorage.__stream, progress
+                    )
+                    for key, o_dict in items:
+                        cls_name = o_dict["__class__"]
+                        objects[key] = build(cls_name, o_dict)
+                        index.setdefault(cls_name, {})[key] = None
+                        if base is not None:
+                            base[key] = o_dict.get("updated_at")
         except FileNotFoundError:
-            pass
+            if log_records is None:
+                return
+
+        FileStorage.__log_size = 0
+        for key, o_dict in log_records or ():
+            cls_name = key.partition(".")[0]
+            if o_dict is None:
+                if objects.pop(key, None) is not None:
+                    del index[cls_name][key]
+            else:
+                objects[key] = build(cls_name, o_dict)
+                index.setdefault(cls_name, {})[key] = None
+            FileStorage.__log_size += 1
+
+        with FileStorage.__lock:
+            FileStorage.__objects = objects
+            FileStorage.__index = index
+            FileStorage.__base = base or {}
+            FileStorage.__dirty = {}
+            FileStorage.__columns = {}
+            FileStorage.__sorted = {}
+            FileStorage.__indexes = {}
+            FileStorage.__references = {}
+            FileStorage.__unloaded = unloaded
+            FileStorage.__layout = layout and (directory, layout)
+            FileStorage.__segment_keys = {}
+            if FileStorage.__snapshot is not None:
+                FileStorage.__snapshot.close()
+            FileStorage.__snapshot = snapshot
+
+    def __add_objects(self, cls_name, objs):
+        """Adds the objects of `objs`, of class `cls_name`, in bulk
+
+        Returns:
+            int: the number of objects added
+
+        """
+        if cls_name in FileStorage.__unloaded:
+            self.__read(cls_name)
+        objects = FileStorage.__objects
+        keys = FileStorage.__index.setdefault(cls_name, {})
+        dirty = FileStorage.__dirty
+        store = FileStorage.__columns.get(cls_name)
+        FileStorage.__sorted.pop(cls_name, None)  # sorted again when needed
+        FileStorage.__indexes.pop(cls_name, None)  # built again when needed
+        FileStorage.__references.pop(cls_name, None)
+        count = 0
+        for obj in objs:
+            key = f"{cls_name}.{obj.id}"
+            objects[key] = dirty[key] = obj
+            keys[key] = None
+            if store is not None:
+                store.add(key, obj)
+            count += 1
+        return count
+
+    @staticmethod
+    def __build(cls_name, o_dict):
+        """Returns the object of class `cls_name` built from `o_dict`"""
+        return classes[cls_name](**o_dict)
+
+    @staticmethod
+    def __keep(cls_name, o_dict):
+        """Returns `o_dict` as is, to be built on access in lazy mode"""
+        return o_dict
+
+    def __built_indexes(self, cls_name):
+        """Returns the indexes of `cls_name` built so far, of any kind"""
+        indexes = FileStorage.__indexes.get(cls_name)
+        references = FileStorage.__references.get(cls_name)
+        if not indexes and not references:
+            return ()  # the usual case, checked on every change
+        return [*(indexes or {}).values(), *(references or {}).values()]
+
+    def __class_indexes(self, cls_name):
+        """Returns the indexes of `cls_name` by attribute, building them"""
+        indexes = FileStorage.__indexes.get(cls_name)
+        if indexes is None:
+            indexes = {}
+            objects = FileStorage.__objects
+            kinds = FileStorage.__index_kinds.get(cls_name, {})
+            for name, kind in kinds.items():
+                index = index_types[kind](name)
+                for key in self.__keys(cls_name):
+                    index.add(key, objects[key])
+                indexes[name] = index
+            FileStorage.__indexes[cls_name] = indexes
+        return indexes
+
+    def __keys(self, cls):
+        """Returns the keys of the objects of class `cls` (type or name)"""
+        cls_name = cls if type(cls) is str else cls.__name__
+        if cls_name in FileStorage.__unloaded:
+            self.__read(cls_name)
+        return FileStorage.__index.get(cls_name, {})
+
+    def __write_changes(self):
+        """Writes the changes, to the log file or the whole file"""
+        if (
+            FileStorage.__log
+            and not FileStorage.__shared
+            and FileStorage.__log_size < FileStorage.__log_limit
+        ):
+            self.__append_log()
         else:
-            FileStorage.__objects = {
-                key: eval("{}(**{})".format(o_dict["__class__"], o_dict))
-                for key, o_dict in json_obj_dict.items()
+            self.compact()
+
+    def __items(self):
+        """Yields the (key, dictionary) pairs of all objects"""
+        for key, obj in dict.items(FileStorage.__objects):
+            # objects not built yet in lazy mode are still dictionaries
+            yield key, obj if type(obj) is dict else obj.to_dict()
+
+    def __write(self, items):
+        """Writes the (key, dictionary) pairs of `items` to the file"""
+        file_path = FileStorage.__file_path
+        serializer = for_path(file_path, FileStorage.__format)
+        write_file(file_path, serializer, items, FileStorage.__fsync)
+
+    def __read(self, cls_name=None):
+        """Reads the objects of `cls_name`, or of every class not read
+
+        The objects are read from the snapshot file if one is mapped, else
+        from the segment files: the objects of the regular model classes are
+        then built by the workers, the others are built here, or kept as
+        dictionaries in lazy mode.
+
+        """
+        with FileStorage.__lock:
+            unloaded = FileStorage.__unloaded
+            names = list(unloaded) if cls_name is None else [cls_name]
+            names = [name for name in names if name in unloaded]
+            if FileStorage.__snapshot is not None:
+                self.__read_snapshot(names)
+                return
+            workers = FileStorage.__workers
+            here = workers <= 1 or FileStorage.__lazy or FileStorage.__compact
+            build = self.__keep if FileStorage.__lazy else self.__build
+            tasks = [
+                (path, None if here else classes[name])
+                for name in names
+                for path in unloaded[name]
+            ]
+            objects = FileStorage.__objects
+            index = FileStorage.__index
+            results = run(load_shard, tasks, workers)
+            for (path, _), items in zip(tasks, results):
+                name = os.path.basename(os.path.dirname(path))
+                keys = index.setdefault(name, {})
+                if here:
+                    for key, o_dict in items:
+                        objects[key] = build(name, o_dict)
+                        keys[key] = None
+                else:
+                    objects.update(items)
+                    keys.update(dict.fromkeys(key for key, _ in items))
+            for name in names:
+                del unloaded[name]
+
+    def __read_snapshot(self, names):
+        """Reads the objects of the classes `names` from the snapshot file
+
+        The objects already decoded alone are kept. The file is unmapped once
+        all classes are read.
+
+        """
+        snapshot = FileStorage.__snapshot
+        objects = FileStorage.__objects
+        build = self.__keep if FileStorage.__lazy else self.__build
+        for name in names:
+            keys = FileStorage.__index.setdefault(name, {})
+            for key, o_dict in snapshot.items(name):
+                if key not in objects:
+                    objects[key] = build(name, o_dict)
+                keys[key] = None
+            del FileStorage.__unloaded[name]
+        if not FileStorage.__unloaded:
+            snapshot.close()
+            FileStorage.__snapshot = None
+
+    def __write_shards(self):
+        """Writes the segment files of the data directory holding changes
+
+        Only the segments with objects added, changed or deleted since the
+        last save are written, unless the number of segments or the format
+        changed: then all of them are, and the segment files left from the
+        previous layout are removed.
+
+        The keys of every segment of a class are kept from its first write,
+        and updated from the changed keys, so that a save only goes through
+        the objects of the segments it writes.
+
+        """
+        directory = FileStorage.__directory
+        segments = FileStorage.__segments
+        file_format = FileStorage.__format
+        layout = {"segments": segments, "format": file_format}
+        full = FileStorage.__layout != (directory, layout)
+        tasks = []
+        emptied = []
+        with FileStorage.__lock:
+            if full and FileStorage.__unloaded:
+                self.__read()
+            changed = {}  # segments to write by class, None for all
+            if full:
+                FileStorage.__segment_keys = {}
+                changed = dict.fromkeys(FileStorage.__index)
+            index = FileStorage.__index
+            segment_keys = FileStorage.__segment_keys
+            for key in FileStorage.__dirty if not full else ():
+                cls_name, _, obj_id = key.partition(".")
+                segment = segment_of(obj_id, segments)
+                changed.setdefault(cls_name, set()).add(segment)
+                if cls_name in segment_keys:
+                    keys = segment_keys[cls_name].setdefault(segment, {})
+                    if key in index.get(cls_name, ()):
+                        keys[key] = None
+                    else:
+                        keys.pop(key, None)
+            objects = FileStorage.__objects
+            for cls_name, numbers in changed.items():
+                if cls_name not in segment_keys:
+                    shards = segment_keys[cls_name] = {}
+                    start = len(cls_name) + 1
+                    for key in index.get(cls_name, ()):
+                        segment = segment_of(key[start:], segments)
+                        shards.setdefault(segment, {})[key] = None
+                for n in numbers or range(segments):
+                    keys = segment_keys[cls_name].get(n, ())
+                    items = [
+                        (key, dict.__getitem__(objects, key)) for key in keys
+                    ]
+                    path = shard_path(directory, cls_name, n, file_format)
+                    if items:
+                        tasks.append(
+                            (path, items, file_format, FileStorage.__fsync)
+                        )
+                    else:
+                        emptied.append(path)
+            FileStorage.__dirty = {}
+        if FileStorage.__workers > 1 and FileStorage.__compact:
+            # instances of the compact classes can't be sent to the workers
+            for _, items, _, _ in tasks:
+                items[:] = [
+                    (key, obj if type(obj) is dict else obj.to_dict())
+                    for key, obj in items
+                ]
+        for _ in run(dump_shard, tasks, FileStorage.__workers):
+            pass
+        if full:
+            written = {task[0] for task in tasks}
+            emptied = [
+                path
+                for paths in list_shards(directory, classes).values()
+                for path in paths
+                if path not in written
+            ]
+            write_layout(directory, layout)
+            FileStorage.__layout = (directory, layout)
+        for path in emptied:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    @contextmanager
+    def __locked(self):
+        """Holds the lock of the file, shared with the other processes"""
+        with open(FileStorage.__file_path + ".lock", "a") as file:
+            if fcntl is not None:
+                fcntl.flock(file, fcntl.LOCK_EX)
+            yield  # released when the lock file is closed
+
+    def __merge(self):
+        """Returns the items to write in shared mode (see `compact`)"""
+        saved = {}
+        try:
+            serializer = detect(FileStorage.__file_path, FileStorage.__format)
+            with open(
+                FileStorage.__file_path, "rb" if serializer.binary else "r"
+            ) as file:
+                saved = dict(serializer.load(file))
+        except FileNotFoundError:
+            pass
+
+        base = FileStorage.__base
+        ours = set()
+        for key, obj in FileStorage.__dirty.items():
+            o_dict = saved.get(key)
+            if obj is None:
+                saved.pop(key, None)
+            elif (
+                o_dict is None
+                or o_dict.get("updated_at") == base.get(key)
+                or datetime.fromisoformat(o_dict["updated_at"])
+                <= obj.updated_at
+            ):
+                saved[key] = obj.to_dict()
+                ours.add(key)
+
+        objects = FileStorage.__objects
+        index = FileStorage.__index
+        build = self.__keep if FileStorage.__lazy else self.__build
+        changed = False
+        for key, o_dict in saved.items():
+            if key not in ours and (
+                key not in objects or o_dict.get("updated_at") != base.get(key)
+            ):
+                cls_name = o_dict["__class__"]
+                obj = dict.get(objects, key)
+                new = build(cls_name, o_dict)
+                if type(obj) is type(new) and type(obj) is not dict:
+                    # the instances held by the callers stay the stored ones
+                    self.__assign(obj, new)
+                else:
+                    dict.__setitem__(objects, key, new)
+                index.setdefault(cls_name, {})[key] = None
+                changed = True
+        for key in [key for key in objects if key not in saved]:
+            dict.__delitem__(objects, key)  # deleted by another process
+            del index[key.partition(".")[0]][key]
+            changed = True
+        if changed:
+            FileStorage.__columns = {}
+            FileStorage.__sorted = {}
+            FileStorage.__indexes = {}
+            FileStorage.__references = {}
+
+        FileStorage.__base = {
+            key: o_dict.get("updated_at") for key, o_dict in saved.items()
+        }
+        return saved.items()
+
+    @staticmethod
+    def __assign(obj, new):
+        """Gives `obj` the attributes of `new`, without marking it changed"""
+        for name in getattr(type(obj), "__slots__", ()):
+            try:
+                value = object.__getattribute__(new, name)
+            except AttributeError:  # not set in `new`
+                try:
+                    object.__delattr__(obj, name)
+                except AttributeError:
+                    pass
+            else:
+                object.__setattr__(obj, name, value)
+        obj.__dict__.clear()
+        obj.__dict__.update(new.__dict__)
+
+    def __dates(self):
+        """Returns the updated_at of the objects not changed since saved
+
+        They are the base of the merge of the changes of other processes
+        when the shared mode is turned on after the objects were read.
+
+        """
+        if FileStorage.__unloaded:
+            self.__read()
+        dates = {}
+        dirty = FileStorage.__dirty
+        for key, obj in dict.items(FileStorage.__objects):
+            if key in dirty:
+                continue
+            if type(obj) is dict:
+                dates[key] = obj.get("updated_at")
+            else:
+                updated_at = getattr(obj, "updated_at", None)
+                dates[key] = updated_at and updated_at.isoformat()
+        return dates
+
+    def __changes(self):
+        """Returns the dictionaries of the changed objects, None if deleted"""
+        with FileStorage.__lock:
+            return {
+                key: obj.to_dict() if obj is not None else None
+                for key, obj in FileStorage.__dirty.items()
             }
+
+    def __restore(self, changes):
+        """Goes back to the changes of a nested transaction (see `begin`)
+
+        The objects are reloaded as saved by the outermost transaction, and
+        the `changes` made before the nested one are made again.
+
+        """
+        self.reload()
+        for key, o_dict in changes.items():
+            cls_name, _, obj_id = key.partition(".")
+            if o_dict is None:
+                self.delete(self.get(cls_name, obj_id))
+            else:
+                self.new(self.__build(cls_name, o_dict))
+
+    def __log_path(self):
+        """Returns the path of the log file"""
+        return FileStorage.__file_path + ".log"
+
+    def __append_log(self):
+        """Appends a record for every changed object to the log file"""
+        with FileStorage.__saving:
+            with FileStorage.__lock:
+                records = [
+                    [key, obj.to_dict() if obj is not None else None]
+                    for key, obj in FileStorage.__dirty.items()
+                ]
+                FileStorage.__dirty = {}
+            with open(self.__log_path(), "a") as file:
+                for record in records:
+                    file.write(
+                        json.dumps(record, separators=(",", ":")) + "\n"
+                    )
+                if FileStorage.__fsync:
+                    file.flush()
+                    os.fsync(file.fileno())
+            FileStorage.__log_size += len(records)
+
+    def __read_log(self):
+        """Returns the list of records in the log file, None if no log"""
+        try:
+            with open(self.__log_path(), "r") as file:
+                lines = file.readlines()
+        except FileNotFoundError:
+            return None
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                break  # a record cut short by a crash, ignore the rest
+        return records
+
+    def __remove_log(self):
+        """Removes the log file"""
+        try:
+            os.remove(self.__log_path())
+        except FileNotFoundError:
+            pass
+        FileStorage.__log_size = 0
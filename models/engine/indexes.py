@@ -0,0 +1,240 @@
+#!/usr/bin/python3
+"""Indexes
+
+This module contains the indexes FileStorage can keep on an attribute of a
+class to answer queries (see `FileStorage.query`) without going through every
+object of the class, and the `matches` function used to check the objects
+otherwise.
+
+A hash index maps every value of the attribute to the keys of the objects
+with that value, and answers equality predicates. A sorted index keeps the
+values sorted, and also answers range predicates. Only numbers and strings
+are ordered: like in a scan, values that can't be compared with the value of
+a predicate never match it.
+
+A reference index maps the ids an attribute refers to (like `City.state_id`,
+or every id of `Place.amenity_ids`) to the keys of the objects referring to
+them, to find the children of an object without a scan.
+
+"""
+import math
+import operator
+from bisect import bisect_left, bisect_right, insort
+
+operators = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+_missing = object()  # value of an attribute an object doesn't have
+
+
+def matches(obj, predicate):
+    """Returns True if the attribute of `obj` satisfies `predicate`
+
+    Args:
+        obj (BaseModel): the object
+        predicate (tuple): (attribute name, operator, value)
+
+    """
+    name, op, value = predicate
+    attr = getattr(obj, name, _missing)
+    if attr is _missing:
+        return False
+    try:
+        return bool(operators[op](attr, value))
+    except TypeError:
+        return False  # values that can't be compared
+
+
+def references(obj, name):
+    """Returns the ids the attribute `name` of `obj` refers to, as a tuple
+
+    The attribute holds an id, or a list of ids.
+
+    """
+    value = getattr(obj, name, None)
+    if type(value) is list:
+        return tuple(dict.fromkeys(v for v in value if type(v) is str))
+    return (value,) if type(value) is str and value else ()
+
+
+class _Top:
+    """Sorts after any key, used as the upper bound of a value"""
+
+    def __gt__(self, other):
+        return True
+
+    def __lt__(self, other):
+        return False
+
+
+_top = _Top()
+
+
+def _rank(value):
+    """Returns the rank of the type of an orderable value, None otherwise"""
+    if type(value) is str:
+        return 1
+    if type(value) in (int, float, bool) and not (
+        type(value) is float and math.isnan(value)
+    ):
+        return 0
+    return None
+
+
+class HashIndex:
+    """Index of the values of an attribute, answering equality"""
+
+    kind = "hash"
+
+    def __init__(self, name):
+        """HashIndex class constructor
+
+        Args:
+            name (str): name of the attribute
+
+        """
+        self.name = name
+        self.__keys = {}  # keys of the objects, by value
+        self.__values = {}  # value of every indexed object, by key
+
+    def add(self, key, obj):
+        """Adds or updates the value of the object `obj` with `key`"""
+        value = getattr(obj, self.name, _missing)
+        try:
+            hash(value)
+        except TypeError:
+            value = _missing  # like a list, never equal to a hashable value
+        if key in self.__values:
+            if self.__values[key] == value:
+                return
+            self.remove(key)
+        self.__values[key] = value
+        if value is not _missing:
+            self.__keys.setdefault(value, {})[key] = None
+
+    def remove(self, key):
+        """Removes the object with `key`"""
+        value = self.__values.pop(key, _missing)
+        if value is not _missing:
+            keys = self.__keys[value]
+            del keys[key]
+            if not keys:
+                del self.__keys[value]
+
+    def lookup(self, op, value):
+        """Returns the keys of the objects matching `op value`
+
+        Returns None when the index can't answer the predicate.
+
+        """
+        if op != "==":
+            return None
+        try:
+            return list(self.__keys.get(value, ()))
+        except TypeError:
+            return None
+
+
+class SortedIndex:
+    """Sorted index of the values of an attribute, answering ranges"""
+
+    kind = "sorted"
+
+    def __init__(self, name):
+        """SortedIndex class constructor
+
+        Args:
+            name (str): name of the attribute
+
+        """
+        self.name = name
+        self.__entries = []  # sorted (rank, value, key) of orderable values
+        self.__values = {}  # entry of every indexed object, None if none
+
+    def add(self, key, obj):
+        """Adds or updates the value of the object `obj` with `key`"""
+        value = getattr(obj, self.name, _missing)
+        rank = _rank(value)
+        entry = (rank, value, key) if rank is not None else None
+        if key in self.__values:
+            if self.__values[key] == entry:
+                return
+            self.remove(key)
+        self.__values[key] = entry
+        if entry is not None:
+            insort(self.__entries, entry)
+
+    def remove(self, key):
+        """Removes the object with `key`"""
+        entry = self.__values.pop(key, None)
+        if entry is not None:
+            del self.__entries[bisect_left(self.__entries, entry)]
+
+    def lookup(self, op, value):
+        """Returns the keys of the objects matching `op value`, in order
+
+        Returns None when the index can't answer the predicate.
+
+        """
+        rank = _rank(value)
+        if rank is None or op == "!=":
+            return None
+        entries = self.__entries
+        low = bisect_left(entries, (rank,))
+        high = bisect_left(entries, (rank + 1,))
+        if op in ("==", ">="):
+            low = bisect_left(entries, (rank, value), low, high)
+        elif op == ">":
+            low = bisect_right(entries, (rank, value, _top), low, high)
+        if op in ("==", "<="):
+            high = bisect_right(entries, (rank, value, _top), low, high)
+        elif op == "<":
+            high = bisect_left(entries, (rank, value), low, high)
+        return [entry[2] for entry in entries[low:high]]
+
+
+class ReferenceIndex:
+    """Index of the objects referring to other objects by id"""
+
+    kind = "reference"
+
+    def __init__(self, name):
+        """ReferenceIndex class constructor
+
+        Args:
+            name (str): name of the attribute holding an id or a list of ids
+
+        """
+        self.name = name
+        self.__keys = {}  # keys of the referring objects, by referred id
+        self.__ids = {}  # referred ids of every indexed object, by key
+
+    def add(self, key, obj):
+        """Adds or updates the references of the object `obj` with `key`"""
+        ids = references(obj, self.name)
+        if self.__ids.get(key) == ids:
+            return
+        self.remove(key)
+        self.__ids[key] = ids
+        for obj_id in ids:
+            self.__keys.setdefault(obj_id, {})[key] = None
+
+    def remove(self, key):
+        """Removes the object with `key`"""
+        for obj_id in self.__ids.pop(key, ()):
+            keys = self.__keys[obj_id]
+            del keys[key]
+            if not keys:
+                del self.__keys[obj_id]
+
+    def referrers(self, obj_id):
+        """Returns the keys of the objects referring to `obj_id`"""
+        return list(self.__keys.get(obj_id, ()))
+
+
+index_types = {"hash": HashIndex, "sorted": SortedIndex}
@@ -0,0 +1,128 @@
+#!/usr/bin/python3
+"""JSON stream
+
+This module contains a parser that reads the items of a top level JSON object
+from a file one by one, so that only the current item and a chunk of the file
+are held in memory instead of the whole parsed document.
+
+"""
+import json
+import os
+import re
+
+_decoder = json.JSONDecoder()
+_whitespace = re.compile(r"[ \t\n\r]*")
+_key = re.compile(r'[ \t\n\r]*("[^"\\]*(?:\\.[^"\\]*)*")[ \t\n\r]*:[ \t\n\r]*')
+
+
+class _Reader:
+    """Buffered reader of a text file used by `iter_items`"""
+
+    def __init__(self, file, chunk_size, progress):
+        """_Reader class constructor
+
+        Args:
+            file (TextIO): the file to read
+            chunk_size (int): number of characters read at a time
+            progress (callable): called with (characters read, file size)
+
+        """
+        self.file = file
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.buffer = ""
+        self.pos = 0
+        self.read = 0
+        self.eof = False
+        try:
+            self.size = os.fstat(file.fileno()).st_size
+        except (AttributeError, OSError):
+            self.size = None
+
+    def fill(self):
+        """Reads the next chunk, dropping the consumed part of the buffer"""
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        self.read += len(chunk)
+        if self.progress:
+            self.progress(self.read, self.size)
+
+    def next_char(self):
+        """Skips whitespace and returns the next character ('' at the end)"""
+        while True:
+            self.pos = _whitespace.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer) or self.eof:
+                return self.buffer[self.pos:self.pos + 1]
+            self.fill()
+
+    def expect(self, chars):
+        """Consumes the next character, which must be one of `chars`"""
+        char = self.next_char()
+        if not char or char not in chars:
+            raise json.JSONDecodeError(
+                f"Expecting one of {chars!r}", self.buffer, self.pos
+            )
+        self.pos += 1
+        return char
+
+    def key(self):
+        """Decodes the next property name and the colon after it"""
+        while True:
+            match = _key.match(self.buffer, self.pos)
+            if match and match.end() < len(self.buffer):
+                self.pos = match.end()
+                key = match.group(1)
+                return json.loads(key) if "\\" in key else key[1:-1]
+            if self.eof:
+                raise json.JSONDecodeError(
+                    "Expecting property name", self.buffer, self.pos
+                )
+            self.fill()
+
+    def value(self):
+        """Decodes the next JSON value"""
+        while True:
+            try:
+                value, end = _decoder.scan_once(self.buffer, self.pos)
+            except StopIteration as err:
+                if self.eof:
+                    raise json.JSONDecodeError(
+                        "Expecting value", self.buffer, err.value
+                    ) from None
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            else:
+                # a value ending with the buffer may go on in the next chunk
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            self.fill()
+
+
+def iter_items(file, chunk_size=1 << 16, progress=None):
+    """Yields the (key, value) pairs of the top level JSON object of `file`
+
+    Args:
+        file (TextIO): the file to read
+        chunk_size (int): number of characters read at a time
+        progress (callable): if given, called after every chunk with the
+            number of characters read so far and the size of the file
+
+    Raises:
+        json.JSONDecodeError: if the file isn't a valid JSON object
+
+    """
+    reader = _Reader(file, chunk_size, progress)
+    reader.expect("{")
+    if reader.next_char() == "}":
+        return
+    while True:
+        key = reader.key()
+        yield key, reader.value()
+        if reader.expect(",}") == "}":
+            return
@@ -0,0 +1,37 @@
+#!/usr/bin/python3
+"""Relations
+
+This module contains the relations between the model classes, which refer to
+each other by id, and the cascade used to delete an object along with the
+objects referring to it.
+
+"""
+
+# the attribute referring to an object of a class, by class and relation
+relations = {
+    "State": {"cities": ("City", "state_id")},
+    "City": {"places": ("Place", "city_id")},
+    "User": {"places": ("Place", "user_id"), "reviews": ("Review", "user_id")},
+    "Place": {"reviews": ("Review", "place_id")},
+    "Amenity": {"places": ("Place", "amenity_ids")},
+}
+
+
+def delete_referrers(storage, obj):
+    """Deletes the objects referring to `obj`, with their own referrers
+
+    Objects referring to `obj` from a list of ids, like the places of an
+    amenity, are not deleted, the id of `obj` is removed from the list.
+
+    Args:
+        storage (FileStorage|DBStorage): the storage of the objects
+        obj (BaseModel): the deleted object
+
+    """
+    for cls_name, name in relations.get(type(obj).__name__, {}).values():
+        for child in list(storage.referrers(cls_name, name, obj.id).values()):
+            value = getattr(child, name)
+            if type(value) is list:
+                setattr(child, name, [i for i in value if i != obj.id])
+            else:
+                storage.delete(child, cascade=True)
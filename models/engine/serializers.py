@@ -0,0 +1,251 @@
+#!/usr/bin/python3
+"""Serializers
+
+This module contains the file formats FileStorage can save its objects in.
+Every serializer writes and reads (key, dictionary) pairs, where the
+dictionary is the one returned by the `to_dict` method of an object.
+
+The formats are:
+    json: a JSON object indented with 4 spaces (the default)
+    compact: the same JSON object without whitespace
+    ndjson: one JSON object per line, the key is rebuilt from the class name
+        and id of the object
+    marshal: a binary format of length prefixed `marshal` records after a
+        fixed header
+    snapshot: a read-only file with a hash index of the keys, mapped in
+        memory instead of read (see `models.engine.snapshot`)
+
+"""
+import json
+import marshal
+import os
+import struct
+
+from models.engine.json_stream import iter_items
+from models.engine.snapshot import MAGIC, Snapshot, write_snapshot
+
+
+class JSONSerializer:
+    """Serializer of the JSON format"""
+
+    name = "json"
+    binary = False
+    indent = 4
+    separators = None
+
+    def dump(self, items, file):
+        """Writes the (key, dictionary) pairs of `items` to `file`"""
+        json.dump(
+            dict(items), file, indent=self.indent, separators=self.separators
+        )
+        file.write("\n")
+
+    def load(self, file, stream=False, progress=None):
+        """Yields the (key, dictionary) pairs read from `file`
+
+        Args:
+            file (TextIO): the file to read
+            stream (bool): read the file incrementally
+            progress (callable): in stream mode, called with the number of
+                bytes read and the size of the file
+
+        """
+        if stream:
+            return iter_items(file, progress=progress)
+        return iter(json.load(file).items())
+
+
+class CompactJSONSerializer(JSONSerializer):
+    """Serializer of the JSON format without whitespace"""
+
+    name = "compact"
+    indent = None
+    separators = (",", ":")
+
+
+class NDJSONSerializer:
+    """Serializer of the newline delimited JSON format"""
+
+    name = "ndjson"
+    binary = True
+
+    def dump(self, items, file):
+        """Writes the dictionaries of `items` to `file`, one per line"""
+        encode = json.JSONEncoder(separators=(",", ":")).encode
+        for _, o_dict in items:
+            file.write(encode(o_dict).encode() + b"\n")
+
+    def load(self, file, stream=True, progress=None):
+        """Yields the (key, dictionary) pairs read from `file`
+
+        Args:
+            file (BinaryIO): the file to read
+            stream (bool): ignored, the file is always read line by line
+            progress (callable): called every 1000 lines with the number of
+                bytes read and the size of the file
+
+        """
+        size = os.fstat(file.fileno()).st_size
+        read = 0
+        for count, line in enumerate(file, 1):
+            read += len(line)
+            if line.strip():
+                o_dict = json.loads(line)
+                yield f"{o_dict['__class__']}.{o_dict['id']}", o_dict
+            if progress and count % 1000 == 0:
+                progress(read, size)
+        if progress:
+            progress(read, size)
+
+
+class MarshalSerializer:
+    """Serializer of the binary marshal format"""
+
+    name = "marshal"
+    binary = True
+    header = b"HBNB-MARSHAL-1\n"
+    length = struct.Struct("<I")
+
+    def dump(self, items, file):
+        """Writes a marshal record for every pair of `items` to `file`"""
+        file.write(self.header)
+        pack = self.length.pack
+        for item in items:
+            record = marshal.dumps(item)
+            file.write(pack(len(record)) + record)
+
+    def load(self, file, stream=True, progress=None):
+        """Yields the (key, dictionary) pairs read from `file`
+
+        Args:
+            file (BinaryIO): the file to read
+            stream (bool): ignored, records are always read one at a time
+            progress (callable): called every 1000 records with the number of
+                bytes read and the size of the file
+
+        """
+        size = os.fstat(file.fileno()).st_size
+        if file.read(len(self.header)) != self.header:
+            raise ValueError("not a marshal storage file")
+        read = len(self.header)
+        unpack = self.length.unpack
+        count = 0
+        while True:
+            prefix = file.read(self.length.size)
+            if len(prefix) < self.length.size:
+                break
+            (record_size,) = unpack(prefix)
+            yield marshal.loads(file.read(record_size))
+            read += self.length.size + record_size
+            count += 1
+            if progress and count % 1000 == 0:
+                progress(read, size)
+        if progress:
+            progress(read, size)
+
+
+class SnapshotSerializer:
+    """Serializer of the memory mapped snapshot format"""
+
+    name = "snapshot"
+    binary = True
+
+    def dump(self, items, file):
+        """Writes the (key, dictionary) pairs of `items` to `file`"""
+        write_snapshot(items, file)
+
+    def load(self, file, stream=True, progress=None):
+        """Yields the (key, dictionary) pairs read from `file`
+
+        Args:
+            file (BinaryIO): the file to read
+            stream (bool): ignored, records are always read one at a time
+            progress (callable): called at the end with the size of the file
+
+        """
+        snapshot = Snapshot(file.name)
+        try:
+            yield from snapshot.items()
+        finally:
+            snapshot.close()
+        if progress:
+            size = os.fstat(file.fileno()).st_size
+            progress(size, size)
+
+
+serializers = {
+    serializer.name: serializer
+    for serializer in (
+        JSONSerializer(),
+        CompactJSONSerializer(),
+        NDJSONSerializer(),
+        MarshalSerializer(),
+        SnapshotSerializer(),
+    )
+}
+
+extensions = {
+    ".json": "json",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".marshal": "marshal",
+    ".bin": "marshal",
+    ".snap": "snapshot",
+}
+
+
+def for_path(file_path, name=None):
+    """Returns the serializer to save to `file_path`
+
+    Args:
+        file_path (str): path of the file
+        name (str): name of the format, if None it is chosen from the
+            extension of the file, JSON being the default
+
+    """
+    if name is None:
+        extension = os.path.splitext(file_path)[1].lower()
+        name = extensions.get(extension, "json")
+    try:
+        return serializers[name]
+    except KeyError:
+        raise ValueError(f"unknown storage format '{name}'") from None
+
+
+def detect(file_path, name=None):
+    """Returns the serializer of the existing file `file_path`
+
+    The format is found from the content of the file: the marshal or
+    snapshot header, or a first line holding a whole object with a class
+    name for ndjson, anything else being read as JSON. An empty file is in
+    the format it would be saved in (see `for_path`), as a ndjson file
+    without objects is empty.
+
+    Args:
+        file_path (str): path of the file
+        name (str): name of the format of an empty file, if None it is
+            chosen from the extension of the file
+
+    Raises:
+        FileNotFoundError: if the file doesn't exist
+
+    """
+    with open(file_path, "rb") as file:
+        header = file.read(len(MarshalSerializer.header))
+        if not header:
+            return for_path(file_path, name)
+        if header == MarshalSerializer.header:
+            return serializers["marshal"]
+        if header.startswith(MAGIC):
+            return serializers["snapshot"]
+        file.seek(0)
+        line = file.readline(1 << 20).strip()
+    if line.startswith(b"{") and line.endswith(b"}"):
+        try:
+            o_dict = json.loads(line)
+        except ValueError:
+            pass
+        else:
+            if "__class__" in o_dict:
+                return serializers["ndjson"]
+    return serializers["json"]
@@ -0,0 +1,177 @@
+#!/usr/bin/python3
+"""Shards
+
+This module contains the helpers FileStorage uses to keep its objects in a
+data directory instead of a single file, with a directory per class holding
+the objects of the class in one or more segment files (`<directory>/<class
+name>/<segment>.json`). The segment of an object is a hash of its id.
+
+The number of segments and the format of the files are kept in
+`<directory>/layout.json`, so that the files can be written again when they
+change.
+
+Shards (segment files) are read and written independently of each other, so
+a pool of processes can read or write several of them at a time: `run` maps
+the reads or writes over the shards, in the processes of a
+`ProcessPoolExecutor` when there are more than one worker.
+
+"""
+import json
+import multiprocessing
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+from models.engine.serializers import detect, for_path, serializers
+
+suffixes = {"json": ".json", "compact": ".json", "ndjson": ".ndjson"}
+
+
+def segment_of(obj_id, segments):
+    """Returns the segment of the object with `obj_id`, the same everywhere"""
+    if segments == 1:
+        return 0
+    return zlib.crc32(obj_id.encode()) % segments
+
+
+def shard_path(directory, cls_name, segment, format=None):
+    """Returns the path of a segment file of class `cls_name`"""
+    suffix = suffixes.get(format or "json", f".{format}")
+    return os.path.join(directory, cls_name, f"{segment}{suffix}")
+
+
+def list_shards(directory, cls_names):
+    """Returns the paths of the segment files of the classes, by class name
+
+    Classes without a directory are left out.
+
+    """
+    shards = {}
+    for cls_name in cls_names:
+        try:
+            names = sorted(os.listdir(os.path.join(directory, cls_name)))
+        except FileNotFoundError:
+            continue
+        shards[cls_name] = [
+            os.path.join(directory, cls_name, name)
+            for name in names
+            if not name.endswith(".tmp")
+        ]
+    return shards
+
+
+def read_layout(directory):
+    """Returns the layout saved in the data directory, None if none"""
+    try:
+        with open(os.path.join(directory, "layout.json"), "r") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+
+
+def write_layout(directory, layout):
+    """Saves the layout (a dictionary) of the data directory"""
+    os.makedirs(directory, exist_ok=True)
+    write_file(
+        os.path.join(directory, "layout.json"),
+        serializers["json"],
+        layout.items(),
+    )
+
+
+def load_shard(file_path, cls=None):
+    """Returns the (key, value) pairs read from a segment file
+
+    Args:
+        file_path (str): path of the segment file
+        cls (type): if given, the values are the objects of this class built
+            from the dictionaries read, else the dictionaries
+
+    """
+    serializer = detect(file_path)
+    with open(file_path, "rb" if serializer.binary else "r") as file:
+        items = serializer.load(file)
+        if cls is None:
+            return list(items)
+        return [(key, cls(**o_dict)) for key, o_dict in items]
+
+
+def dump_shard(file_path, items, format=None, fsync=False):
+    """Writes the (key, object) pairs of `items` to a segment file
+
+    The objects can also be dictionaries, which are written as they are.
+
+    Returns:
+        int: the number of objects written
+
+    """
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    write_file(
+        file_path,
+        for_path(file_path, format),
+        (
+            (key, obj if type(obj) is dict else obj.to_dict())
+            for key, obj in items
+        ),
+        fsync,
+    )
+    return len(items)
+
+
+def write_file(file_path, serializer, items, fsync=False):
+    """Writes the (key, dictionary) pairs of `items` to a file at once
+
+    They are written to a temporary file in the same directory, which then
+    replaces the file, so that a crash while writing leaves the previous
+    version of the file.
+
+    Args:
+        file_path (str): path of the file
+        serializer: the serializer of the format of the file
+        items (iterable): the (key, dictionary) pairs
+        fsync (bool): flush the file and its directory to disk
+
+    """
+    temp_path = f"{file_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "wb" if serializer.binary else "w") as file:
+            serializer.dump(items, file)
+            if fsync:
+                file.flush()
+                os.fsync(file.fileno())
+        os.replace(temp_path, file_path)
+        if fsync:
+            directory = os.path.dirname(os.path.abspath(file_path))
+            fd = os.open(directory, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def run(function, tasks, workers=1):
+    """Yields the results of `function(*task)` for every task, in order
+
+    Args:
+        function (callable): a function of this module
+        tasks (list): the tuples of arguments
+        workers (int): number of processes to run the tasks in, the tasks
+            are run here when 1
+
+    """
+    workers = min(workers or 1, len(tasks))
+    if workers <= 1:
+        for task in tasks:
+            yield function(*task)
+        return
+    # forked workers don't import the models again, which reloads them
+    fork = "fork" in multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if fork else None)
+    with ProcessPoolExecutor(workers, mp_context=context) as pool:
+        yield from pool.map(function, *zip(*tasks))
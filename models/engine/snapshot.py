@@ -0,0 +1,195 @@
+#!/usr/bin/python3
+"""Snapshot
+
+This module contains the snapshot format: a read-only file of objects that is
+mapped in memory (`mmap`) instead of being read, so that opening it takes the
+same time whatever the number of objects, and a single object can be decoded
+without reading the others.
+
+A snapshot file is made of:
+    a header: the magic bytes, the number of objects, the number of slots of
+        the hash table and the offsets of the other parts
+    the classes: a compact JSON object of the position of the first object
+        of every class in the order table, and their number
+    a hash table of the keys: a slot per (crc32 of the key, record offset),
+        found by linear probing, an offset of 0 marking an empty slot
+    the order table: the record offsets sorted by class name, so that the
+        objects of a class follow each other
+    the records: the length of the key, the length of the dictionary, the
+        key and the dictionary as compact JSON, in the order they were given
+
+Snapshots are written whole (see `write_snapshot`), by the compaction of a
+FileStorage saving in the snapshot format.
+
+"""
+import json
+import mmap
+import struct
+import zlib
+
+MAGIC = b"HBNBSNP1"
+HEADER = struct.Struct("<8s6Q")
+SLOT = struct.Struct("<IQ")
+OFFSET = struct.Struct("<Q")
+RECORD = struct.Struct("<HI")
+
+
+class Snapshot:
+    """Read-only snapshot file mapped in memory"""
+
+    def __init__(self, file_path):
+        """Snapshot class constructor
+
+        Args:
+            file_path (str): path of the snapshot file
+
+        Raises:
+            ValueError: if the file isn't a snapshot
+
+        """
+        with open(file_path, "rb") as file:
+            header = file.read(HEADER.size)
+            if len(header) < HEADER.size or header[:8] != MAGIC:
+                raise ValueError("not a snapshot storage file")
+            self.__map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            _,
+            self.__count,
+            self.__slots,
+            classes_offset,
+            classes_size,
+            self.__table,
+            self.__order,
+        ) = HEADER.unpack(header)
+        self.__classes = json.loads(
+            self.__map[classes_offset:classes_offset + classes_size]
+        )
+
+    def __len__(self):
+        """Returns the number of objects of the snapshot"""
+        return self.__count
+
+    @property
+    def classes(self):
+        """The names of the classes with objects in the snapshot"""
+        return list(self.__classes)
+
+    def count(self, cls_name):
+        """Returns the number of objects of class `cls_name`"""
+        return self.__classes.get(cls_name, (0, 0))[1]
+
+    def get(self, key):
+        """Returns the dictionary of the object of `key`, None if not found"""
+        encoded = key.encode()
+        key_hash = zlib.crc32(encoded)
+        mask = self.__slots - 1
+        slot = key_hash & mask
+        while True:
+            found_hash, offset = SLOT.unpack_from(
+                self.__map, self.__table + slot * SLOT.size
+            )
+            if offset == 0:
+                return None
+            if found_hash == key_hash:
+                found_key, o_dict = self.__record(offset)
+                if found_key == encoded:
+                    return json.loads(o_dict)
+            slot = (slot + 1) & mask
+
+    def keys(self, cls_name=None):
+        """Yields the keys of the objects, or of the objects of `cls_name`"""
+        for offset in self.__offsets(cls_name):
+            yield self.__record(offset)[0].decode()
+
+    def items(self, cls_name=None):
+        """Yields the (key, dictionary) pairs, of all objects or of a class"""
+        for offset in self.__offsets(cls_name):
+            key, o_dict = self.__record(offset)
+            yield key.decode(), json.loads(o_dict)
+
+    def close(self):
+        """Unmaps the file"""
+        self.__map.close()
+
+    def __offsets(self, cls_name):
+        """Yields the record offsets of all objects or of class `cls_name`"""
+        if cls_name is None:
+            # the records follow the order table, in the order written
+            offset = self.__order + self.__count * OFFSET.size
+            for _ in range(self.__count):
+                yield offset
+                key_size, dict_size = RECORD.unpack_from(self.__map, offset)
+                offset += RECORD.size + key_size + dict_size
+            return
+        start, count = self.__classes.get(cls_name, (0, 0))
+        position = self.__order + start * OFFSET.size
+        for _ in range(count):
+            yield OFFSET.unpack_from(self.__map, position)[0]
+            position += OFFSET.size
+
+    def __record(self, offset):
+        """Returns the key and the JSON dictionary of the record at `offset`"""
+        key_size, dict_size = RECORD.unpack_from(self.__map, offset)
+        start = offset + RECORD.size
+        return (
+            self.__map[start:start + key_size],
+            self.__map[start + key_size:start + key_size + dict_size],
+        )
+
+
+def write_snapshot(items, file):
+    """Writes the (key, dictionary) pairs of `items` to `file` as a snapshot
+
+    Args:
+        items (iterable): the (key, dictionary) pairs
+        file (BinaryIO): the file to write, at its start
+
+    """
+    encode = json.JSONEncoder(separators=(",", ":")).encode
+    records = [
+        (key.encode(), encode(o_dict).encode()) for key, o_dict in items
+    ]
+    count = len(records)
+    slots = 1
+    while slots < 2 * count:
+        slots *= 2
+
+    cls_names = [key.partition(b".")[0].decode() for key, _ in records]
+    order = sorted(range(count), key=cls_names.__getitem__)
+    classes = {}
+    for position, number in enumerate(order):
+        classes.setdefault(cls_names[number], [position, 0])[1] += 1
+    classes = encode(classes).encode()
+
+    classes_offset = HEADER.size
+    table_offset = classes_offset + len(classes)
+    order_offset = table_offset + slots * SLOT.size
+    offset = order_offset + count * OFFSET.size
+    table = bytearray(slots * SLOT.size)
+    offsets = []
+    mask = slots - 1
+    for key, o_dict in records:
+        key_hash = zlib.crc32(key)
+        slot = key_hash & mask
+        while SLOT.unpack_from(table, slot * SLOT.size)[1]:
+            slot = (slot + 1) & mask
+        SLOT.pack_into(table, slot * SLOT.size, key_hash, offset)
+        offsets.append(offset)
+        offset += RECORD.size + len(key) + len(o_dict)
+
+    file.write(
+        HEADER.pack(
+            MAGIC,
+            count,
+            slots,
+            classes_offset,
+            len(classes),
+            table_offset,
+            order_offset,
+        )
+    )
+    file.write(classes)
+    file.write(table)
+    file.write(b"".join(OFFSET.pack(offsets[number]) for number in order))
+    for key, o_dict in records:
+        file.write(RECORD.pack(len(key), len(o_dict)) + key + o_dict)
@@ -0,0 +1,111 @@
+#!/usr/bin/python3
+"""Writer
+
+This module contains the BackgroundWriter class, the thread FileStorage uses
+in background mode to write the JSON file instead of the threads asking for
+saves.
+
+Saves only request a write: the writer waits for the requests to stop coming
+for a given interval after the first one, or for enough changes to pile up,
+then writes all of them at once (a group commit). `flush()` waits for the
+requested saves to be written.
+
+"""
+import atexit
+import threading
+from time import monotonic
+
+
+class BackgroundWriter:
+    """Thread writing the saves requested, a group of them at a time"""
+
+    def __init__(self, write, interval=0.1, max_pending=1000):
+        """BackgroundWriter class constructor
+
+        Args:
+            write (callable): called to write all the changes
+            interval (float): seconds waited after a first request for the
+                following ones, before writing
+            max_pending (int): number of pending changes that triggers a
+                write without waiting
+
+        """
+        self.__write = write
+        self.__interval = interval
+        self.__max_pending = max_pending
+        self.__condition = threading.Condition()
+        self.__requested = 0  # number of saves requested
+        self.__written = 0  # number of saves requested before the last write
+        self.__urgent = False  # write without waiting for the interval
+        self.__stopped = False
+        self.__error = None  # exception raised by the last write
+        self.__thread = threading.Thread(
+            target=self.__run, name="storage writer", daemon=True
+        )
+        self.__thread.start()
+        atexit.register(self.stop)
+
+    def request(self, pending):
+        """Requests a write of the `pending` changes made so far"""
+        with self.__condition:
+            self.__requested += 1
+            if pending >= self.__max_pending:
+                self.__urgent = True
+            self.__condition.notify()
+
+    def flush(self):
+        """Waits for the requested saves to be written
+
+        Raises:
+            Exception: the exception raised by the last write, if it failed
+
+        """
+        with self.__condition:
+            target = self.__requested
+            if self.__written < target:
+                self.__urgent = True
+                self.__condition.notify()
+                while self.__written < target:
+                    self.__condition.wait()
+            error, self.__error = self.__error, None
+        if error is not None:
+            raise error
+
+    def stop(self):
+        """Writes the requested saves, then stops the thread"""
+        with self.__condition:
+            self.__stopped = True
+            self.__condition.notify()
+        self.__thread.join()
+        atexit.unregister(self.stop)
+        error, self.__error = self.__error, None
+        if error is not None:
+            raise error
+
+    def __run(self):
+        """Writes the requested saves until the writer is stopped"""
+        condition = self.__condition
+        while True:
+            with condition:
+                while self.__written == self.__requested:
+                    if self.__stopped:
+                        return
+                    condition.wait()
+                deadline = monotonic() + self.__interval
+                while not self.__urgent and not self.__stopped:
+                    remaining = deadline - monotonic()
+                    if remaining <= 0:
+                        break
+                    condition.wait(remaining)
+                target = self.__requested
+                self.__urgent = False
+            error = None
+            try:
+                self.__write()
+            except Exception as exception:
+                error = exception  # raised by the next flush
+            with condition:
+                self.__written = target
+                if error is not None:
+                    self.__error = error
+                condition.notify_all()
@@ -0,0 +1,173 @@
+#!/usr/bin/python3
+"""Ids
+
+This module contains the generators of the ids of new instances, one of which
+is used by BaseModel (see `BaseModel._new_id`):
+    uuid4: random (version 4) uuids, from `uuid.uuid4()` (the default)
+    pool: random (version 4) uuids formatted from a pool of random bytes read
+        4096 ids at a time, instead of reading them for every id
+    uuid7: time-ordered (version 7) uuids, starting with the time in
+        milliseconds, so that they sort in order of creation
+    short: the same time-ordered ids, in 22 characters of an alphabet that
+        keeps their order, instead of 36, which shortens the keys of the
+        objects by as much
+
+The random bytes kept by the generators are dropped in a child process
+after a fork, so that the child doesn't give the same ids as its parent.
+
+"""
+import base64
+import os
+import struct
+import threading
+import time
+import uuid
+import weakref
+
+_words = struct.Struct("<4096Q")
+_sorted_alphabet = bytes.maketrans(
+    b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_",
+    b"-0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz",
+)
+_generators = weakref.WeakSet()  # the generators to reset after a fork
+
+
+def random_ids(count):
+    """Returns `count` random (version 4) uuids, from a single random read
+
+    The uuids are formatted from the hexadecimal digits of the random bytes,
+    with the version and variant digits set like `uuid.uuid4()` does.
+
+    """
+    digits = os.urandom(16 * count).hex()
+    variant = "89ab89ab89ab89ab"  # top bits of the variant digit set to 10
+    ids = []
+    append = ids.append
+    for i in range(0, 32 * count, 32):
+        h = digits[i:i + 32]
+        append(
+            f"{h[:8]}-{h[8:12]}-4{h[13:16]}-"
+            f"{variant[int(h[16], 16)]}{h[17:20]}-{h[20:]}"
+        )
+    return ids
+
+
+def uuid4():
+    """Returns a random (version 4) uuid"""
+    return str(uuid.uuid4())
+
+
+class RandomPool:
+    """Generator of random (version 4) uuids, read `size` at a time"""
+
+    def __init__(self, size=4096):
+        """RandomPool class constructor
+
+        Args:
+            size (int): number of uuids formatted at a time
+
+        """
+        self.__size = size
+        self.__ids = []
+        _generators.add(self)
+
+    def __call__(self):
+        """Returns a random uuid from the pool, filling it when empty"""
+        try:
+            return self.__ids.pop()
+        except IndexError:
+            # another thread filling the pool at the same time is harmless
+            self.__ids = random_ids(self.__size)
+            return self.__ids.pop()
+
+    def reset(self):
+        """Drops the uuids of the pool, which are read again when needed"""
+        self.__ids = []
+
+
+class TimeOrdered:
+    """Generator of time-ordered (version 7) uuids
+
+    The 48 first bits are the time in milliseconds, the 12 bits after the
+    version a counter of the ids of the same millisecond, and the last 62
+    bits are random, so that the ids of a process always increase.
+
+    """
+
+    def __init__(self):
+        """TimeOrdered class constructor"""
+        self.__lock = threading.Lock()
+        self.__millis = 0
+        self.__counter = 0
+        self.__random = iter(())
+        _generators.add(self)
+
+    def value(self):
+        """Returns the next id as an integer of 128 bits"""
+        with self.__lock:
+            millis = time.time_ns() // 1000000
+            if millis > self.__millis:
+                self.__millis = millis
+                self.__counter = 0
+            elif self.__counter < 0xFFF:
+                self.__counter += 1
+            else:  # more than 4096 ids in a millisecond, borrow the next one
+                self.__millis += 1
+                self.__counter = 0
+            random = next(self.__random, None)
+            if random is None:
+                self.__random = iter(_words.unpack(os.urandom(_words.size)))
+                random = next(self.__random)
+            return (
+                self.__millis << 80
+                | 0x7 << 76
+                | self.__counter << 64
+                | 0b10 << 62
+                | random >> 2
+            )
+
+    def reset(self):
+        """Drops the random bits read in advance, which are read again
+
+        The lock is also made again, as it may have been held by another
+        thread of the parent process when forking.
+
+        """
+        self.__lock = threading.Lock()
+        self.__random = iter(())
+
+    def __call__(self):
+        """Returns the next id, as a uuid string"""
+        h = f"{self.value():032x}"
+        return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+class ShortTimeOrdered(TimeOrdered):
+    """Generator of time-ordered ids of 22 characters
+
+    The bits of a version 7 uuid are written in base 64 with the alphabet
+    `-0-9A-Z_a-z`, which is in ASCII order, so the ids sort like the uuids.
+
+    """
+
+    def __call__(self):
+        """Returns the next id"""
+        encoded = base64.urlsafe_b64encode(self.value().to_bytes(16, "big"))
+        return encoded[:22].translate(_sorted_alphabet).decode()
+
+
+def _reset_generators():
+    """Resets the generators in a child process, after a fork"""
+    for generator in list(_generators):
+        generator.reset()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_generators)
+
+generators = {
+    "uuid4": uuid4,
+    "pool": RandomPool(),
+    "uuid7": TimeOrdered(),
+    "short": ShortTimeOrdered(),
+}
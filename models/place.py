@@ -1,5 +1,6 @@
 #!/usr/bin/python3
 """Place class"""
+import models
 from models.base_model import BaseModel
 
 
@@ -31,3 +32,21 @@ class Place(BaseModel):
     latitude = 0.0
     longitude = 0.0
     amenity_ids = []
+
+    def reviews(self):
+        """Returns the list of reviews of the place"""
+        return list(
+            models.storage.referrers("Review", "place_id", self.id).values()
+        )
+
+    def amenities(self):
+        """Returns the list of amenities of the place
+
+        The ids of `amenity_ids` that no amenity has are skipped.
+
+        """
+        amenities = (
+            models.storage.get("Amenity", amenity_id)
+            for amenity_id in self.amenity_ids
+        )
+        return [amenity for amenity in amenities if amenity is not None]
@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 """State class"""
 
+import models
 from models.base_model import BaseModel
 
 
@@ -13,3 +14,9 @@ class State(BaseModel):
     """
 
     name = ""
+
+    def cities(self):
+        """Returns the list of cities of the state"""
+        return list(
+            models.storage.referrers("City", "state_id", self.id).values()
+        )
@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 """User"""
 
+import models
 from models.base_model import BaseModel
 
 
@@ -19,3 +20,15 @@ class User(BaseModel):
     password = ""
     first_name = ""
     last_name = ""
+
+    def places(self):
+        """Returns the list of places of the user"""
+        return list(
+            models.storage.referrers("Place", "user_id", self.id).values()
+        )
+
+    def reviews(self):
+        """Returns the list of reviews written by the user"""
+        return list(
+            models.storage.referrers("Review", "user_id", self.id).values()
+        )
@@ -1,15 +1,18 @@
 #!/usr/bin/python3
 """Tests for the AirBnB clone - console"""
+import json
 import os
 from io import StringIO
 from unittest import TestCase
 from unittest.mock import patch
+from uuid import uuid4
 
 from console import HBNBCommand
 from models import storage
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
+from models.engine.file_storage import FileStorage
 from models.place import Place
 from models.review import Review
 from models.state import State
@@ -214,6 +217,35 @@ class HBNBCommandAll(TestCase):
             output_got = get_cmd_output(f"all {cls}")
             self.assertEqual(output_got, output_exp)
 
+    def test_all_pages(self):
+        """all - pages of instances with --limit and --after"""
+        for _ in range(5):
+            Amenity()
+        ids = sorted(obj.id for obj in storage.all(Amenity).values())
+
+        def page(obj_ids):
+            amenities = [storage.get("Amenity", obj_id) for obj_id in obj_ids]
+            return str([str(obj) for obj in amenities]) + "\n"
+
+        output_got = get_cmd_output("all Amenity --limit 2")
+        self.assertEqual(output_got, page(ids[:2]))
+        output_got = get_cmd_output(f"all Amenity --limit 2 --after {ids[1]}")
+        self.assertEqual(output_got, page(ids[2:4]))
+        output_got = get_cmd_output(f"all Amenity --after {ids[-2]}")
+        self.assertEqual(output_got, page(ids[-1:]))
+        output_got = get_cmd_output(f"all Amenity --limit 3 --after {ids[-1]}")
+        self.assertEqual(output_got, "")
+
+    def test_all_pages_errors(self):
+        """all - invalid page options"""
+        cases = {
+            "all --limit 2": "** class name missing **\n",
+            "all User --limit two": "** limit must be a number **\n",
+            "all User --size 2": "** option doesn't exist **\n",
+        }
+        for command, output_exp in cases.items():
+            self.assertEqual(get_cmd_output(command), output_exp)
+
 
 class TestHBNBCommandUpdate(TestCase):
     """Tests for the update command"""
@@ -331,12 +363,14 @@ class TestHBNBCommandHelps(TestCase):
 
     def test_help(self):
         """help"""
-        output_exp = """
-Documented commands (type help <topic>):
-========================================
-EOF  all  create  destroy  help  quit  show  update
-
-"""
+        output_exp = (
+            "\nDocumented commands (type help <topic>):\n"
+            + "========================================\n"
+            + "EOF        all    commit  destroy  help    quit     rollback  "
+            + "update\n"
+            + "aggregate  begin  create  export   import  related  show      "
+            + "where \n\n"
+        )
         output_got = get_cmd_output("help")
         self.assertEqual(output_got, output_exp)
 
@@ -377,9 +411,11 @@ EOF  all  create  destroy  help  quit  show  update
     def test_help_destroy(self):
         """help destroy"""
         output_exp = (
-            "Usage: destroy <class name> <id>\n"
+            "Usage: destroy <class name> <id> [--cascade]\n"
             + "Destroys an instance based on the class name and id, and saves "
             + "the change into the JSON file.\n"
+            + "With --cascade, the instances referring to it are destroyed too"
+            + ", like the cities of a state and their places.\n"
         )
         output_got = get_cmd_output("help destroy")
         self.assertEqual(output_got, output_exp)
@@ -387,10 +423,13 @@ EOF  all  create  destroy  help  quit  show  update
     def test_help_all(self):
         """help all"""
         output_exp = (
-            "Usage: all [class name]\n"
+            "Usage: all [class name] [--limit <N>] [--after <id>]\n"
             + "Prints the string representation of all instances.\n"
             + "With class name, then only string representation of instances "
             + "with that class will be printed.\n"
+            + "With --limit or --after, the instances of the class are "
+            + "printed in order of id, at most N of them, starting after the "
+            + "given id.\n"
         )
         output_got = get_cmd_output("help all")
         self.assertEqual(output_got, output_exp)
@@ -408,6 +447,504 @@ EOF  all  create  destroy  help  quit  show  update
         output_got = get_cmd_output("help update")
         self.assertEqual(output_got, output_exp)
 
+    def test_help_aggregate(self):
+        """help aggregate"""
+        output_exp = (
+            "Usage: aggregate <class name> <function> <attribute name> "
+            + "[<group by attribute name>]\n"
+            + "Prints the count, sum, avg, min or max of a numeric attribute "
+            + "of all instances of a class.\n"
+            + "With a group by attribute, the result of every value of that "
+            + "attribute is printed.\n"
+        )
+        output_got = get_cmd_output("help aggregate")
+        self.assertEqual(output_got, output_exp)
+
+    def test_help_import(self):
+        """help import"""
+        output_exp = (
+            "Usage: import <class name> <file>\n"
+            + "Creates an instance of the given class name for every record "
+            + "of a CSV or NDJSON file, saves them to the JSON file and "
+            + "prints the number of instances created.\n"
+            + "The values are type casted like with update.\n"
+        )
+        output_got = get_cmd_output("help import")
+        self.assertEqual(output_got, output_exp)
+
+    def test_help_related(self):
+        """help related"""
+        output_exp = (
+            "Usage: related <class name> <id> <relation>\n"
+            + "Prints the string representation of the instances related to "
+            + "an instance, where the relation is one of:\n"
+            + "  Amenity: places\n"
+            + "  City: places\n"
+            + "  Place: amenities, reviews\n"
+            + "  State: cities\n"
+            + "  User: places, reviews\n"
+        )
+        output_got = get_cmd_output("help related")
+        self.assertEqual(output_got, output_exp)
+
+    def test_help_where(self):
+        """help where"""
+        output_exp = (
+            "Usage: where <class name> <attribute name> <operator> <value>\n"
+            + "Prints the string representation of the instances of a class "
+            + "whose attribute compares to the value with the operator, one "
+            + "of =, ==, !=, <, <=, > or >=.\n"
+            + "The value is type casted like with update, unless it is "
+            + "quoted.\n"
+        )
+        output_got = get_cmd_output("help where")
+        self.assertEqual(output_got, output_exp)
+
+    def test_help_export(self):
+        """help export"""
+        output_exp = (
+            "Usage: export [class name] [format=ndjson|csv] "
+            + "[fields=<attribute>,...] [file=<file>]\n"
+            + "Writes all instances, or the instances of a class, one per "
+            + "line as JSON objects or CSV rows.\n"
+            + "With fields, only these attributes are written. With file, the "
+            + "instances are written to the file and their number is "
+            + "printed.\n"
+        )
+        output_got = get_cmd_output("help export")
+        self.assertEqual(output_got, output_exp)
+
+    def test_help_begin(self):
+        """help begin"""
+        output_exp = (
+            "Usage: begin\n"
+            + "Starts a transaction: the changes made by the next commands "
+            + "are only saved to the JSON file on commit.\n"
+            + "Quitting the console before commit drops the changes.\n"
+        )
+        output_got = get_cmd_output("help begin")
+        self.assertEqual(output_got, output_exp)
+
+    def test_help_commit(self):
+        """help commit"""
+        output_exp = (
+            "Usage: commit\n"
+            + "Ends the transaction and saves its changes to the JSON file.\n"
+        )
+        output_got = get_cmd_output("help commit")
+        self.assertEqual(output_got, output_exp)
+
+    def test_help_rollback(self):
+        """help rollback"""
+        output_exp = (
+            "Usage: rollback\n"
+            + "Ends the transaction and drops its changes, going back to the "
+            + "instances saved in the JSON file.\n"
+        )
+        output_got = get_cmd_output("help rollback")
+        self.assertEqual(output_got, output_exp)
+
+
+class HBNBCommandImport(TestCase):
+    """Tests for the import command"""
+
+    csv_path = "test_import.csv"
+    ndjson_path = "test_import.ndjson"
+
+    def tearDown(self):
+        """Remove the imported files"""
+        for path in (self.csv_path, self.ndjson_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_import_errors(self):
+        """Check the import command with invalid arguments"""
+        cases = {
+            "import": "** class name missing **\n",
+            "import MyModel x.csv": "** class doesn't exist **\n",
+            "import Review": "** file name missing **\n",
+            "import Review reviews.txt": "** file format not supported **\n",
+            "import Review no_such_file.csv": "** file doesn't exist **\n",
+        }
+        for command, output_exp in cases.items():
+            self.assertEqual(get_cmd_output(command), output_exp)
+
+    def test_import_csv(self):
+        """Check importing a CSV file"""
+        with open(self.csv_path, "w") as file:
+            file.write("place_id,text,stars\n")
+            file.write("p-1,Great place,5\n")
+            file.write('p-2,"Clean, quiet",4.5\n')
+            file.write("p-3,,3\n")
+        count = storage.count("Review")
+        output_got = get_cmd_output(f"import Review {self.csv_path}")
+        self.assertEqual(output_got, "3\n")
+        self.assertEqual(storage.count("Review"), count + 3)
+
+        storage.reload()
+        reviews = {
+            r.place_id: r
+            for r in storage.all("Review").values()
+            if r.place_id in ("p-1", "p-2", "p-3")
+        }
+        self.assertEqual(reviews["p-1"].text, "Great place")
+        self.assertEqual(reviews["p-1"].stars, 5)
+        self.assertEqual(reviews["p-2"].text, "Clean, quiet")
+        self.assertEqual(reviews["p-2"].stars, 4.5)
+        self.assertNotIn("text", reviews["p-3"].__dict__)
+
+    def test_import_ndjson(self):
+        """Check importing a NDJSON file, and an invalid one"""
+        obj_id = str(uuid4())
+        with open(self.ndjson_path, "w") as file:
+            file.write(f'{{"id": "{obj_id}", "name": "Wifi"}}\n\n')
+            file.write('{"name": "Pool", "price": "12"}\n')
+        output_got = get_cmd_output(f"import Amenity {self.ndjson_path}")
+        self.assertEqual(output_got, "2\n")
+        self.assertEqual(storage.get("Amenity", obj_id).name, "Wifi")
+
+        count = storage.count()
+        with open(self.ndjson_path, "w") as file:
+            file.write('{"name": "Gym"}\n{"name": \n')
+        output_got = get_cmd_output(f"import Amenity {self.ndjson_path}")
+        self.assertEqual(output_got, "** invalid record **\n")
+        self.assertEqual(storage.count(), count)
+
+    def test_import_malformed(self):
+        """Check importing rows with extra fields and non-object lines"""
+        count = storage.count()
+        with open(self.csv_path, "w") as file:
+            file.write("text,stars\nGood,4\nBad,1,extra\n")
+        output_got = get_cmd_output(f"import Review {self.csv_path}")
+        self.assertEqual(output_got, "** invalid record **\n")
+        with open(self.ndjson_path, "w") as file:
+            file.write('{"text": "Good"}\n[1, 2]\n')
+        output_got = get_cmd_output(f"import Review {self.ndjson_path}")
+        self.assertEqual(output_got, "** invalid record **\n")
+        self.assertEqual(storage.count(), count)
+
+
+class HBNBCommandRelated(TestCase):
+    """Tests for the related command and cascading destroy"""
+
+    def setUp(self):
+        """Create a state with a city, a place and its review"""
+        self.state = State()
+        self.city = City()
+        self.city.state_id = self.state.id  # pyright: ignore
+        self.user = User()
+        self.amenity = Amenity()
+        self.place = Place()
+        self.place.city_id = self.city.id  # pyright: ignore
+        self.place.user_id = self.user.id  # pyright: ignore
+        self.place.amenity_ids = [self.amenity.id]  # pyright: ignore
+        self.review = Review()
+        self.review.place_id = self.place.id  # pyright: ignore
+        self.review.user_id = self.user.id  # pyright: ignore
+        storage.save()
+
+    def test_related_errors(self):
+        """Check the related command with invalid arguments"""
+        cases = {
+            "related": "** class name missing **\n",
+            "related MyModel": "** class doesn't exist **\n",
+            "related State": "** instance id missing **\n",
+            "related State 1234": "** no instance found **\n",
+            f"related State {self.state.id}": "** relation missing **\n",
+            f"related State {self.state.id} places": (
+                "** relation doesn't exist **\n"
+            ),
+        }
+        for command, output_exp in cases.items():
+            self.assertEqual(get_cmd_output(command), output_exp)
+
+    def test_related(self):
+        """Check the instances printed for every relation"""
+        cases = (
+            ("State", self.state, "cities", self.city),
+            ("City", self.city, "places", self.place),
+            ("User", self.user, "places", self.place),
+            ("User", self.user, "reviews", self.review),
+            ("Place", self.place, "reviews", self.review),
+            ("Place", self.place, "amenities", self.amenity),
+            ("Amenity", self.amenity, "places", self.place),
+        )
+        for cls, obj, relation, related in cases:
+            output_exp = str([str(related)]) + "\n"
+            output_got = get_cmd_output(f"related {cls} {obj.id} {relation}")
+            self.assertEqual(output_got, output_exp)
+            output_got = get_cmd_output(f'{cls}.{relation}("{obj.id}")')
+            self.assertEqual(output_got, output_exp)
+
+        city = City()
+        output_got = get_cmd_output(f"related City {city.id} places")
+        self.assertEqual(output_got, "")
+
+    def test_destroy_cascade(self):
+        """Check that destroy --cascade destroys the referring instances"""
+        get_cmd_output(f"destroy User {self.user.id}")
+        self.assertIsNotNone(storage.get("Review", self.review.id))
+
+        get_cmd_output(f"destroy Amenity {self.amenity.id} --cascade")
+        self.assertEqual(self.place.amenity_ids, [])
+        get_cmd_output(f"destroy State {self.state.id} --cascade")
+        for obj in (self.state, self.city, self.place, self.review):
+            self.assertIsNone(storage.get(type(obj), obj.id))
+        storage.reload()
+        self.assertIsNone(storage.get("Review", self.review.id))
+
+
+class HBNBCommandWhere(TestCase):
+    """Tests for the where command"""
+
+    def test_where_errors(self):
+        """Check the where command with invalid arguments"""
+        cases = {
+            "where": "** class name missing **\n",
+            "where MyModel name = x": "** class doesn't exist **\n",
+            "where User": "** attribute name missing **\n",
+            "where User email": "** operator missing **\n",
+            "where User email <> x": "** operator doesn't exist **\n",
+            "where User email ==": "** value missing **\n",
+        }
+        for command, output_exp in cases.items():
+            self.assertEqual(get_cmd_output(command), output_exp)
+
+    def test_where(self):
+        """Check the where command with and without an index"""
+        city_id = str(uuid4())
+        places = [Place() for _ in range(3)]
+        for i, p in enumerate(places):
+            p.city_id = city_id  # pyright: ignore
+            p.price_by_night = 100 * (i + 1)  # pyright: ignore
+            p.name = str(i)  # pyright: ignore
+
+        def output(objs):
+            return str([str(obj) for obj in objs]) + "\n"
+
+        for _ in range(2):
+            output_got = get_cmd_output(f"where Place city_id = {city_id}")
+            self.assertEqual(output_got, output(places))
+            output_got = get_cmd_output('where Place name == "1"')
+            self.assertIn(str(places[1]), output_got)
+            output_got = get_cmd_output("where Place name == 1")
+            self.assertNotIn(str(places[1]), output_got)
+            output_got = get_cmd_output(f"where Place city_id == {uuid4()}")
+            self.assertEqual(output_got, "")
+            storage.create_index(Place, "city_id")
+
+        places[0].city_id = ""  # pyright: ignore
+        output_got = get_cmd_output(f"where Place city_id = {city_id}")
+        self.assertEqual(output_got, output(places[1:]))
+        storage.drop_index(Place, "city_id")
+
+
+class HBNBCommandExport(TestCase):
+    """Tests for the export command"""
+
+    file_path = "test_export.csv"
+
+    def tearDown(self):
+        """Remove the exported file"""
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+    def test_export_errors(self):
+        """Check the export command with invalid arguments"""
+        cases = {
+            "export MyModel": "** class doesn't exist **\n",
+            "export User size=2": "** option doesn't exist **\n",
+            "export User x y": "** option doesn't exist **\n",
+            "export User format=xml": "** format doesn't exist **\n",
+            "export User fields=": "** field name missing **\n",
+            "export User fields=id,,name": "** field name missing **\n",
+            "export User file=/nonexistent/dir/x.csv": (
+                "** file can't be written **\n"
+            ),
+        }
+        for command, output_exp in cases.items():
+            self.assertEqual(get_cmd_output(command), output_exp)
+
+    def test_export_ndjson(self):
+        """Check exporting objects as NDJSON to stdout"""
+        s = State()
+        s.name = "Texas"  # pyright: ignore
+        lines = get_cmd_output("export State").splitlines()
+        self.assertEqual(len(lines), storage.count("State"))
+        self.assertIn(json.dumps(s.to_dict(), separators=(",", ":")), lines)
+
+        lines = get_cmd_output("export State fields=name,id").splitlines()
+        self.assertIn(f'{{"name":"Texas","id":"{s.id}"}}', lines)
+
+        lines = get_cmd_output("export").splitlines()
+        self.assertEqual(len(lines), storage.count())
+
+    def test_export_csv_file(self):
+        """Check exporting objects as CSV to a file"""
+        u = User()
+        u.email = "betty@alx.com"  # pyright: ignore
+        output_got = get_cmd_output(
+            f"export User format=csv fields=id,email file={self.file_path}"
+        )
+        self.assertEqual(output_got, f"{storage.count('User')}\n")
+        with open(self.file_path, "r") as file:
+            lines = file.read().splitlines()
+        self.assertEqual(lines[0], "id,email")
+        self.assertIn(f"{u.id},betty@alx.com", lines)
+
+        get_cmd_output(f"export User format=csv file={self.file_path}")
+        with open(self.file_path, "r") as file:
+            header = file.readline().strip()
+        self.assertEqual(
+            header,
+            "__class__,id,created_at,updated_at,email,password,first_name,"
+            + "last_name",
+        )
+
+
+class HBNBCommandTransaction(TestCase):
+    """Tests for the begin, commit and rollback commands"""
+
+    def tearDown(self):
+        """End any transaction left open by a test"""
+        if storage.in_transaction():
+            storage.rollback()
+
+    def test_commit_and_rollback_without_transaction(self):
+        """Check commit and rollback outside of a transaction"""
+        output_exp = "** no transaction in progress **\n"
+        self.assertEqual(get_cmd_output("commit"), output_exp)
+        self.assertEqual(get_cmd_output("rollback"), output_exp)
+
+    def test_begin_twice(self):
+        """Check begin inside of a transaction"""
+        self.assertEqual(get_cmd_output("begin"), "")
+        output_exp = "** transaction already in progress **\n"
+        self.assertEqual(get_cmd_output("begin"), output_exp)
+
+    def test_commit(self):
+        """Check that the changes are saved once, on commit"""
+        with patch.object(
+            type(storage), "compact", autospec=True,
+            side_effect=type(storage).compact,
+        ) as compact:
+            self.assertEqual(get_cmd_output("begin"), "")
+            obj_id = get_cmd_output("create State").strip()
+            get_cmd_output(f'update State {obj_id} name "Texas"')
+            self.assertEqual(compact.call_count, 0)
+            self.assertEqual(get_cmd_output("commit"), "")
+            self.assertEqual(compact.call_count, 1)
+        self.assertFalse(storage.in_transaction())
+        storage.reload()
+        self.assertEqual(storage.get("State", obj_id).name, "Texas")
+
+    def test_rollback(self):
+        """Check that rollback drops the changes of the transaction"""
+        s = State()
+        s.name = "Texas"  # pyright: ignore
+        s.save()
+        get_cmd_output("begin")
+        obj_id = get_cmd_output("create City").strip()
+        get_cmd_output(f'update State {s.id} name "Ohio"')
+        get_cmd_output(f"destroy State {s.id}")
+        self.assertEqual(get_cmd_output("rollback"), "")
+        self.assertIsNone(storage.get("City", obj_id))
+        self.assertEqual(storage.get("State", s.id).name, "Texas")
+
+    def test_failed_import_keeps_transaction(self):
+        """Check that a failed import only drops its own changes"""
+        file_path = "test_transaction.ndjson"
+        with open(file_path, "w") as file:
+            file.write('{"text": "Great"}\n{"text": \n')
+        count = storage.count("Review")
+        try:
+            get_cmd_output("begin")
+            obj_id = get_cmd_output("create State").strip()
+            self.assertEqual(
+                get_cmd_output(f"import Review {file_path}"),
+                "** invalid record **\n",
+            )
+            self.assertEqual(get_cmd_output("commit"), "")
+        finally:
+            os.remove(file_path)
+        storage.reload()
+        self.assertIsNotNone(storage.get("State", obj_id))
+        self.assertEqual(storage.count("Review"), count)
+
+    def test_quit_drops_transaction(self):
+        """Check that quitting rolls back an open transaction"""
+        get_cmd_output("begin")
+        obj_id = get_cmd_output("create City").strip()
+        self.assertTrue(HBNBCommand().onecmd("quit"))
+        self.assertFalse(storage.in_transaction())
+        self.assertIsNone(storage.get("City", obj_id))
+
+    def test_update_dictionary_saves_once(self):
+        """Check that <class name>.update(<id>, <dict>) saves once"""
+        p = Place()
+        p.save()
+        command = (
+            f'Place.update("{p.id}", {{"name": "Loft", "max_guest": 4, '
+            + '"latitude": 1.5, "description": "Nice"}'
+            + ")"
+        )
+        with patch.object(
+            type(storage), "compact", autospec=True,
+            side_effect=type(storage).compact,
+        ) as compact:
+            self.assertEqual(get_cmd_output(command), "")
+        self.assertEqual(compact.call_count, 1)
+        self.assertFalse(storage.in_transaction())
+        storage.reload()
+        p = storage.get("Place", p.id)
+        self.assertEqual((p.name, p.max_guest), ("Loft", 4))
+
+
+class HBNBCommandAggregate(TestCase):
+    """Tests for the aggregate command"""
+
+    def test_aggregate_errors(self):
+        """aggregate - missing or invalid arguments"""
+        cases = {
+            "aggregate": "** class name missing **",
+            "aggregate MyModel": "** class doesn't exist **",
+            "aggregate Place": "** function missing **",
+            "aggregate Place median": "** function doesn't exist **",
+            "aggregate Place avg": "** attribute name missing **",
+            "aggregate Place avg name": "** attribute doesn't exist **",
+            "aggregate Place avg price_by_night x": (
+                "** attribute doesn't exist **"
+            ),
+        }
+        for command, output_exp in cases.items():
+            output_got = get_cmd_output(command)
+            self.assertEqual(output_got, output_exp + "\n")
+
+    def test_aggregate_correct_usage(self):
+        """aggregate - valid class, function and attribute"""
+        city_id = str(uuid4())
+        for price in (100, 200, 600):
+            p = Place()
+            p.city_id = city_id
+            p.price_by_night = price
+
+        places = [
+            o
+            for o in storage.all(Place).values()
+            if type(o.price_by_night) in (int, float)
+        ]
+        prices = [o.price_by_night for o in places]
+        output_got = get_cmd_output("aggregate Place max price_by_night")
+        self.assertEqual(output_got, f"{float(max(prices))}\n")
+        output_got = get_cmd_output("Place.aggregate(count, price_by_night)")
+        self.assertEqual(output_got, f"{len(prices)}\n")
+
+        output_got = get_cmd_output(
+            "aggregate Place avg price_by_night city_id"
+        )
+        result = eval(output_got)
+        self.assertEqual(result[city_id], 300.0)
+
 
 class HBNBCommandAllAdvanced(TestCase):
     """Tests for <class name>.all() command"""
@@ -430,6 +967,21 @@ class HBNBCommandAllAdvanced(TestCase):
             output_got = get_cmd_output(f"{cls}.all()")
             self.assertEqual(output_got, output_exp)
 
+    def test_all_pages(self):
+        """<class name>.all(<limit>, <cursor>) - pages of instances"""
+        for _ in range(3):
+            Review()
+        ids = sorted(obj.id for obj in storage.all(Review).values())
+        self.assertEqual(
+            get_cmd_output("Review.all(2)"),
+            get_cmd_output("all Review --limit 2"),
+        )
+        self.assertEqual(
+            get_cmd_output(f'Review.all(1, "{ids[0]}")'),
+            get_cmd_output(f"all Review --limit 1 --after {ids[0]}"),
+        )
+        self.assertIn(ids[1], get_cmd_output(f'Review.all(1, "{ids[0]}")'))
+
 
 class HBNBCommandCountAdvanced(TestCase):
     """Tests for the <class name>.count() command"""
@@ -694,3 +1246,37 @@ class TestHBNBCommandUpdateAdvancedDictionary(TestCase):
                 self.assertIs(
                     type(getattr(obj, attr)), type(self.test_dict[attr])
                 )
+
+
+class HBNBCommandShortIds(TestCase):
+    """Tests for the commands on the ids of the short id generator"""
+
+    def setUp(self):
+        """Create states with short ids, which may hold - and _"""
+        FileStorage.configure(ids="short")
+        self.states = [State() for _ in range(100)]
+        self.cities = []
+
+    def tearDown(self):
+        """Remove the objects and restore the default id generator"""
+        for obj in self.states + self.cities:
+            storage.delete(obj)
+        storage.save()
+        FileStorage.configure(ids="uuid4")
+
+    def test_show_related_destroy(self):
+        """Check that every short id can be shown, navigated and destroyed"""
+        self.assertTrue(any("_" in s.id for s in self.states))
+        for state in self.states:
+            city = City()
+            city.state_id = state.id  # pyright: ignore
+            self.cities.append(city)
+            self.assertEqual(
+                get_cmd_output(f"show State {state.id}"), f"{state}\n"
+            )
+            self.assertEqual(
+                get_cmd_output(f"related State {state.id} cities"),
+                f"{[str(city)]}\n",
+            )
+            self.assertEqual(get_cmd_output(f"destroy State {state.id}"), "")
+            self.assertIsNone(storage.get("State", state.id))
@@ -4,6 +4,7 @@ from unittest import TestCase
 
 from models.amenity import Amenity
 from models.base_model import BaseModel
+from models.place import Place
 
 
 class TestAmenityClass(TestCase):
@@ -25,3 +26,12 @@ class TestAmenityClass(TestCase):
         value = getattr(Amenity, "name")
         self.assertIs(type(value), str)
         self.assertEqual(value, "")
+
+    def test_places(self):
+        """Check the places with an amenity"""
+        a = Amenity()
+        p = Place()
+        p.amenity_ids = ["1234", a.id]  # pyright: ignore
+        self.assertEqual(a.places(), [p])
+        p.amenity_ids = ["1234"]  # pyright: ignore
+        self.assertEqual(a.places(), [])
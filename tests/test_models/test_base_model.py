@@ -119,3 +119,41 @@ class TestBaseModelTo_DictMethod(TestCase):
         self.assertEqual(b_dict["created_at"], b.created_at.isoformat())
         # updated_at
         self.assertEqual(b_dict["updated_at"], b.updated_at.isoformat())
+
+
+class TestBaseModelLazyDates(TestCase):
+    """Tests for the lazy dates of BaseModel"""
+
+    def setUp(self):
+        """Turn lazy dates on"""
+        BaseModel._lazy_dates = True
+
+    def tearDown(self):
+        """Turn lazy dates off"""
+        BaseModel._lazy_dates = False
+
+    def test_dates_kept_until_read(self):
+        """Check that the dates are converted when they are read"""
+        b_dict = BaseModel().to_dict()
+        b = BaseModel(**b_dict)
+        self.assertIs(type(b.__dict__["created_at"]), str)
+        self.assertEqual(b.to_dict(), b_dict)
+        self.assertEqual(
+            b.created_at, datetime.fromisoformat(b_dict["created_at"])
+        )
+        self.assertIs(type(b.__dict__["created_at"]), datetime)
+        self.assertEqual(b.to_dict(), b_dict)
+
+    def test_same_output(self):
+        """Check that the string representation shows datetimes"""
+        b1 = BaseModel()
+        b1.created_at = b1.created_at.replace(microsecond=0)
+        b2 = BaseModel(**b1.to_dict())
+        self.assertEqual(str(b2), str(b1))
+        self.assertEqual(b2.to_dict(), b1.to_dict())
+
+    def test_missing_date(self):
+        """Check that a missing date is an AttributeError"""
+        b = BaseModel(id="1")
+        self.assertFalse(hasattr(b, "created_at"))
+        self.assertEqual(b.to_dict(), {"__class__": "BaseModel", "id": "1"})
@@ -4,6 +4,7 @@ from unittest import TestCase
 
 from models.base_model import BaseModel
 from models.city import City
+from models.place import Place
 
 
 class TestCityClass(TestCase):
@@ -27,3 +28,11 @@ class TestCityClass(TestCase):
             self.assertIn(attr, dir(c))
             self.assertIs(type(value), str)
             self.assertEqual(value, "")
+
+    def test_places(self):
+        """Check the places of a city"""
+        c = City()
+        p = Place()
+        self.assertEqual(c.places(), [])
+        p.city_id = c.id  # pyright: ignore
+        self.assertEqual(c.places(), [p])
@@ -0,0 +1,119 @@
+#!/usr/bin/python3
+"""Unit tests for the compact version of the model classes"""
+from unittest import TestCase
+
+from models import storage
+from models.base_model import BaseModel
+from models.compact import compact_class, declared_attributes
+from models.engine.file_storage import FileStorage, classes
+from models.place import Place
+from models.user import User
+
+
+class TestCompactClass(TestCase):
+    """Tests for the compact_class function"""
+
+    def test_class(self):
+        """Check the name, parent and slots of a compact class"""
+        for cls in FileStorage._FileStorage__model_classes.values():
+            compact = compact_class(cls)
+            self.assertIs(compact_class(cls), compact)
+            self.assertEqual(compact.__name__, cls.__name__)
+            self.assertTrue(issubclass(compact, cls))
+            self.assertEqual(
+                compact.__slots__, ("_order", *declared_attributes(cls))
+            )
+
+    def test_declared_attributes(self):
+        """Check the declared attributes of a class"""
+        self.assertEqual(
+            declared_attributes(BaseModel), ["id", "created_at", "updated_at"]
+        )
+        self.assertEqual(
+            declared_attributes(User),
+            [
+                "id",
+                "created_at",
+                "updated_at",
+                "email",
+                "password",
+                "first_name",
+                "last_name",
+            ],
+        )
+
+    def test_same_output(self):
+        """Check that to_dict and __str__ are the same as the regular class"""
+        p = Place()
+        p.age = 30
+        p.name = "Home"
+        p.amenity_ids = ["a"]
+        del p.age
+        p.max_guest = 4
+
+        compact = compact_class(Place)(**p.to_dict())
+        self.assertEqual(
+            list(compact.to_dict().items()), list(p.to_dict().items())
+        )
+        self.assertEqual(str(compact), str(p))
+
+    def test_new_instance(self):
+        """Check a new compact instance and its attributes"""
+        compact = compact_class(Place)()
+        self.assertIn(f"Place.{compact.id}", storage.all())
+        self.assertEqual(compact.number_rooms, 0)
+        self.assertEqual(compact.amenity_ids, [])
+        self.assertNotIn("number_rooms", compact.to_dict())
+        with self.assertRaises(AttributeError):
+            compact.age
+
+        compact.number_rooms = 3
+        compact.age = 30
+        self.assertEqual(
+            list(compact.to_dict()),
+            [
+                "__class__",
+                "id",
+                "created_at",
+                "updated_at",
+                "number_rooms",
+                "age",
+            ],
+        )
+        self.assertEqual(compact.__dict__, {"age": 30})
+
+    def test_changes_are_tracked(self):
+        """Check that setting an attribute marks a compact instance"""
+        compact = compact_class(Place)()
+        storage.save()
+        compact.name = "Home"
+        __dirty = getattr(FileStorage, "_FileStorage__dirty")
+        self.assertIs(__dirty[f"Place.{compact.id}"], compact)
+
+    def test_shared_order(self):
+        """Check that instances setting the same attributes share the order"""
+        a = compact_class(User)()
+        b = compact_class(User)()
+        self.assertIs(a._order, b._order)
+
+
+class TestFileStorageCompactMode(TestCase):
+    """Tests for the compact option of FileStorage"""
+
+    def tearDown(self):
+        """Restore the default storage options"""
+        FileStorage.configure(compact=False)
+        storage.reload()
+
+    def test_compact_option(self):
+        """Check that the compact option switches the class registry"""
+        _ = Place()
+        storage.save()
+        FileStorage.configure(compact=True)
+        self.assertIs(classes["Place"], compact_class(Place))
+        storage.reload()
+        for obj in storage.all().values():
+            self.assertIs(type(obj), compact_class(type(obj).__base__))
+
+        FileStorage.configure(compact=False)
+        self.assertIs(classes["Place"], Place)
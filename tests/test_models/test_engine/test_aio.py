@@ -0,0 +1,115 @@
+#!/usr/bin/python3
+"""Unit tests for the asyncio interface of FileStorage"""
+import asyncio
+import json
+import os
+import shutil
+import threading
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch
+
+from models.engine.aio import AsyncStorage
+from models.engine.file_storage import FileStorage
+from models.engine.shards import load_shard
+from models.state import State
+from models.user import User
+
+
+class TestAsyncStorage(IsolatedAsyncioTestCase):
+    """Tests for the AsyncStorage class"""
+
+    file_path = "test_aio.json"
+
+    def setUp(self):
+        """Use a separate JSON file"""
+        FileStorage.configure(file_path=self.file_path)
+        FileStorage().reload()
+        self.storage = AsyncStorage(FileStorage())
+
+    def tearDown(self):
+        """Restore the default JSON file"""
+        FileStorage.configure(file_path="hbnb.json", threadsafe=False)
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+        FileStorage().reload()
+
+    def read_keys(self):
+        """Returns the keys saved in the JSON file"""
+        with open(self.file_path, "r") as file:
+            return set(json.load(file))
+
+    def test_needs_file_storage(self):
+        """Check that only a FileStorage is accepted"""
+        with self.assertRaises(TypeError):
+            AsyncStorage(object())
+
+    async def test_asave(self):
+        """Check that asave writes the objects"""
+        u = User()
+        await self.storage.asave()
+        self.assertIn(f"User.{u.id}", self.read_keys())
+
+    async def test_asave_batches(self):
+        """Check that saves asked for at the same time are done together"""
+        with patch.object(
+            FileStorage, "save", autospec=True, side_effect=FileStorage.save
+        ) as save:
+            await asyncio.gather(*(self.storage.asave() for _ in range(10)))
+        self.assertLessEqual(save.call_count, 2)
+
+    async def test_lookups(self):
+        """Check that aget, aall and aquery find the objects"""
+        s = State()
+        s.name = f"State {s.id}"
+        self.assertIs(await self.storage.aget(State, s.id), s)
+        self.assertIn(f"State.{s.id}", await self.storage.aall(State))
+        self.assertIn(f"State.{s.id}", await self.storage.aall())
+        found = await self.storage.aquery(State, ("name", "==", s.name))
+        self.assertEqual(list(found.values()), [s])
+
+    async def test_areload(self):
+        """Check that areload reads the saved objects again"""
+        s = State()
+        await self.storage.asave()
+        await self.storage.areload()
+        self.assertIsNot(await self.storage.aget(State, s.id), s)
+        self.assertEqual((await self.storage.aget(State, s.id)).id, s.id)
+
+
+class TestAsyncStorageDataDirectory(IsolatedAsyncioTestCase):
+    """Tests for the AsyncStorage class with a data directory"""
+
+    directory = "test_aio_data"
+
+    def setUp(self):
+        """Save a state to a data directory and reload it"""
+        FileStorage.configure(directory=self.directory, segments=2)
+        self.state = State()
+        FileStorage().save()
+        FileStorage().reload()
+        self.storage = AsyncStorage(FileStorage())
+
+    def tearDown(self):
+        """Restore the default JSON file"""
+        FileStorage.configure(directory=None, segments=1, threadsafe=False)
+        shutil.rmtree(self.directory, ignore_errors=True)
+        FileStorage().reload()
+
+    async def test_classes_read_in_executor(self):
+        """Check that classes are read out of the event loop thread"""
+        threads = []
+
+        def load(*args):
+            threads.append(threading.get_ident())
+            return load_shard(*args)
+
+        with patch("models.engine.file_storage.load_shard", side_effect=load):
+            state = await self.storage.aget(State, self.state.id)
+            self.assertEqual(state.id, self.state.id)
+            self.assertTrue(threads)
+            self.assertNotIn(threading.get_ident(), threads)
+            threads.clear()
+            self.assertIn(f"State.{state.id}", await self.storage.aall())
+            self.assertNotIn(threading.get_ident(), threads)
+            # read classes are looked up in the loop
+            self.assertIs(await self.storage.aget(State, state.id), state)
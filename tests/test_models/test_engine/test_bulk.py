@@ -0,0 +1,210 @@
+#!/usr/bin/python3
+"""Unit tests for the bulk import helpers"""
+import json
+import os
+from datetime import datetime
+from io import StringIO
+from unittest import TestCase
+from unittest.mock import patch
+from uuid import UUID
+
+from models.engine.bulk import (
+    build_objects,
+    cast,
+    default_fields,
+    new_ids,
+    read_records,
+    write_records,
+)
+from models.engine.file_storage import FileStorage, LazyObjects
+from models.review import Review
+from models.state import State
+
+
+def remove_file(filepath):
+    if os.path.exists(filepath):
+        os.remove(filepath)
+
+
+class TestBulkHelpers(TestCase):
+    """Tests for the helpers of the bulk module"""
+
+    csv_path = "test_bulk.csv"
+
+    def tearDown(self):
+        """Remove the test file"""
+        remove_file(self.csv_path)
+
+    def test_cast(self):
+        """Check that values are cast like the update command does"""
+        cases = {
+            "12": 12,
+            "-3": -3,
+            "4.5": 4.5,
+            "-0.5": -0.5,
+            "1.2.3": "1.2.3",
+            "abc": "abc",
+            "": "",
+        }
+        for value, expected in cases.items():
+            self.assertEqual(cast(value), expected)
+            self.assertIs(type(cast(value)), type(expected))
+
+    def test_new_ids(self):
+        """Check that ids are unique version 4 uuids"""
+        ids = new_ids(1000)
+        self.assertEqual(len(set(ids)), 1000)
+        for obj_id in ids[:10]:
+            self.assertEqual(UUID(obj_id).version, 4)
+        self.assertEqual(new_ids(0), [])
+
+    def test_read_records(self):
+        """Check reading the records of a CSV file"""
+        with open(self.csv_path, "w") as file:
+            file.write("text,stars\nGood,4\n,2\n")
+        self.assertEqual(
+            list(read_records(self.csv_path)),
+            [{"text": "Good", "stars": "4"}, {"stars": "2"}],
+        )
+        with self.assertRaises(ValueError):
+            list(read_records("reviews.txt"))
+
+    def test_read_invalid_records(self):
+        """Check that malformed records are a ValueError"""
+        with open(self.csv_path, "w") as file:
+            file.write("text,stars\nGood,4,extra\n")
+        with self.assertRaises(ValueError):
+            list(read_records(self.csv_path))
+        with open(self.csv_path, "w") as file:
+            file.write('{"text": "Good"}\n[1, 2]\n')
+        with self.assertRaises(ValueError):
+            list(read_records(self.csv_path, "ndjson"))
+
+    def test_build_objects(self):
+        """Check the ids, timestamps and casting of built objects"""
+        records = [{"text": "Good", "stars": "4"}] * 5
+        records.append(
+            {"id": "1234", "created_at": "2023-01-01T00:00:00", "n": 7}
+        )
+        with patch("models.storage") as storage:
+            objs = list(build_objects(Review, records, batch_size=2))
+        storage.new.assert_not_called()
+        self.assertEqual(len(objs), 6)
+        self.assertEqual(len({obj.id for obj in objs}), 6)
+        self.assertEqual((objs[0].text, objs[0].stars), ("Good", 4))
+        self.assertIs(objs[0].created_at, objs[1].updated_at)
+        self.assertEqual(objs[5].id, "1234")
+        self.assertEqual(objs[5].created_at, datetime(2023, 1, 1))
+        self.assertEqual(objs[5].n, 7)
+        self.assertEqual(
+            list(objs[5].to_dict()), ["__class__", "id", "created_at",
+                                      "updated_at", "n"]
+        )
+
+    def test_write_records(self):
+        """Check writing records as NDJSON and CSV"""
+        dicts = [{"id": "1", "name": "a"}, {"id": "2", "text": "b,c"}]
+        file = StringIO()
+        self.assertEqual(write_records(iter(dicts), file), 2)
+        self.assertEqual(
+            file.getvalue(), '{"id":"1","name":"a"}\n{"id":"2","text":"b,c"}\n'
+        )
+
+        file = StringIO()
+        write_records(iter(dicts), file, fields=["name"])
+        self.assertEqual(file.getvalue(), '{"name":"a"}\n{}\n')
+
+        file = StringIO()
+        write_records(iter(dicts), file, "csv", ["id", "text"])
+        self.assertEqual(file.getvalue(), 'id,text\n1,\n2,"b,c"\n')
+
+        with self.assertRaises(ValueError):
+            write_records(iter(dicts), StringIO(), "csv")
+        with self.assertRaises(ValueError):
+            write_records(iter(dicts), StringIO(), "xml")
+
+    def test_default_fields(self):
+        """Check the default CSV columns"""
+        self.assertEqual(
+            default_fields(State),
+            ["__class__", "id", "created_at", "updated_at", "name"],
+        )
+        self.assertEqual(
+            default_fields(), ["__class__", "id", "created_at", "updated_at"]
+        )
+
+
+class TestFileStorageExport(TestCase):
+    """Tests for FileStorage.export"""
+
+    file_path = "test_export.json"
+
+    def setUp(self):
+        """Use a separate JSON file"""
+        FileStorage.configure(file_path=self.file_path)
+
+    def tearDown(self):
+        """Restore the default options"""
+        FileStorage.configure(file_path="hbnb.json", lazy=False)
+        remove_file(self.file_path)
+        FileStorage().reload()
+
+    def test_export(self):
+        """Check exporting the objects of a class"""
+        f = FileStorage()
+        s = State()
+        s.name = "Texas"  # pyright: ignore
+        file = StringIO()
+        self.assertEqual(f.export(file, State), f.count(State))
+        lines = [json.loads(line) for line in file.getvalue().splitlines()]
+        self.assertIn(s.to_dict(), lines)
+
+        file = StringIO()
+        f.export(file, "State", ["id", "name"], "csv")
+        self.assertIn(f"{s.id},Texas", file.getvalue().splitlines())
+
+    def test_export_lazy(self):
+        """Check that exporting doesn't build the objects in lazy mode"""
+        f = FileStorage()
+        s = State()
+        f.save()
+        FileStorage.configure(lazy=True)
+        f.reload()
+        file = StringIO()
+        f.export(file, State, ["id"])
+        self.assertIn(f'{{"id":"{s.id}"}}', file.getvalue().splitlines())
+        objects = f.all()
+        self.assertIs(type(objects), LazyObjects)
+        self.assertIs(type(dict.get(objects, f"State.{s.id}")), dict)
+
+
+class TestFileStorageBulkImport(TestCase):
+    """Tests for FileStorage.bulk_import"""
+
+    file_path = "test_bulk_import.json"
+
+    def setUp(self):
+        """Use a separate JSON file"""
+        FileStorage.configure(file_path=self.file_path)
+
+    def tearDown(self):
+        """Restore the default JSON file"""
+        FileStorage.configure(file_path="hbnb.json")
+        remove_file(self.file_path)
+        FileStorage().reload()
+
+    def test_bulk_import(self):
+        """Check that the objects are added, indexed and saved"""
+        f = FileStorage()
+        count = f.count(Review)
+        records = ({"text": f"review {i}"} for i in range(25))
+        with patch.object(
+            FileStorage, "save", autospec=True, side_effect=FileStorage.save
+        ) as save:
+            self.assertEqual(f.bulk_import("Review", records, 10), 25)
+        self.assertEqual(save.call_count, 3)
+        self.assertEqual(f.count(Review), count + 25)
+
+        f.reload()
+        texts = {obj.text for obj in f.all(Review).values()}
+        self.assertTrue({f"review {i}" for i in range(25)} <= texts)
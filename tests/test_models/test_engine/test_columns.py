@@ -0,0 +1,127 @@
+#!/usr/bin/python3
+"""Unit tests for the ColumnStore class"""
+import math
+from unittest import TestCase
+
+from models import storage
+from models.engine.columns import ColumnStore
+from models.place import Place
+from models.state import State
+
+places = {
+    "Place.1": {"city_id": "a", "price_by_night": 100, "latitude": 10.5},
+    "Place.2": {"city_id": "a", "price_by_night": 300, "latitude": -3.0},
+    "Place.3": {"city_id": "b", "price_by_night": 50, "latitude": 48.8},
+    "Place.4": {"city_id": "b", "price_by_night": "free"},
+}
+
+
+class TestColumnStore(TestCase):
+    """Tests for the ColumnStore class"""
+
+    def setUp(self):
+        """Fill a column store of places"""
+        self.store = ColumnStore(Place)
+        for key, o_dict in places.items():
+            self.store.add(key, o_dict)
+
+    def test_columns(self):
+        """Check the columns of the Place class"""
+        self.assertEqual(
+            self.store.numeric,
+            [
+                "number_rooms",
+                "number_bathrooms",
+                "max_guest",
+                "price_by_night",
+                "latitude",
+                "longitude",
+            ],
+        )
+        self.assertEqual(
+            self.store.labels, ["city_id", "user_id", "name", "description"]
+        )
+        self.assertEqual(ColumnStore(State).numeric, [])
+
+    def test_values(self):
+        """Check the values of the columns, with defaults and NaN"""
+        self.assertEqual(len(self.store), 4)
+        prices = self.store.column("price_by_night")
+        self.assertEqual(list(prices[:3]), [100.0, 300.0, 50.0])
+        self.assertTrue(math.isnan(prices[3]))
+        self.assertEqual(self.store.column("longitude")[0], 0.0)
+        self.assertEqual(self.store.column("city_id"), ["a", "a", "b", "b"])
+
+    def test_select(self):
+        """Check selecting rows within ranges"""
+        self.assertEqual(
+            self.store.select(latitude=(1, 50)), ["Place.1", "Place.3"]
+        )
+        self.assertEqual(
+            self.store.select(latitude=(0, None), price_by_night=(None, 99)),
+            ["Place.3"],
+        )
+        with self.assertRaises(KeyError):
+            self.store.select(city_id=("a", "b"))
+
+    def test_aggregate(self):
+        """Check the aggregate functions"""
+        cases = {"count": 3, "sum": 450.0, "avg": 150.0, "min": 50.0,
+                 "max": 300.0}
+        for func, value in cases.items():
+            self.assertEqual(
+                self.store.aggregate(func, "price_by_night"), value
+            )
+        self.assertEqual(
+            self.store.aggregate("avg", "price_by_night", "city_id"),
+            {"a": 200.0, "b": 50.0},
+        )
+        self.assertEqual(
+            self.store.aggregate(
+                "count", "price_by_night", latitude=(1, None)
+            ),
+            2,
+        )
+        self.assertIsNone(
+            self.store.aggregate("max", "price_by_night", latitude=(90, 91))
+        )
+        with self.assertRaises(ValueError):
+            self.store.aggregate("median", "price_by_night")
+        with self.assertRaises(KeyError):
+            self.store.aggregate("sum", "name")
+
+    def test_update_and_remove(self):
+        """Check updating and removing rows"""
+        self.store.update("Place.4", {"city_id": "c", "price_by_night": 20})
+        self.assertEqual(self.store.aggregate("min", "price_by_night"), 20.0)
+        self.store.remove("Place.1")
+        self.store.remove("Place.123")
+        self.assertEqual(self.store.keys, ["Place.4", "Place.2", "Place.3"])
+        self.assertEqual(
+            self.store.aggregate("sum", "price_by_night", "city_id"),
+            {"c": 20.0, "a": 300.0, "b": 50.0},
+        )
+        self.store.remove("Place.3")
+        self.assertEqual(self.store.keys, ["Place.4", "Place.2"])
+
+
+class TestFileStorageColumns(TestCase):
+    """Tests for the column stores kept by FileStorage"""
+
+    def test_columns_follow_changes(self):
+        """Check that the column store follows new, changed and deleted"""
+        store = storage.columns("Place")
+        self.assertIs(storage.columns(Place), store)
+        self.assertEqual(sorted(store.keys), sorted(storage.all(Place)))
+
+        p = Place()
+        key = f"Place.{p.id}"
+        self.assertIn(key, store.keys)
+        p.price_by_night = 12345
+        self.assertEqual(
+            store.aggregate("max", "price_by_night", price_by_night=(12345,
+                                                                     12345)),
+            12345.0,
+        )
+        storage.delete(p)
+        self.assertNotIn(key, store.keys)
@@ -0,0 +1,290 @@
+#!/usr/bin/python3
+"""Unit tests for the DBStorage class"""
+import json
+import os
+import sqlite3
+from io import StringIO
+from unittest import TestCase
+from unittest.mock import patch
+
+from models.amenity import Amenity
+from models.base_model import BaseModel
+from models.city import City
+from models.engine.db_storage import DBStorage
+from models.place import Place
+from models.state import State
+from models.user import User
+
+
+def remove_file(filepath):
+    if os.path.exists(filepath):
+        os.remove(filepath)
+
+
+valid_classes = (
+    "Amenity",
+    "BaseModel",
+    "City",
+    "Place",
+    "Review",
+    "State",
+    "User",
+)
+
+
+class TestDBStorage(TestCase):
+    """Tests for the DBStorage class"""
+
+    db_path = "test_db_storage.db"
+
+    def setUp(self):
+        """Use a new database as the storage of the models"""
+        remove_file(self.db_path)
+        self.storage = DBStorage(self.db_path)
+        self.storage.reload()
+        self.patcher = patch("models.storage", self.storage)
+        self.patcher.start()
+
+    def tearDown(self):
+        """Restore the storage of the models"""
+        self.patcher.stop()
+        self.storage.close()
+        remove_file(self.db_path)
+
+    def rows(self, cls_name):
+        """Returns the ids stored in the table of `cls_name`"""
+        with sqlite3.connect(self.db_path) as connection:
+            return [
+                row[0]
+                for row in connection.execute(f'SELECT id FROM "{cls_name}"')
+            ]
+
+    def test_methods_exist(self):
+        """Check that DBStorage has the interface of FileStorage"""
+        for method in ["all", "new", "save", "reload", "delete", "get"]:
+            self.assertTrue(method in dir(DBStorage))
+
+    def test_tables(self):
+        """Check that reload creates a table per class"""
+        with sqlite3.connect(self.db_path) as connection:
+            tables = [
+                row[0]
+                for row in connection.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table'"
+                )
+            ]
+        for cls_name in valid_classes:
+            self.assertIn(cls_name, tables)
+
+    def test_new_and_save(self):
+        """Check that new objects are written on save only"""
+        u = User()
+        self.assertEqual(self.rows("User"), [])
+        self.assertIs(self.storage.get(User, u.id), u)
+        self.storage.save()
+        self.assertEqual(self.rows("User"), [u.id])
+
+    def test_get_reads_database(self):
+        """Check that get reads a saved object back from the database"""
+        p = Place()
+        p.name = "Home"
+        self.storage.save()
+
+        storage = DBStorage(self.db_path)
+        storage.reload()
+        obj = storage.get("Place", p.id)
+        self.assertIsNot(obj, p)
+        self.assertEqual(obj.to_dict(), p.to_dict())
+        self.assertIs(storage.get("Place", p.id), obj)
+        self.assertIsNone(storage.get("Place", "123"))
+        self.assertIsNone(storage.get("MyModel", p.id))
+        storage.close()
+
+    def test_update_is_saved(self):
+        """Check that changing an object updates its row"""
+        s = State()
+        self.storage.save()
+        s.name = "California"
+        self.storage.save()
+
+        self.storage.reload()
+        self.assertEqual(self.storage.get(State, s.id).name, "California")
+
+    def test_delete(self):
+        """Check that deleted objects are removed on save"""
+        b = BaseModel()
+        self.storage.save()
+        self.storage.delete(b)
+        self.assertIsNone(self.storage.get(BaseModel, b.id))
+        self.assertEqual(self.rows("BaseModel"), [b.id])
+        self.storage.save()
+        self.assertEqual(self.rows("BaseModel"), [])
+
+    def test_all_and_count(self):
+        """Check all and count with saved and pending changes"""
+        users = [User() for _ in range(3)]
+        _ = State()
+        self.storage.save()
+        self.storage.delete(users[0])
+        new_user = User()
+
+        all_users = self.storage.all(User)
+        self.assertEqual(
+            sorted(all_users),
+            sorted(f"User.{u.id}" for u in users[1:] + [new_user]),
+        )
+        self.assertIs(all_users[f"User.{new_user.id}"], new_user)
+        self.assertEqual(self.storage.count(User), 3)
+        self.assertEqual(self.storage.count("State"), 1)
+        self.assertEqual(self.storage.count(), 4)
+        self.assertEqual(len(self.storage.all()), 4)
+        self.assertEqual(self.storage.count("MyModel"), 0)
+
+    def test_reload_drops_unsaved_changes(self):
+        """Check that reload forgets objects that are not saved"""
+        u = User()
+        self.storage.reload()
+        self.assertIsNone(self.storage.get(User, u.id))
+
+    def test_transaction(self):
+        """Check that saves are deferred to the end of a transaction"""
+        with self.storage.transaction():
+            u = User()
+            u.save()
+            with self.storage.transaction():
+                State().save()
+            self.assertEqual(self.rows("User"), [])
+            self.assertTrue(self.storage.in_transaction())
+        self.assertFalse(self.storage.in_transaction())
+        self.assertEqual(self.rows("User"), [u.id])
+        self.assertEqual(len(self.rows("State")), 1)
+
+    def test_rollback(self):
+        """Check that rollback drops the changes of a transaction"""
+        u = User()
+        u.first_name = "Betty"
+        self.storage.save()
+        with self.assertRaises(ValueError):
+            with self.storage.transaction():
+                u.first_name = "Holberton"
+                State().save()
+                raise ValueError
+        self.assertFalse(self.storage.in_transaction())
+        self.assertEqual(self.storage.count(State), 0)
+        self.assertEqual(self.storage.get(User, u.id).first_name, "Betty")
+        with self.assertRaises(RuntimeError):
+            self.storage.rollback()
+        with self.assertRaises(RuntimeError):
+            self.storage.commit()
+
+    def test_nested_rollback(self):
+        """Check that a failed nested transaction keeps the outer one"""
+        with self.storage.transaction():
+            u = User()
+            u.first_name = "Betty"
+            with self.assertRaises(ValueError):
+                with self.storage.transaction():
+                    State()
+                    self.storage.delete(u)
+                    raise ValueError
+            self.assertTrue(self.storage.in_transaction())
+            self.assertEqual(self.storage.count(State), 0)
+            self.assertEqual(
+                self.storage.get(User, u.id).first_name, "Betty"
+            )
+        self.assertFalse(self.storage.in_transaction())
+        self.assertEqual(self.rows("User"), [u.id])
+        self.assertEqual(self.rows("State"), [])
+
+    def test_export(self):
+        """Check that saved and unsaved objects are exported"""
+        saved = State()
+        saved.name = "Texas"
+        self.storage.save()
+        self.storage.reload()
+        unsaved = State()
+        file = StringIO()
+        self.assertEqual(self.storage.export(file, "State"), 2)
+        lines = [json.loads(line) for line in file.getvalue().splitlines()]
+        self.assertEqual(lines, [saved.to_dict(), unsaved.to_dict()])
+
+        file = StringIO()
+        self.storage.export(file, State, ["name"], "csv")
+        self.assertEqual(file.getvalue(), 'name\nTexas\n""\n')
+
+    def test_page(self):
+        """Check that pages merge saved rows and changed objects by id"""
+        users = [User() for _ in range(6)]
+        self.storage.save()
+        self.storage.delete(users[0])
+        new_user = User()
+        ids = sorted(u.id for u in users[1:] + [new_user])
+
+        self.assertEqual(
+            list(self.storage.page(User)), [f"User.{i}" for i in ids]
+        )
+        page = self.storage.page("User", 2, ids[1])
+        self.assertEqual([u.id for u in page.values()], ids[2:4])
+        self.assertIs(page[f"User.{ids[2]}"], self.storage.get(User, ids[2]))
+        self.assertEqual(self.storage.page(User, 5, ids[-1]), {})
+        self.assertEqual(self.storage.page("MyModel"), {})
+
+    def test_query(self):
+        """Check queries on saved rows and changed objects"""
+        self.storage.create_index(Place, "max_guest", "sorted")
+        places = [Place() for _ in range(4)]
+        for i, p in enumerate(places):
+            p.max_guest = 10 + i
+        places[0].name = "Loft"
+        self.storage.save()
+        self.storage.reload()
+        places[3] = self.storage.get(Place, places[3].id)
+        places[3].max_guest = 1
+        new_place = Place()
+
+        result = self.storage.query(Place, ("max_guest", ">", 10))
+        self.assertEqual(
+            sorted(result), sorted(f"Place.{p.id}" for p in places[1:3])
+        )
+        result = self.storage.query("Place", ("max_guest", "==", 0))
+        self.assertEqual(list(result), [f"Place.{new_place.id}"])
+        result = self.storage.query(Place, ("name", "!=", ""))
+        self.assertEqual(list(result), [f"Place.{places[0].id}"])
+        with self.assertRaises(ValueError):
+            self.storage.query(Place, ("name", "~", ""))
+        self.storage.drop_index(Place, "max_guest")
+
+    def test_referrers_and_cascade(self):
+        """Check referrers of saved and unsaved objects, and cascades"""
+        s = State()
+        cities = [City() for _ in range(3)]
+        for c in cities:
+            c.state_id = s.id
+        a = Amenity()
+        p = Place()
+        p.city_id = cities[0].id
+        p.amenity_ids = [a.id]
+        self.storage.save()
+        self.storage.reload()
+        s = self.storage.get(State, s.id)
+        cities[2] = self.storage.get(City, cities[2].id)
+        cities[2].state_id = ""
+        new_city = City()
+        new_city.state_id = s.id
+
+        self.assertEqual(
+            sorted(self.storage.referrers(City, "state_id", s.id)),
+            sorted(f"City.{c.id}" for c in (cities[0], cities[1], new_city)),
+        )
+        self.assertEqual(
+            list(self.storage.referrers("Place", "amenity_ids", a.id)),
+            [f"Place.{p.id}"],
+        )
+        self.assertEqual([c.id for c in s.cities()].count(new_city.id), 1)
+
+        self.storage.delete(self.storage.get(Amenity, a.id), cascade=True)
+        self.storage.delete(s, cascade=True)
+        self.storage.save()
+        self.assertEqual(self.rows("State"), [])
+        self.assertEqual(self.rows("City"), [cities[2].id])
+        self.assertEqual(self.rows("Place"), [])
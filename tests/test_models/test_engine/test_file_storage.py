@@ -1,15 +1,21 @@
 #!/usr/bin/python3
 """Unit tests for the FileStorage class"""
 import json
+import multiprocessing
 import os
+import shutil
+import threading
+import time
 from datetime import datetime, timedelta
-from unittest import TestCase
+from unittest import TestCase, skipUnless
+from unittest.mock import patch
 from uuid import uuid4
 
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
-from models.engine.file_storage import FileStorage
+from models.engine.file_storage import FileStorage, classes
+from models.engine.shards import load_shard, segment_of
 from models.place import Place
 from models.review import Review
 from models.state import State
@@ -21,6 +27,12 @@ def remove_file(filepath):
         os.remove(filepath)
 
 
+def create_users(count):
+    """Creates and saves `count` users one by one, in another process"""
+    for _ in range(count):
+        User().save()
+
+
 valid_classes = (
     "Amenity",
     "BaseModel",
@@ -152,6 +164,45 @@ class TestFileStorageMethods(TestCase):
         __objects = getattr(f, "_FileStorage__objects")
         self.assertIs(__objects, f.all())
 
+    def test_all_method_with_class(self):
+        """Check that all(cls) returns only the objects of that class"""
+        f = FileStorage()
+        for cls in valid_classes:
+            obj = eval("{}()".format(cls))
+            expected = {
+                key: o
+                for key, o in f.all().items()
+                if type(o).__name__ == cls
+            }
+            self.assertEqual(f.all(cls), expected)
+            self.assertEqual(f.all(type(obj)), expected)
+            self.assertIsNot(f.all(cls), f.all())
+        self.assertEqual(f.all("MyModel"), {})
+
+    def test_count_method(self):
+        """Check the number of objects given by the count method"""
+        f = FileStorage()
+        self.assertEqual(f.count(), len(f.all()))
+        for cls in valid_classes:
+            count = [type(o).__name__ for o in f.all().values()].count(cls)
+            self.assertEqual(f.count(cls), count)
+
+            obj = eval("{}()".format(cls))
+            self.assertEqual(f.count(cls), count + 1)
+            f.delete(obj)
+            self.assertEqual(f.count(cls), count)
+        self.assertEqual(f.count("MyModel"), 0)
+
+    def test_count_method_after_reload(self):
+        """Check that the class index is rebuilt by reload"""
+        f = FileStorage()
+        _ = Review()
+        f.save()
+        f.reload()
+        for cls in valid_classes:
+            count = [type(o).__name__ for o in f.all().values()].count(cls)
+            self.assertEqual(f.count(cls), count)
+
     def test_new_method(self):
         """Check that the new method works correctly"""
         for cls in valid_classes:
@@ -167,6 +218,215 @@ class TestFileStorageMethods(TestCase):
             self.assertIs(__objects[key], obj)
 
 
+class TestFileStorageClasses(TestCase):
+    """Tests for the registry of classes"""
+
+    def test_classes(self):
+        """Check that every valid class name maps to its class"""
+        self.assertEqual(sorted(classes), sorted(valid_classes))
+        for name, cls in classes.items():
+            self.assertEqual(cls.__name__, name)
+            self.assertTrue(issubclass(cls, BaseModel))
+
+    def test_reload_builds_registered_classes_only(self):
+        """Check that reload doesn't evaluate class names from the file"""
+        file_path = "test_registry.json"
+        FileStorage.configure(file_path=file_path)
+        try:
+            with open(file_path, "w") as file:
+                json.dump({"X.1": {"__class__": "print", "id": "1"}}, file)
+            with self.assertRaises(KeyError):
+                FileStorage().reload()
+        finally:
+            FileStorage.configure(file_path="hbnb.json")
+            remove_file(file_path)
+            FileStorage().reload()
+
+
+class TestFileStorageStreamMode(TestCase):
+    """Tests for the stream mode of FileStorage"""
+
+    def tearDown(self):
+        """Restore the default storage options"""
+        FileStorage.configure(stream=False)
+
+    def test_reload_in_stream_mode(self):
+        """Check that stream mode reloads the same objects"""
+        f = FileStorage()
+        for cls in valid_classes:
+            obj = eval("{}()".format(cls))
+            obj.name = "Alx"
+        f.save()
+        f.reload()
+        obj_dict_before = {key: obj.to_dict() for key, obj in f.all().items()}
+
+        FileStorage.configure(stream=True)
+        reports = []
+        f.reload(progress=lambda read, size: reports.append((read, size)))
+        obj_dict_after = {key: obj.to_dict() for key, obj in f.all().items()}
+        self.assertEqual(obj_dict_before, obj_dict_after)
+        for cls in valid_classes:
+            self.assertEqual(
+                f.count(cls),
+                [type(o).__name__ for o in f.all().values()].count(cls),
+            )
+
+        __file_path = getattr(FileStorage, "_FileStorage__file_path")
+        self.assertEqual(reports[-1], (os.path.getsize(__file_path),) * 2)
+
+
+class TestFileStorageLazyMode(TestCase):
+    """Tests for the lazy mode of FileStorage"""
+
+    def setUp(self):
+        """Save some objects and reload them in lazy mode"""
+        for cls in valid_classes:
+            obj = eval("{}()".format(cls))
+            obj.name = "Alx"
+        FileStorage().save()
+        with open(getattr(FileStorage, "_FileStorage__file_path")) as file:
+            self.json_obj_dict = json.load(file)
+        FileStorage.configure(lazy=True)
+        FileStorage().reload()
+
+    def tearDown(self):
+        """Restore the default storage options"""
+        FileStorage.configure(lazy=False)
+        FileStorage().reload()
+
+    def raw_values(self):
+        """Returns the values of the dictionary of objects as stored"""
+        return dict.values(getattr(FileStorage, "_FileStorage__objects"))
+
+    def test_objects_are_not_built_on_reload(self):
+        """Check that reload keeps the dictionaries read from the file"""
+        for value in self.raw_values():
+            self.assertIs(type(value), dict)
+        f = FileStorage()
+        for cls in valid_classes:
+            self.assertEqual(
+                f.count(cls),
+                [o["__class__"] for o in self.raw_values()].count(cls),
+            )
+        for value in self.raw_values():
+            self.assertIs(type(value), dict)
+
+    def test_objects_are_built_on_access(self):
+        """Check that objects are built once, when they are accessed"""
+        f = FileStorage()
+        key = next(iter(f.all()))
+        obj = f.all()[key]
+        self.assertIsInstance(obj, BaseModel)
+        self.assertEqual(obj.to_dict(), self.json_obj_dict[key])
+        self.assertIs(f.all()[key], obj)
+        self.assertIs(f.all().get(key), obj)
+        self.assertIsNone(f.all().get("BaseModel.123"))
+        built = [v for v in self.raw_values() if type(v) is not dict]
+        self.assertEqual(built, [obj])
+
+    def test_values_and_items(self):
+        """Check that values and items give built objects"""
+        f = FileStorage()
+        self.assertEqual(len(f.all().values()), len(self.json_obj_dict))
+        for key, obj in f.all().items():
+            self.assertIsInstance(obj, BaseModel)
+            self.assertEqual(obj.to_dict(), self.json_obj_dict[key])
+
+    def test_save_and_changes(self):
+        """Check that saving in lazy mode keeps every object"""
+        f = FileStorage()
+        key = next(iter(f.all()))
+        obj = f.all()[key]
+        obj.name = "Holberton"
+        f.delete(f.all()[list(f.all())[-1]])
+        f.save()
+
+        FileStorage.configure(lazy=False)
+        f.reload()
+        self.assertEqual(len(f.all()), len(self.json_obj_dict) - 1)
+        self.assertEqual(f.all()[key].name, "Holberton")
+
+
+class TestFileStorageLazyDates(TestCase):
+    """Tests for the lazy dates of FileStorage"""
+
+    def tearDown(self):
+        """Restore the default storage options"""
+        FileStorage.configure(lazy_dates=False)
+        FileStorage().reload()
+
+    def test_file_unchanged(self):
+        """Check that saving objects with lazy dates writes the same file"""
+        f = FileStorage()
+        for cls in valid_classes:
+            eval("{}()".format(cls))
+        f.save()
+        file_path = getattr(FileStorage, "_FileStorage__file_path")
+        with open(file_path, "rb") as file:
+            saved = file.read()
+        FileStorage.configure(lazy_dates=True)
+        f.reload()
+        obj = next(iter(f.all().values()))
+        self.assertIs(type(obj.__dict__["updated_at"]), str)
+        self.assertIs(type(obj.updated_at), datetime)
+        f.compact()
+        with open(file_path, "rb") as file:
+            self.assertEqual(file.read(), saved)
+
+
+class TestFileStorageFormats(TestCase):
+    """Tests for the file formats of FileStorage"""
+
+    def tearDown(self):
+        """Restore the default storage options"""
+        FileStorage.configure(file_path="hbnb.json", format=None)
+        FileStorage().reload()
+
+    def test_formats(self):
+        """Check saving and reloading in every format"""
+        cases = (
+            ("test_formats.json", None, b"{\n"),
+            ("test_formats.json", "compact", b'{"'),
+            ("test_formats.ndjson", None, b'{"__class__":'),
+            ("test_formats.bin", None, b"HBNB-MARSHAL-1\n"),
+            ("test_formats.data", "marshal", b"HBNB-MARSHAL-1\n"),
+        )
+        f = FileStorage()
+        for cls in valid_classes:
+            obj = eval("{}()".format(cls))
+            obj.name = "Alx"
+        obj_dict = {key: obj.to_dict() for key, obj in f.all().items()}
+
+        for file_path, format, start in cases:
+            FileStorage.configure(file_path=file_path, format=format)
+            try:
+                f.save()
+                with open(file_path, "rb") as file:
+                    self.assertEqual(file.read(len(start)), start)
+                f.reload()
+                self.assertEqual(
+                    {key: obj.to_dict() for key, obj in f.all().items()},
+                    obj_dict,
+                )
+            finally:
+                remove_file(file_path)
+
+    def test_empty_ndjson(self):
+        """Check that an empty ndjson file is reloaded as an empty storage"""
+        file_path = "test_formats.ndjson"
+        FileStorage.configure(file_path=file_path)
+        f = FileStorage()
+        try:
+            for obj in list(f.all().values()):
+                f.delete(obj)
+            f.save()
+            self.assertEqual(os.path.getsize(file_path), 0)
+            f.reload()
+            self.assertEqual(f.all(), {})
+        finally:
+            remove_file(file_path)
+
+
 class TestFileStorageLinkToBaseModel(TestCase):
     """Test FileStorage link to BaseModel"""
 
@@ -198,3 +458,756 @@ class TestFileStorageLinkToBaseModel(TestCase):
 
         # Check what got out is the same as what got in
         self.assertEqual(obj_dict_before, obj_dict_after)
+
+
+class TestFileStorageDirtyTracking(TestCase):
+    """Tests for the tracking of changed objects"""
+
+    def setUp(self):
+        """Start from a saved storage"""
+        FileStorage().save()
+
+    def test_new_objects_are_dirty(self):
+        """Check that new objects are marked as changed"""
+        b = BaseModel()
+        __dirty = getattr(FileStorage, "_FileStorage__dirty")
+        self.assertIs(__dirty[f"BaseModel.{b.id}"], b)
+
+    def test_set_attribute_marks_dirty(self):
+        """Check that setting or deleting an attribute marks the object"""
+        b = BaseModel()
+        FileStorage().save()
+        self.assertEqual(getattr(FileStorage, "_FileStorage__dirty"), {})
+
+        b.name = "Alx"  # pyright: ignore
+        __dirty = getattr(FileStorage, "_FileStorage__dirty")
+        self.assertEqual(list(__dirty), [f"BaseModel.{b.id}"])
+
+        FileStorage().save()
+        del b.name  # pyright: ignore
+        __dirty = getattr(FileStorage, "_FileStorage__dirty")
+        self.assertEqual(list(__dirty), [f"BaseModel.{b.id}"])
+
+    def test_unregistered_objects_are_not_dirty(self):
+        """Check that objects not in storage are not marked"""
+        b = BaseModel(**BaseModel().to_dict())
+        FileStorage().save()
+        b.name = "Alx"  # pyright: ignore
+        self.assertEqual(getattr(FileStorage, "_FileStorage__dirty"), {})
+
+    def test_deleted_objects_are_tombstoned(self):
+        """Check that deleted objects are marked with None"""
+        b = BaseModel()
+        FileStorage().delete(b)
+        __dirty = getattr(FileStorage, "_FileStorage__dirty")
+        self.assertIsNone(__dirty[f"BaseModel.{b.id}"])
+        self.assertNotIn(f"BaseModel.{b.id}", FileStorage().all())
+
+
+class TestFileStorageLogMode(TestCase):
+    """Tests for the log mode of FileStorage"""
+
+    file_path = "test_log_mode.json"
+    log_path = file_path + ".log"
+
+    def setUp(self):
+        """Switch to log mode with a separate JSON file"""
+        FileStorage.configure(
+            file_path=self.file_path, log=True, log_limit=1000
+        )
+        FileStorage().compact()
+
+    def tearDown(self):
+        """Restore the default storage options"""
+        FileStorage.configure(file_path="hbnb.json", log=False)
+        remove_file(self.file_path)
+        remove_file(self.log_path)
+
+    def read_log(self):
+        """Returns the list of records in the log file"""
+        with open(self.log_path, "r") as file:
+            return [json.loads(line) for line in file]
+
+    def test_configure_unknown_option(self):
+        """Check that unknown options are rejected"""
+        with self.assertRaises(TypeError):
+            FileStorage.configure(unknown=True)
+
+    def test_save_appends_changes_only(self):
+        """Check that save only appends the changed objects to the log"""
+        f = FileStorage()
+        b = BaseModel()
+        f.save()
+        self.assertEqual(self.read_log(), [[f"BaseModel.{b.id}", b.to_dict()]])
+
+        u = User()
+        u.save()
+        records = self.read_log()
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[1], [f"User.{u.id}", u.to_dict()])
+
+        # Nothing changed, nothing appended
+        f.save()
+        self.assertEqual(len(self.read_log()), 2)
+
+    def test_delete_appends_tombstone(self):
+        """Check that deleted objects are logged and not reloaded"""
+        f = FileStorage()
+        b = BaseModel()
+        f.save()
+        f.delete(b)
+        f.save()
+        self.assertEqual(self.read_log()[-1], [f"BaseModel.{b.id}", None])
+
+        f.reload()
+        self.assertNotIn(f"BaseModel.{b.id}", f.all())
+
+    def test_reload_replays_log(self):
+        """Check that reload gives back the objects saved in the log"""
+        f = FileStorage()
+        s = State()
+        s.name = "California"  # pyright: ignore
+        s.save()
+        obj_dict_before = {key: obj.to_dict() for key, obj in f.all().items()}
+
+        f.reload()
+        obj_dict_after = {key: obj.to_dict() for key, obj in f.all().items()}
+        self.assertEqual(obj_dict_before, obj_dict_after)
+        self.assertEqual(f.all()[f"State.{s.id}"].name, "California")
+
+    def test_reload_ignores_truncated_record(self):
+        """Check that a record cut short by a crash is ignored"""
+        f = FileStorage()
+        b = BaseModel()
+        f.save()
+        with open(self.log_path, "a") as file:
+            file.write('["BaseModel.123", {"id"')
+
+        f.reload()
+        self.assertIn(f"BaseModel.{b.id}", f.all())
+        self.assertNotIn("BaseModel.123", f.all())
+
+    def test_update_appends_changed_object(self):
+        """Check that updating one attribute only logs that object"""
+        f = FileStorage()
+        p = Place()
+        _ = City()
+        f.save()
+
+        p.name = "Home"  # pyright: ignore
+        f.save()
+        self.assertEqual(self.read_log()[-1], [f"Place.{p.id}", p.to_dict()])
+        self.assertEqual(len(self.read_log()), 3)
+
+    def test_log_is_compacted_at_limit(self):
+        """Check that the log is folded into the JSON file at its limit"""
+        FileStorage.configure(log_limit=3)
+        f = FileStorage()
+        for _ in range(3):
+            BaseModel()
+            f.save()
+        self.assertEqual(len(self.read_log()), 3)
+
+        BaseModel()
+        f.save()
+        self.assertFalse(os.path.exists(self.log_path))
+        with open(self.file_path, "r") as file:
+            json_obj_dict = json.load(file)
+        self.assertEqual(
+            json_obj_dict, {key: obj.to_dict() for key, obj in f.all().items()}
+        )
+
+
+class TestFileStorageTransaction(TestCase):
+    """Tests for the transactions of FileStorage"""
+
+    file_path = "test_transaction.json"
+
+    def setUp(self):
+        """Use a separate JSON file"""
+        FileStorage.configure(file_path=self.file_path)
+        FileStorage().reload()
+
+    def tearDown(self):
+        """Restore the default JSON file"""
+        if FileStorage().in_transaction():
+            FileStorage().rollback()
+        FileStorage.configure(file_path="hbnb.json")
+        remove_file(self.file_path)
+        FileStorage().reload()
+
+    def read_keys(self):
+        """Returns the keys saved in the JSON file"""
+        with open(self.file_path, "r") as file:
+            return set(json.load(file))
+
+    def test_begin_saves_changes(self):
+        """Check that begin saves the changes made before it"""
+        f = FileStorage()
+        b = BaseModel()
+        f.begin()
+        self.assertIn(f"BaseModel.{b.id}", self.read_keys())
+        f.commit()
+
+    def test_transaction_saves_once(self):
+        """Check that saves are deferred to the end of a transaction"""
+        f = FileStorage()
+        with f.transaction():
+            keys = self.read_keys()
+            u = User()
+            u.save()
+            with f.transaction():
+                s = State()
+                s.save()
+            self.assertEqual(self.read_keys(), keys)
+            self.assertTrue(f.in_transaction())
+        self.assertFalse(f.in_transaction())
+        self.assertEqual(
+            self.read_keys() - keys, {f"User.{u.id}", f"State.{s.id}"}
+        )
+
+    def test_rollback(self):
+        """Check that rollback goes back to the state at begin"""
+        f = FileStorage()
+        u = User()
+        u.first_name = "Betty"  # pyright: ignore
+        u.save()
+        with self.assertRaises(ValueError):
+            with f.transaction():
+                f.get(User, u.id).first_name = "Holberton"
+                s = State()
+                f.delete(f.get(User, u.id))
+                raise ValueError
+        self.assertFalse(f.in_transaction())
+        self.assertIsNone(f.get(State, s.id))
+        self.assertEqual(f.get(User, u.id).first_name, "Betty")
+        with self.assertRaises(RuntimeError):
+            f.rollback()
+        with self.assertRaises(RuntimeError):
+            f.commit()
+
+    def test_nested_rollback(self):
+        """Check that a failed nested transaction keeps the outer one"""
+        f = FileStorage()
+        with f.transaction():
+            u = User()
+            u.first_name = "Betty"  # pyright: ignore
+            with self.assertRaises(ValueError):
+                with f.transaction():
+                    s = State()
+                    f.delete(f.get(User, u.id))
+                    raise ValueError
+            self.assertTrue(f.in_transaction())
+            self.assertIsNone(f.get(State, s.id))
+            self.assertEqual(f.get(User, u.id).first_name, "Betty")
+        self.assertFalse(f.in_transaction())
+        self.assertIn(f"User.{u.id}", self.read_keys())
+        self.assertNotIn(f"State.{s.id}", self.read_keys())
+
+
+class TestFileStoragePage(TestCase):
+    """Tests for the pages of FileStorage"""
+
+    def test_pages_follow_changes(self):
+        """Check that pages stay in order of id as objects come and go"""
+        f = FileStorage()
+        amenities = [Amenity() for _ in range(10)]
+        ids = sorted(obj.id for obj in f.all(Amenity).values())
+        self.assertEqual(
+            list(f.page(Amenity)), [f"Amenity.{obj_id}" for obj_id in ids]
+        )
+
+        new = Amenity()
+        f.delete(amenities[0])
+        ids = sorted(obj.id for obj in f.all(Amenity).values())
+        self.assertIn(new.id, ids)
+        self.assertEqual(
+            [obj.id for obj in f.page("Amenity").values()], ids
+        )
+
+        pages = []
+        after = None
+        while True:
+            page = f.page(Amenity, 3, after)
+            if not page:
+                break
+            pages.extend(obj.id for obj in page.values())
+            after = pages[-1]
+        self.assertEqual(pages, ids)
+        self.assertEqual(f.page(Amenity, 0), {})
+        self.assertEqual(f.page("MyModel", 5), {})
+
+
+class TestFileStorageSharedMode(TestCase):
+    """Tests for the atomic writes and the shared mode of FileStorage"""
+
+    file_path = "test_shared.json"
+
+    def setUp(self):
+        """Use a separate JSON file in shared mode"""
+        FileStorage.configure(file_path=self.file_path, shared=True)
+        FileStorage().reload()
+
+    def tearDown(self):
+        """Restore the default JSON file"""
+        FileStorage.configure(file_path="hbnb.json", shared=False)
+        remove_file(self.file_path)
+        remove_file(self.file_path + ".lock")
+        FileStorage().reload()
+
+    def read_file(self):
+        """Returns the dictionaries saved in the JSON file"""
+        with open(self.file_path, "r") as file:
+            return json.load(file)
+
+    def write_file(self, saved):
+        """Writes the file like another process would"""
+        with open(self.file_path, "w") as file:
+            json.dump(saved, file)
+
+    def test_failed_write_keeps_file(self):
+        """Check that a failed save leaves the previous file"""
+        f = FileStorage()
+        b = BaseModel()
+        b.save()
+        saved = self.read_file()
+        b.tags = {"not", "serializable"}
+        with self.assertRaises(TypeError):
+            f.save()
+        self.assertEqual(self.read_file(), saved)
+        self.assertEqual(
+            [name for name in os.listdir() if name.endswith(".tmp")], []
+        )
+
+    def test_save_merges_other_changes(self):
+        """Check that the changes of other processes are kept on save"""
+        f = FileStorage()
+        u = User()
+        s = State()
+        f.save()
+        saved = self.read_file()
+        later = (u.updated_at + timedelta(seconds=1)).isoformat()
+        saved[f"User.{u.id}"].update(first_name="Betty", updated_at=later)
+        del saved[f"State.{s.id}"]
+        city_id = str(uuid4())
+        saved[f"City.{city_id}"] = {
+            "__class__": "City",
+            "id": city_id,
+            "created_at": later,
+            "updated_at": later,
+        }
+        self.write_file(saved)
+
+        a = Amenity()
+        a.save()
+        saved = self.read_file()
+        self.assertEqual(saved[f"User.{u.id}"]["first_name"], "Betty")
+        self.assertNotIn(f"State.{s.id}", saved)
+        self.assertIn(f"City.{city_id}", saved)
+        self.assertIn(f"Amenity.{a.id}", saved)
+        self.assertEqual(f.get(User, u.id).first_name, "Betty")
+        self.assertIsNone(f.get(State, s.id))
+        self.assertEqual(f.get(City, city_id).id, city_id)
+
+    def test_conflicts_keep_latest(self):
+        """Check that objects changed twice keep the latest version"""
+        f = FileStorage()
+        older = Place()
+        newer = Place()
+        f.save()
+        saved = self.read_file()
+        for obj, seconds in ((older, -1), (newer, 1)):
+            changed = (obj.updated_at + timedelta(seconds=seconds))
+            saved[f"Place.{obj.id}"].update(
+                name="theirs", updated_at=changed.isoformat()
+            )
+        self.write_file(saved)
+        older.name = "ours"
+        newer.name = "ours"
+        older.save()
+        newer.updated_at = newer.updated_at - timedelta(seconds=5)
+        f.save()
+        saved = self.read_file()
+        self.assertEqual(saved[f"Place.{older.id}"]["name"], "ours")
+        self.assertEqual(saved[f"Place.{newer.id}"]["name"], "theirs")
+        self.assertEqual(f.get(Place, newer.id).name, "theirs")
+
+    def test_merge_keeps_instances(self):
+        """Check that objects held across a merge are still the stored ones"""
+        f = FileStorage()
+        u = User()
+        f.save()
+        saved = self.read_file()
+        later = (u.updated_at + timedelta(seconds=1)).isoformat()
+        saved[f"User.{u.id}"].update(first_name="Betty", updated_at=later)
+        self.write_file(saved)
+        Amenity().save()
+        self.assertIs(f.get(User, u.id), u)
+        self.assertEqual(u.first_name, "Betty")
+        u.last_name = "Holberton"
+        u.save()
+        saved = self.read_file()[f"User.{u.id}"]
+        self.assertEqual(saved["first_name"], "Betty")
+        self.assertEqual(saved["last_name"], "Holberton")
+
+    def test_shared_mode_turned_on(self):
+        """Check that objects read before the shared mode are merged"""
+        FileStorage.configure(shared=False)
+        f = FileStorage()
+        f.reload()
+        p = Place()
+        f.save()
+        FileStorage.configure(shared=True)
+        p.name = "ours"
+        p.updated_at = p.updated_at - timedelta(seconds=5)
+        f.save()
+        self.assertEqual(self.read_file()[f"Place.{p.id}"]["name"], "ours")
+
+    @skipUnless(
+        "fork" in multiprocessing.get_all_start_methods(), "needs fork"
+    )
+    def test_processes_keep_all_saves(self):
+        """Check that processes saving at the same time lose no object"""
+        context = multiprocessing.get_context("fork")
+        processes = [
+            context.Process(target=create_users, args=(20,))
+            for _ in range(3)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        FileStorage().reload()
+        self.assertEqual(FileStorage().count(User), 60)
+
+
+class TestFileStorageThreadSafeMode(TestCase):
+    """Tests for the thread-safe mode of FileStorage"""
+
+    file_path = "test_threadsafe.json"
+
+    def setUp(self):
+        """Use a separate JSON file in thread-safe mode"""
+        FileStorage.configure(file_path=self.file_path, threadsafe=True)
+        FileStorage().reload()
+
+    def tearDown(self):
+        """Restore the default JSON file"""
+        FileStorage.configure(file_path="hbnb.json", threadsafe=False)
+        remove_file(self.file_path)
+        FileStorage().reload()
+
+    def test_all_returns_copy(self):
+        """Check that all returns a copy of the dictionary of objects"""
+        f = FileStorage()
+        objects = f.all()
+        b = BaseModel()
+        self.assertNotIn(f"BaseModel.{b.id}", objects)
+        self.assertIn(f"BaseModel.{b.id}", f.all())
+
+    def test_threads_share_storage(self):
+        """Check that threads can add, read and save objects together"""
+        f = FileStorage()
+        users = f.count(User)
+        errors = []
+
+        def work():
+            try:
+                for i in range(100):
+                    u = User()
+                    u.first_name = str(i)
+                    sum(1 for _ in f.all().values())
+                    f.query(User, ("first_name", "==", "0"))
+                    if i % 25 == 0:
+                        f.save()
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        f.save()
+        self.assertEqual(errors, [])
+        self.assertEqual(f.count(User), users + 400)
+        with open(self.file_path, "r") as file:
+            self.assertEqual(len(json.load(file)), f.count())
+
+
+class TestFileStorageBackgroundMode(TestCase):
+    """Tests for the background mode of FileStorage"""
+
+    file_path = "test_background.json"
+
+    def setUp(self):
+        """Use a separate JSON file, written in the background"""
+        FileStorage.configure(
+            file_path=self.file_path, background=True, flush_interval=60
+        )
+        FileStorage().reload()
+
+    def tearDown(self):
+        """Restore the default JSON file"""
+        FileStorage.configure(
+            file_path="hbnb.json",
+            background=False,
+            flush_interval=0.1,
+            max_pending=1000,
+        )
+        remove_file(self.file_path)
+        FileStorage().reload()
+
+    def read_keys(self):
+        """Returns the keys saved in the JSON file, None if no file"""
+        try:
+            with open(self.file_path, "r") as file:
+                return set(json.load(file))
+        except FileNotFoundError:
+            return None
+
+    def test_save_is_deferred(self):
+        """Check that saves are written by flush, all at once"""
+        f = FileStorage()
+        users = [User() for _ in range(3)]
+        for user in users:
+            user.save()
+        self.assertIsNone(self.read_keys())
+        f.flush()
+        keys = self.read_keys()
+        for user in users:
+            self.assertIn(f"User.{user.id}", keys)
+        f.flush()
+
+    def test_reload_writes_pending_saves(self):
+        """Check that reload writes the saves not written yet first"""
+        f = FileStorage()
+        user = User()
+        user.save()
+        f.reload()
+        self.assertIn(f"User.{user.id}", self.read_keys())
+        self.assertIn(f"User.{user.id}", f.all())
+
+    def test_max_pending_writes(self):
+        """Check that enough changes get written without waiting"""
+        FileStorage.configure(max_pending=2)
+        State()
+        State().save()
+        for _ in range(100):
+            if self.read_keys() is not None:
+                break
+            time.sleep(0.05)
+        self.assertEqual(len(self.read_keys()), FileStorage().count())
+
+    def test_flush_raises_write_error(self):
+        """Check that a failed write is raised by the next flush"""
+        f = FileStorage()
+        b = BaseModel()
+        b.tags = {"not", "serializable"}
+        f.save()
+        with self.assertRaises(TypeError):
+            f.flush()
+        del b.tags
+        f.save()
+        f.flush()
+        self.assertIn(f"BaseModel.{b.id}", self.read_keys())
+
+    def test_stop_writes_pending(self):
+        """Check that leaving background mode writes the pending saves"""
+        a = Amenity()
+        a.save()
+        FileStorage.configure(background=False)
+        self.assertIn(f"Amenity.{a.id}", self.read_keys())
+
+
+class TestFileStorageDataDirectory(TestCase):
+    """Tests for the data directory layout of FileStorage"""
+
+    directory = "test_data"
+
+    def setUp(self):
+        """Use a data directory of 4 segments per class"""
+        FileStorage.configure(directory=self.directory, segments=4)
+        FileStorage().reload()
+
+    def tearDown(self):
+        """Restore the default JSON file"""
+        FileStorage.configure(directory=None, segments=1, workers=1)
+        shutil.rmtree(self.directory, ignore_errors=True)
+        FileStorage().reload()
+
+    def test_save_and_reload(self):
+        """Check that objects are saved to a directory per class"""
+        f = FileStorage()
+        users = [User() for _ in range(20)]
+        f.save()
+        self.assertEqual(
+            sorted(os.listdir(os.path.join(self.directory, "User"))),
+            ["0.json", "1.json", "2.json", "3.json"],
+        )
+        count = f.count()
+        f.reload()
+        self.assertEqual(f.count(), count)
+        for user in users:
+            self.assertEqual(
+                f.get(User, user.id).to_dict(), user.to_dict()
+            )
+
+    def test_workers(self):
+        """Check that worker processes read and write the same objects"""
+        FileStorage.configure(workers=3)
+        f = FileStorage()
+        states = [State() for _ in range(20)]
+        f.save()
+        count = f.count()
+        f.reload()
+        self.assertEqual(f.count(), count)
+        self.assertEqual(
+            f.get(State, states[0].id).to_dict(), states[0].to_dict()
+        )
+
+    def test_stale_segments_removed(self):
+        """Check that segments of deleted objects are removed"""
+        f = FileStorage()
+        a = Amenity()
+        f.save()
+        FileStorage.configure(segments=1)
+        f.delete(a)
+        f.save()
+        amenities = os.path.join(self.directory, "Amenity")
+        self.assertEqual(
+            os.listdir(amenities), ["0.json"] if f.count(Amenity) else []
+        )
+        f.reload()
+        self.assertIsNone(f.get(Amenity, a.id))
+
+    def test_only_changed_segments_written(self):
+        """Check that a save only writes the segments holding changes"""
+        f = FileStorage()
+        users = [User() for _ in range(20)]
+        f.save()
+        count = f.count(User)
+        user_dir = os.path.join(self.directory, "User")
+        before = {
+            name: os.stat(os.path.join(user_dir, name)).st_mtime_ns
+            for name in os.listdir(user_dir)
+        }
+        time.sleep(0.01)
+        users[0].first_name = "Betty"
+        f.save()
+        changed = [
+            name
+            for name in os.listdir(user_dir)
+            if os.stat(os.path.join(user_dir, name)).st_mtime_ns
+            != before[name]
+        ]
+        self.assertEqual(len(changed), 1)
+        f.reload()
+        self.assertEqual(f.get(User, users[0].id).first_name, "Betty")
+        self.assertEqual(f.count(User), count)
+
+    def test_save_splits_changed_keys_only(self):
+        """Check that a save only finds the segments of the changed objects"""
+        f = FileStorage()
+        users = [User() for _ in range(20)]
+        f.save()
+        count = f.count(User)
+        user = User()
+        f.delete(users[0])
+        with patch(
+            "models.engine.file_storage.segment_of", side_effect=segment_of
+        ) as split:
+            f.save()
+        self.assertEqual(split.call_count, 2)
+        f.reload()
+        self.assertIsNotNone(f.get(User, user.id))
+        self.assertIsNone(f.get(User, users[0].id))
+        self.assertEqual(f.count(User), count)
+
+    def test_classes_read_when_needed(self):
+        """Check that only the classes used are read after a reload"""
+        f = FileStorage()
+        s = State()
+        r = Review()
+        f.save()
+        f.reload()
+        with patch(
+            "models.engine.file_storage.load_shard", side_effect=load_shard
+        ) as load:
+            self.assertEqual(f.get(State, s.id).id, s.id)
+            read = {os.path.dirname(c.args[0]) for c in load.call_args_list}
+            self.assertEqual(read, {os.path.join(self.directory, "State")})
+            self.assertIn(f"Review.{r.id}", f.all())
+
+    def test_layout_change_rewrites_all(self):
+        """Check that all segments are written again with a new layout"""
+        f = FileStorage()
+        places = [Place() for _ in range(10)]
+        f.save()
+        f.reload()
+        FileStorage.configure(segments=2)
+        f.save()
+        self.assertEqual(
+            sorted(os.listdir(os.path.join(self.directory, "Place"))),
+            ["0.json", "1.json"],
+        )
+        f.reload()
+        for place in places:
+            self.assertIsNotNone(f.get(Place, place.id))
+
+
+class TestFileStorageSnapshot(TestCase):
+    """Tests for the snapshot format of FileStorage"""
+
+    file_path = "test_file_storage.snap"
+
+    def setUp(self):
+        """Save a few objects to a snapshot file and map it"""
+        f = FileStorage()
+        self.states = [State() for _ in range(10)]
+        self.user = User()
+        self.count = f.count()
+        f.snapshot(self.file_path)
+        FileStorage.configure(file_path=self.file_path)
+        f.reload()
+
+    def tearDown(self):
+        """Restore the default JSON file"""
+        FileStorage.configure(file_path="hbnb.json")
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+        FileStorage().reload()
+
+    def test_get_decodes_one_object(self):
+        """Check that getting an object doesn't read its class"""
+        f = FileStorage()
+        with patch(
+            "models.engine.snapshot.Snapshot.items", autospec=True
+        ) as items:
+            user = f.get(User, self.user.id)
+            self.assertGreaterEqual(f.count(State), len(self.states))
+            items.assert_not_called()
+        self.assertEqual(user.to_dict(), self.user.to_dict())
+        self.assertIsNone(f.get(User, "missing"))
+        self.assertIs(f.all(User)[f"User.{user.id}"], user)
+
+    def test_counts(self):
+        """Check that the counts are those of the objects saved"""
+        f = FileStorage()
+        self.assertGreaterEqual(f.count(State), len(self.states))
+        self.assertEqual(f.count(State), len(f.all(State)))
+        self.assertEqual(f.count(), self.count)
+
+    def test_changes_saved(self):
+        """Check that changes are saved back to the snapshot file"""
+        f = FileStorage()
+        state = f.get(State, self.states[0].id)
+        state.name = "Oregon"
+        f.delete(f.get(State, self.states[1].id))
+        city = City()
+        f.save()
+        f.reload()
+        self.assertEqual(f.get(State, self.states[0].id).name, "Oregon")
+        self.assertIsNone(f.get(State, self.states[1].id))
+        self.assertIsNotNone(f.get(City, city.id))
+        self.assertEqual(f.count(), self.count)
@@ -0,0 +1,200 @@
+#!/usr/bin/python3
+"""Unit tests for the indexes of attributes"""
+from unittest import TestCase
+from unittest.mock import patch
+
+from models.amenity import Amenity
+from models.city import City
+from models.engine.file_storage import FileStorage
+from models.engine.indexes import (
+    HashIndex,
+    ReferenceIndex,
+    SortedIndex,
+    matches,
+)
+from models.place import Place
+from models.state import State
+from models.user import User
+
+
+class Obj:
+    """Object with the attributes it is given"""
+
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+objects = {
+    "1": Obj(value=3),
+    "2": Obj(value=1.5),
+    "3": Obj(value="b"),
+    "4": Obj(value=3),
+    "5": Obj(value=["list"]),
+    "6": Obj(),
+    "7": Obj(value="a"),
+    "8": Obj(value=float("nan")),
+}
+
+predicates = [
+    (op, value)
+    for op in ("==", "!=", "<", "<=", ">", ">=")
+    for value in (3, 1.5, 2, "a", "b", "c", 0, True)
+]
+
+
+class TestIndexes(TestCase):
+    """Tests for the HashIndex and SortedIndex classes"""
+
+    def scan(self, op, value):
+        """Returns the keys of the objects matching the predicate"""
+        return sorted(
+            key
+            for key, obj in objects.items()
+            if matches(obj, ("value", op, value))
+        )
+
+    def test_matches(self):
+        """Check predicates on values of any type"""
+        self.assertEqual(self.scan("==", 3), ["1", "4"])
+        self.assertEqual(self.scan("<", 3), ["2"])
+        self.assertEqual(self.scan(">=", "b"), ["3"])
+        self.assertEqual(self.scan("!=", "b"), ["1", "2", "4", "5", "7", "8"])
+
+    def test_indexes_agree_with_scan(self):
+        """Check that the indexes give the same objects as a scan"""
+        for index_type in (HashIndex, SortedIndex):
+            index = index_type("value")
+            for key, obj in objects.items():
+                index.add(key, obj)
+            for op, value in predicates:
+                keys = index.lookup(op, value)
+                if keys is not None:
+                    self.assertEqual(
+                        sorted(keys), self.scan(op, value), (op, value)
+                    )
+
+    def test_what_indexes_answer(self):
+        """Check the predicates answered by every kind of index"""
+        hash_index = HashIndex("value")
+        sorted_index = SortedIndex("value")
+        self.assertEqual(hash_index.lookup("==", 3), [])
+        self.assertIsNone(hash_index.lookup("<", 3))
+        self.assertIsNone(hash_index.lookup("==", ["list"]))
+        self.assertEqual(sorted_index.lookup("<", 3), [])
+        self.assertIsNone(sorted_index.lookup("!=", 3))
+        self.assertIsNone(sorted_index.lookup("==", None))
+
+    def test_update_and_remove(self):
+        """Check that updated and removed objects move in the index"""
+        for index in (HashIndex("value"), SortedIndex("value")):
+            obj = Obj(value=1)
+            index.add("1", obj)
+            index.add("2", Obj(value=1))
+            obj.value = 2
+            index.add("1", obj)
+            self.assertEqual(index.lookup("==", 1), ["2"])
+            self.assertEqual(index.lookup("==", 2), ["1"])
+            index.remove("2")
+            index.remove("3")
+            self.assertEqual(index.lookup("==", 1), [])
+
+    def test_sorted_order(self):
+        """Check that a sorted index gives keys in order of value"""
+        index = SortedIndex("value")
+        for key, obj in objects.items():
+            index.add(key, obj)
+        self.assertEqual(index.lookup(">", 0), ["2", "1", "4"])
+        self.assertEqual(index.lookup("<=", "z"), ["7", "3"])
+
+
+class TestFileStorageQuery(TestCase):
+    """Tests for the queries of FileStorage"""
+
+    def tearDown(self):
+        """Drop the indexes of the tests"""
+        f = FileStorage()
+        f.drop_index(Place, "max_guest")
+        f.drop_index(User, "email")
+
+    def test_query(self):
+        """Check queries with and without indexes"""
+        f = FileStorage()
+        u = User()
+        u.email = "query@alx.com"  # pyright: ignore
+        places = [Place() for _ in range(4)]
+        for i, p in enumerate(places):
+            p.user_id = u.id  # pyright: ignore
+            p.max_guest = 1000 + i  # pyright: ignore
+
+        expected = {f"Place.{p.id}": p for p in places[2:]}
+        query = (("max_guest", ">=", 1002), ("user_id", "==", u.id))
+        self.assertEqual(f.query(Place, *query), expected)
+        f.create_index(Place, "max_guest", "sorted")
+        with patch("models.engine.file_storage.matches") as check:
+            check.return_value = True
+            self.assertEqual(f.query(Place, query[0]), expected)
+        check.assert_not_called()  # answered by the index
+        self.assertEqual(f.query(Place, *query), expected)
+
+        places[2].max_guest = 3
+        f.delete(places[3])
+        self.assertEqual(f.query("Place", query[0]), {})
+        p = Place()
+        p.max_guest = 1005  # pyright: ignore
+        self.assertEqual(f.query(Place, query[0]), {f"Place.{p.id}": p})
+
+        f.create_index("User", "email")
+        self.assertEqual(
+            f.query(User, ("email", "==", "query@alx.com")),
+            {f"User.{u.id}": u},
+        )
+        with self.assertRaises(ValueError):
+            f.query(User, ("email", "~", "x"))
+        with self.assertRaises(ValueError):
+            f.create_index(User, "email", "btree")
+
+
+class TestReferenceIndex(TestCase):
+    """Tests for the ReferenceIndex class"""
+
+    def test_references(self):
+        """Check the referrers of single ids and lists of ids"""
+        index = ReferenceIndex("ref")
+        index.add("1", Obj(ref="a"))
+        index.add("2", Obj(ref=["a", "b", "a"]))
+        index.add("3", Obj(ref=""))
+        index.add("4", Obj())
+        self.assertEqual(index.referrers("a"), ["1", "2"])
+        self.assertEqual(index.referrers("b"), ["2"])
+        self.assertEqual(index.referrers(""), [])
+
+        index.add("1", Obj(ref="b"))
+        index.remove("2")
+        self.assertEqual(index.referrers("a"), [])
+        self.assertEqual(index.referrers("b"), ["1"])
+
+
+class TestFileStorageCascade(TestCase):
+    """Tests for the cascading delete of FileStorage"""
+
+    def test_cascade(self):
+        """Check that referring objects are deleted, or detached"""
+        f = FileStorage()
+        s = State()
+        c = City()
+        c.state_id = s.id  # pyright: ignore
+        a = Amenity()
+        p = Place()
+        p.city_id = c.id  # pyright: ignore
+        p.amenity_ids = [a.id]  # pyright: ignore
+        self.assertEqual(f.referrers(City, "state_id", s.id), {
+            f"City.{c.id}": c
+        })
+
+        f.delete(a, cascade=True)
+        self.assertEqual(p.amenity_ids, [])
+        self.assertIs(f.get(Place, p.id), p)
+        f.delete(s, cascade=True)
+        self.assertIsNone(f.get(City, c.id))
+        self.assertIsNone(f.get(Place, p.id))
+        self.assertEqual(f.referrers("City", "state_id", s.id), {})
@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+"""Unit tests for the JSON stream parser"""
+import json
+from io import StringIO
+from unittest import TestCase
+
+from models.engine.json_stream import iter_items
+
+documents = (
+    {},
+    {"a": {}},
+    {"BaseModel.1": {"__class__": "BaseModel", "id": "1"}},
+    {
+        "Place.1": {"name": "{tricky}, \"quoted\": [x]", "price": 120},
+        "Place.2": {"amenity_ids": ["a", "b"], "latitude": -1.5e3},
+        "Review.3": {"text": "café \\ ☃", "nested": {"k": None}},
+    },
+)
+
+
+class TestIterItems(TestCase):
+    """Tests for the iter_items function"""
+
+    def test_items_in_order(self):
+        """Check that items are read in order, whatever the chunk size"""
+        for document in documents:
+            for indent in (None, 4):
+                text = json.dumps(document, indent=indent)
+                for chunk_size in (1, 2, 7, 1 << 16):
+                    items = list(iter_items(StringIO(text), chunk_size))
+                    self.assertEqual(items, list(document.items()))
+
+    def test_items_are_lazy(self):
+        """Check that items are produced before the whole file is read"""
+        text = json.dumps({str(i): {"i": i} for i in range(1000)})
+        file = StringIO(text)
+        items = iter_items(file, chunk_size=64)
+        self.assertEqual(next(items), ("0", {"i": 0}))
+        self.assertLess(file.tell(), len(text))
+
+    def test_progress(self):
+        """Check that progress is reported up to the end of the file"""
+        text = json.dumps({str(i): {"i": i} for i in range(100)}, indent=4)
+        reports = []
+        list(
+            iter_items(
+                StringIO(text),
+                chunk_size=100,
+                progress=lambda read, size: reports.append(read),
+            )
+        )
+        self.assertEqual(reports, sorted(reports))
+        self.assertEqual(reports[-1], len(text))
+
+    def test_invalid_documents(self):
+        """Check that invalid documents raise a JSONDecodeError"""
+        for text in ("", "[]", '{"a": 1', '{"a" 1}', '{1: 2}', '{"a": 1,}'):
+            with self.assertRaises(json.JSONDecodeError):
+                list(iter_items(StringIO(text), chunk_size=2))
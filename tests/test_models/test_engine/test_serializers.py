@@ -0,0 +1,108 @@
+#!/usr/bin/python3
+"""Unit tests for the serializers of FileStorage"""
+import os
+from unittest import TestCase
+
+from models.engine.serializers import detect, for_path, serializers
+
+items = [
+    (
+        f"Place.{i}",
+        {
+            "__class__": "Place",
+            "id": str(i),
+            "created_at": "2023-11-11T10:00:00.000001",
+            "name": "Chez \"Alx\" ☃",
+            "price_by_night": i * 10,
+            "latitude": i / 3,
+            "amenity_ids": ["a", "b"],
+        },
+    )
+    for i in range(1500)
+]
+
+
+def remove_file(filepath):
+    if os.path.exists(filepath):
+        os.remove(filepath)
+
+
+class TestSerializers(TestCase):
+    """Tests for the serializers"""
+
+    file_path = "test_serializers.data"
+
+    def tearDown(self):
+        """Remove the test file"""
+        remove_file(self.file_path)
+
+    def dump(self, serializer):
+        """Writes the test items with `serializer`"""
+        with open(self.file_path, "wb" if serializer.binary else "w") as file:
+            serializer.dump(iter(items), file)
+
+    def test_round_trip_and_detection(self):
+        """Check that every format reads back what it wrote"""
+        for name, serializer in serializers.items():
+            self.dump(serializer)
+            detected = detect(self.file_path)
+            # compact JSON is read as JSON
+            self.assertEqual(
+                detected.name, "json" if name == "compact" else name
+            )
+            for stream in (False, True):
+                with open(
+                    self.file_path, "rb" if detected.binary else "r"
+                ) as file:
+                    self.assertEqual(list(detected.load(file, stream)), items)
+
+    def test_progress(self):
+        """Check that progress reaches the size of the file"""
+        for serializer in serializers.values():
+            self.dump(serializer)
+            reports = []
+            with open(self.file_path, "rb" if serializer.binary else "r") as f:
+                list(
+                    serializer.load(
+                        f, True, lambda read, size: reports.append(read)
+                    )
+                )
+            self.assertEqual(reports[-1], os.path.getsize(self.file_path))
+
+    def test_json_format(self):
+        """Check that the JSON format is indented with 4 spaces"""
+        self.dump(serializers["json"])
+        with open(self.file_path, "r") as file:
+            self.assertEqual(file.readline(), "{\n")
+            self.assertEqual(file.readline(), '    "Place.0": {\n')
+
+    def test_for_path(self):
+        """Check the format chosen from a file path"""
+        cases = {
+            "hbnb.json": "json",
+            "hbnb": "json",
+            "hbnb.ndjson": "ndjson",
+            "hbnb.JSONL": "ndjson",
+            "hbnb.marshal": "marshal",
+            "hbnb.bin": "marshal",
+        }
+        for file_path, name in cases.items():
+            self.assertEqual(for_path(file_path).name, name)
+        self.assertEqual(for_path("hbnb.json", "compact").name, "compact")
+        with self.assertRaises(ValueError):
+            for_path("hbnb.json", "xml")
+
+    def test_detect_missing_file(self):
+        """Check that detecting a missing file raises FileNotFoundError"""
+        with self.assertRaises(FileNotFoundError):
+            detect(self.file_path)
+
+    def test_detect_empty_file(self):
+        """Check that an empty file is in the format it would be saved in"""
+        open(self.file_path, "w").close()
+        self.assertEqual(detect(self.file_path).name, "json")
+        self.assertEqual(detect(self.file_path, "ndjson").name, "ndjson")
+        remove_file(self.file_path)
+        self.file_path = "test_serializers.ndjson"
+        open(self.file_path, "w").close()
+        self.assertEqual(detect(self.file_path).name, "ndjson")
@@ -0,0 +1,96 @@
+#!/usr/bin/python3
+"""Unit tests for the helpers of the data directory layout"""
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from models.engine.serializers import serializers
+from models.engine.shards import (
+    dump_shard,
+    list_shards,
+    load_shard,
+    read_layout,
+    run,
+    segment_of,
+    shard_path,
+    write_file,
+    write_layout,
+)
+from models.user import User
+
+
+class TestShards(TestCase):
+    """Tests for the functions of the shards module"""
+
+    def setUp(self):
+        """Use a temporary data directory"""
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Remove the data directory"""
+        shutil.rmtree(self.directory)
+
+    def test_segment_of(self):
+        """Check that segments are stable and in range"""
+        self.assertEqual(segment_of("1234", 1), 0)
+        self.assertEqual(segment_of("1234", 8), segment_of("1234", 8))
+        segments = {segment_of(str(i), 8) for i in range(100)}
+        self.assertEqual(segments, set(range(8)))
+
+    def test_shard_path(self):
+        """Check the paths of the segment files"""
+        self.assertEqual(
+            shard_path("data", "User", 3),
+            os.path.join("data", "User", "3.json"),
+        )
+        self.assertEqual(
+            shard_path("data", "User", 0, "marshal"),
+            os.path.join("data", "User", "0.marshal"),
+        )
+
+    def test_dump_and_load(self):
+        """Check that segment files are read as they were written"""
+        u = User()
+        path = shard_path(self.directory, "User", 0, "ndjson")
+        o_dict = {"__class__": "User", "id": "1"}
+        items = [(f"User.{u.id}", u), ("User.1", o_dict)]
+        self.assertEqual(dump_shard(path, items, "ndjson"), 2)
+        loaded = load_shard(path)
+        self.assertEqual(loaded[0], (f"User.{u.id}", u.to_dict()))
+        self.assertEqual(loaded[1], ("User.1", o_dict))
+        built = load_shard(path, User)
+        self.assertEqual(built[0][1].to_dict(), u.to_dict())
+        self.assertEqual(
+            list_shards(self.directory, ["User", "State"]), {"User": [path]}
+        )
+
+    def test_write_file_failure(self):
+        """Check that a failed write leaves the previous file"""
+        path = os.path.join(self.directory, "file.json")
+        write_file(path, serializers["json"], [("a", {"n": 1})])
+        with open(path) as file:
+            saved = file.read()
+        with self.assertRaises(TypeError):
+            write_file(path, serializers["json"], [("a", {"n": {1, 2}})])
+        with open(path) as file:
+            self.assertEqual(file.read(), saved)
+        self.assertEqual(os.listdir(self.directory), ["file.json"])
+
+    def test_layout(self):
+        """Check that the layout is saved at the top of the directory"""
+        directory = os.path.join(self.directory, "data")
+        self.assertIsNone(read_layout(directory))
+        write_layout(directory, {"segments": 8, "format": "json"})
+        self.assertEqual(
+            read_layout(directory), {"segments": 8, "format": "json"}
+        )
+        self.assertEqual(list_shards(directory, ["User"]), {})
+
+    def test_run(self):
+        """Check that tasks run in order, in worker processes or here"""
+        tasks = [(str(i), 4) for i in range(10)]
+        expected = [segment_of(str(i), 4) for i in range(10)]
+        self.assertEqual(list(run(segment_of, tasks)), expected)
+        self.assertEqual(list(run(segment_of, tasks, 3)), expected)
+        self.assertEqual(list(run(segment_of, [], 3)), [])
@@ -0,0 +1,78 @@
+#!/usr/bin/python3
+"""Unit tests for the memory mapped snapshot format"""
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from models.engine.snapshot import Snapshot, write_snapshot
+
+
+class TestSnapshot(TestCase):
+    """Tests for the Snapshot class and write_snapshot"""
+
+    def setUp(self):
+        """Write a snapshot of 1000 objects of 3 classes"""
+        self.directory = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.directory, "hbnb.snap")
+        self.items = [
+            (
+                f"{cls_name}.{i}",
+                {"__class__": cls_name, "id": str(i), "name": f"é {i}"},
+            )
+            for i in range(1000)
+            for cls_name in ("User", "State", "City")
+        ]
+        with open(self.file_path, "wb") as file:
+            write_snapshot(self.items, file)
+        self.snapshot = Snapshot(self.file_path)
+
+    def tearDown(self):
+        """Remove the snapshot"""
+        self.snapshot.close()
+        shutil.rmtree(self.directory)
+
+    def test_counts(self):
+        """Check the number of objects, in all and by class"""
+        self.assertEqual(len(self.snapshot), 3000)
+        self.assertEqual(
+            sorted(self.snapshot.classes), ["City", "State", "User"]
+        )
+        self.assertEqual(self.snapshot.count("State"), 1000)
+        self.assertEqual(self.snapshot.count("Place"), 0)
+
+    def test_get(self):
+        """Check that every key is found through the hash index"""
+        for key, o_dict in self.items:
+            self.assertEqual(self.snapshot.get(key), o_dict)
+        self.assertIsNone(self.snapshot.get("User.1000"))
+        self.assertIsNone(self.snapshot.get("Place.1"))
+
+    def test_items(self):
+        """Check that all objects come in order, and those of a class"""
+        self.assertEqual(list(self.snapshot.items()), self.items)
+        self.assertEqual(
+            list(self.snapshot.items("City")),
+            [item for item in self.items if item[0].startswith("City.")],
+        )
+        self.assertEqual(
+            list(self.snapshot.keys("User")),
+            [f"User.{i}" for i in range(1000)],
+        )
+
+    def test_empty(self):
+        """Check that a snapshot without objects can be opened"""
+        with open(self.file_path, "wb") as file:
+            write_snapshot([], file)
+        snapshot = Snapshot(self.file_path)
+        self.assertEqual(len(snapshot), 0)
+        self.assertIsNone(snapshot.get("User.1"))
+        self.assertEqual(list(snapshot.items()), [])
+        snapshot.close()
+
+    def test_not_a_snapshot(self):
+        """Check that other files are refused"""
+        with open(self.file_path, "w") as file:
+            file.write("{}\n")
+        with self.assertRaises(ValueError):
+            Snapshot(self.file_path)
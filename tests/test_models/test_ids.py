@@ -0,0 +1,105 @@
+#!/usr/bin/python3
+"""Unit tests for the id generators of the models"""
+import multiprocessing
+from unittest import TestCase, skipUnless
+from uuid import UUID
+
+from models.base_model import BaseModel
+from models.engine.bulk import new_ids
+from models.engine.file_storage import FileStorage
+from models.ids import (
+    RandomPool,
+    ShortTimeOrdered,
+    TimeOrdered,
+    random_ids,
+    uuid4,
+)
+
+
+def send_ids(generator, connection):
+    """Sends ten ids of `generator` through `connection`"""
+    connection.send([generator() for _ in range(10)])
+    connection.close()
+
+
+class TestIds(TestCase):
+    """Tests for the id generators"""
+
+    def test_random_ids(self):
+        """Check that random ids are unique version 4 uuids"""
+        ids = random_ids(1000)
+        self.assertEqual(len(set(ids)), 1000)
+        for obj_id in ids[:10]:
+            self.assertEqual(UUID(obj_id).version, 4)
+            self.assertEqual(str(UUID(obj_id)), obj_id)
+        self.assertEqual(UUID(uuid4()).version, 4)
+
+    def test_pool(self):
+        """Check that the pool gives unique uuids past its size"""
+        pool = RandomPool(100)
+        ids = [pool() for _ in range(250)]
+        self.assertEqual(len(set(ids)), 250)
+        self.assertEqual(UUID(ids[-1]).version, 4)
+
+    def test_time_ordered(self):
+        """Check that version 7 uuids are unique and increasing"""
+        generator = TimeOrdered()
+        ids = [generator() for _ in range(10000)]
+        self.assertEqual(ids, sorted(set(ids)))
+        for obj_id in ids[:10]:
+            self.assertEqual(UUID(obj_id).version, 7)
+            self.assertEqual(str(UUID(obj_id)), obj_id)
+
+    def test_short_time_ordered(self):
+        """Check that short ids are unique, increasing and of 22 characters"""
+        generator = ShortTimeOrdered()
+        ids = [generator() for _ in range(10000)]
+        self.assertEqual(ids, sorted(set(ids)))
+        self.assertEqual({len(obj_id) for obj_id in ids}, {22})
+        self.assertRegex(ids[0], r"^[-0-9A-Z_a-z]+$")
+
+    @skipUnless(
+        "fork" in multiprocessing.get_all_start_methods(), "needs fork"
+    )
+    def test_fork(self):
+        """Check that forked processes don't give the ids of their parent"""
+        context = multiprocessing.get_context("fork")
+        for generator in (RandomPool(), TimeOrdered(), ShortTimeOrdered()):
+            generator()  # reads the random bytes the children would copy
+            ids = []
+            for _ in range(2):
+                receiver, sender = context.Pipe(duplex=False)
+                process = context.Process(
+                    target=send_ids, args=(generator, sender)
+                )
+                process.start()
+                ids.extend(receiver.recv())
+                process.join()
+            ids.extend(generator() for _ in range(10))
+            self.assertEqual(len(set(ids)), 30)
+
+
+class TestIdOption(TestCase):
+    """Tests for the ids option of FileStorage"""
+
+    def tearDown(self):
+        """Restore the default id generator"""
+        FileStorage.configure(ids="uuid4")
+
+    def test_generator_used(self):
+        """Check that new instances and bulk ids use the generator"""
+        FileStorage.configure(ids="uuid7")
+        self.assertEqual(UUID(BaseModel().id).version, 7)
+        ids = new_ids(10)
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(UUID(ids[0]).version, 7)
+        FileStorage.configure(ids="short")
+        self.assertEqual(len(BaseModel().id), 22)
+        FileStorage.configure(ids="uuid4")
+        self.assertEqual(UUID(BaseModel().id).version, 4)
+
+    def test_unknown_generator(self):
+        """Check that an unknown generator is refused"""
+        with self.assertRaises(ValueError):
+            FileStorage.configure(ids="uuid1")
+        self.assertEqual(UUID(BaseModel().id).version, 4)
@@ -2,8 +2,10 @@
 """Tests for the Place class"""
 from unittest import TestCase
 
+from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.place import Place
+from models.review import Review
 
 
 class TestPlaceClass(TestCase):
@@ -53,3 +55,13 @@ class TestPlaceClass(TestCase):
         self.assertIn("amenity_ids", dir(p))
         self.assertIs(type(value), list)
         self.assertEqual(value, [])
+
+    def test_reviews_and_amenities(self):
+        """Check the reviews and amenities of a place"""
+        p = Place()
+        r = Review()
+        r.place_id = p.id  # pyright: ignore
+        a = Amenity()
+        p.amenity_ids = [a.id, "1234"]  # pyright: ignore
+        self.assertEqual(p.reviews(), [r])
+        self.assertEqual(p.amenities(), [a])
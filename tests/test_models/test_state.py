@@ -3,6 +3,7 @@
 from unittest import TestCase
 
 from models.base_model import BaseModel
+from models.city import City
 from models.state import State
 
 
@@ -25,3 +26,13 @@ class TestStateClass(TestCase):
         value = getattr(State, "name")
         self.assertIs(type(value), str)
         self.assertEqual(value, "")
+
+    def test_cities(self):
+        """Check the cities of a state"""
+        s = State()
+        cities = [City() for _ in range(2)]
+        for c in cities:
+            c.state_id = s.id  # pyright: ignore
+        self.assertEqual(s.cities(), cities)
+        cities[0].state_id = ""  # pyright: ignore
+        self.assertEqual(s.cities(), cities[1:])
@@ -3,6 +3,8 @@
 from unittest import TestCase
 
 from models.base_model import BaseModel
+from models.place import Place
+from models.review import Review
 from models.user import User
 
 
@@ -27,3 +29,13 @@ class TestUserClass(TestCase):
             self.assertIn(attr, dir(u))
             self.assertIs(type(value), str)
             self.assertEqual(value, "")
+
+    def test_places_and_reviews(self):
+        """Check the places and reviews of a user"""
+        u = User()
+        p = Place()
+        p.user_id = u.id  # pyright: ignore
+        r = Review()
+        r.user_id = u.id  # pyright: ignore
+        self.assertEqual(u.places(), [p])
+        self.assertEqual(u.reviews(), [r])